@@ -0,0 +1,9 @@
+from api.app import ResponseCache, create_app
+from api.query import QueryError, QueryService
+
+__all__ = [
+    "QueryError",
+    "QueryService",
+    "ResponseCache",
+    "create_app",
+]
@@ -0,0 +1,210 @@
+import argparse
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from email.utils import formatdate, parsedate_to_datetime
+
+from starlette.applications import Starlette
+from starlette.concurrency import run_in_threadpool
+from starlette.responses import Response
+from starlette.routing import Route
+
+from api.query import DEFAULT_POPULATION_FILE, DEFAULT_TOP_K, QueryError, QueryService
+from market.store import DEFAULT_STORE_PATH
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8600
+# 직렬화해 둔 응답 본문의 총 크기 (바이트)
+DEFAULT_MAX_BYTES = 32 * 1024 * 1024
+JSON_TYPE = "application/json; charset=utf-8"
+
+
+class ResponseCache:
+    """ETag별 응답 본문을 크기 합으로 제한한 LRU — 같은 질의는 다시 계산·직렬화하지 않는다"""
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._bytes = 0
+
+    def get(self, key):
+        with self._lock:
+            body = self._entries.get(key)
+            if body is not None:
+                self._entries.move_to_end(key)
+            return body
+
+    def put(self, key, body):
+        with self._lock:
+            if key in self._entries:
+                return
+            self._entries[key] = body
+            self._bytes += len(body)
+            while self._bytes > self.max_bytes and len(self._entries) > 1:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= len(evicted)
+
+
+def _dumps(obj):
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _error(message, status):
+    return Response(_dumps({"error": message}), status_code=status, media_type=JSON_TYPE)
+
+
+def _not_modified(request, etag, last_modified):
+    """If-None-Match가 있으면 그것만, 없으면 If-Modified-Since로 판단한다"""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return etag in (tag.strip() for tag in if_none_match.split(",")) or if_none_match.strip() == "*"
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            return int(last_modified) <= parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+def _int_param(request, name, default):
+    value = request.query_params.get(name)
+    if value is None:
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        raise QueryError(f"{name}는 정수여야 합니다: {value!r}") from None
+
+
+def _list_param(request, name):
+    value = request.query_params.get(name)
+    return [item for item in value.split(",") if item] if value else None
+
+
+def create_app(service=None, cache=None):
+    """읽기 전용 인구·가격 질의 서비스 (Starlette ASGI 앱).
+
+    응답마다 데이터 버전과 질의로 만든 ETag, 데이터 수정 시각으로 Last-Modified를 붙이고,
+    조건부 요청이 맞으면 본문을 만들지 않고 304를 돌려준다. 버전 확인과 본문 계산은 스레드 풀에서 한다.
+    """
+    service = service or QueryService()
+    cache = cache or ResponseCache()
+
+    def endpoint(version, build, raw=False):
+        """version(request) → (데이터 버전, 수정 시각), build(request) → dict (raw면 JSON 문자열)"""
+
+        async def handle(request):
+            try:
+                # 작은 조회라도 SQLite·파일 읽기가 이벤트 루프를 막지 않게 스레드 풀에서 한다
+                data_version, last_modified = await run_in_threadpool(version, request)
+                key = f"{request.url.path}?{request.url.query}|{data_version}"
+                etag = '"' + hashlib.sha1(key.encode("utf-8")).hexdigest()[:20] + '"'
+                headers = {
+                    "ETag": etag,
+                    "Last-Modified": formatdate(last_modified, usegmt=True),
+                    "Cache-Control": "no-cache",  # 매번 확인하되, 바뀌지 않았으면 304로 끝난다
+                }
+                if _not_modified(request, etag, last_modified):
+                    return Response(status_code=304, headers=headers)
+                body = cache.get(etag)
+                if body is None:
+                    result = await run_in_threadpool(build, request)
+                    body = result.encode("utf-8") if raw else _dumps(result)
+                    cache.put(etag, body)
+                return Response(body, media_type=JSON_TYPE, headers=headers)
+            except QueryError as e:
+                return _error(str(e), e.status)
+
+        return handle
+
+    def population_version(request):
+        return service.population_version()
+
+    def price_version(request):
+        symbols = _list_param(request, "symbols") or [request.path_params.get("symbol")]
+        return service.price_version([symbol for symbol in symbols if symbol])
+
+    def level(request):
+        return request.query_params.get("level")
+
+    routes = [
+        Route("/health", lambda request: Response(_dumps({"status": "ok", "time": time.time()}), media_type=JSON_TYPE)),
+        Route("/regions/{code}", endpoint(
+            population_version, lambda request: service.region(request.path_params["code"], level(request)),
+        )),
+        Route("/regions/{code}/bands", endpoint(
+            population_version, lambda request: service.bands(request.path_params["code"], level(request)),
+        )),
+        Route("/regions/{code}/similar", endpoint(
+            population_version,
+            lambda request: service.similar(
+                request.path_params["code"],
+                level(request),
+                k=_int_param(request, "k", DEFAULT_TOP_K),
+                metric=request.query_params.get("metric", "hybrid"),
+                sex=request.query_params.get("sex", "total"),
+                bands=_list_param(request, "bands"),
+            ),
+        )),
+        Route("/regions/{code}/pyramid", endpoint(
+            population_version,
+            lambda request: service.pyramid_spec(request.path_params["code"], level(request)),
+            raw=True,
+        )),
+        Route("/prices", endpoint(
+            price_version,
+            lambda request: service.prices(
+                _list_param(request, "symbols"),
+                request.query_params.get("start"),
+                request.query_params.get("end"),
+                request.query_params.get("field", "Close"),
+            ),
+        )),
+        Route("/prices/{symbol}", endpoint(
+            price_version,
+            lambda request: service.ohlcv(
+                request.path_params["symbol"],
+                request.query_params.get("start"),
+                request.query_params.get("end"),
+            ),
+        )),
+    ]
+    return Starlette(routes=routes)
+
+
+def warm(service):
+    """첫 요청이 기다리지 않도록 인구 행렬·집계 표·이웃 인덱스를 미리 올려 둔다"""
+    from population import band_table, neighbor_index
+    from population.report import REPORT_LEVELS, level_regions
+
+    population = service.population
+    for level in REPORT_LEVELS:
+        regions = level_regions(population, level)
+        band_table(regions)
+        neighbor_index(regions)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="인구·가격 캐시를 읽기 전용 HTTP/JSON으로 제공합니다 (Streamlit 없이).")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--population-file", default=DEFAULT_POPULATION_FILE, help="인구 CSV")
+    parser.add_argument("--prices", default=DEFAULT_STORE_PATH, help="가격 SQLite 저장소")
+    args = parser.parse_args(argv)
+
+    import uvicorn
+
+    service = QueryService(args.population_file, args.prices)
+    try:
+        warm(service)
+    except QueryError as e:
+        print(f"인구 데이터를 미리 읽지 못했습니다: {e}")
+    uvicorn.run(create_app(service), host=args.host, port=args.port, log_level="warning", access_log=False)
+
+
+if __name__ == "__main__":
+    main()
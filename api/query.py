@@ -0,0 +1,200 @@
+import os
+import threading
+from datetime import date
+
+import numpy as np
+
+from market import PRICE_COLUMNS, PriceStore
+from market.store import DEFAULT_STORE_PATH
+from population import (
+    BANDS,
+    METRICS,
+    SEX_WEIGHTS,
+    band_table,
+    load_population,
+    metric_engine,
+    neighbor_index,
+    region_figures,
+    region_level,
+    region_ratios,
+)
+from population.neighbors import DEFAULT_K
+from population.report import REPORT_LEVELS, level_regions
+from utils.cache import file_signature
+
+# 페이지들과 같은 인구 CSV
+DEFAULT_POPULATION_FILE = "202504_202504_연령별인구현황_월간_남녀구분.csv"
+DEFAULT_TOP_K = 10
+MAX_TOP_K = 100
+# 질의 문자열의 성별 반영 값 → SEX_WEIGHTS 프리셋
+SEX_MODES = {"total": "남녀 합계", "split": "남녀 따로"}
+
+
+class QueryError(ValueError):
+    """잘못된 질의 — HTTP 상태 코드를 함께 들고 다닌다"""
+
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+
+def _day(value, name):
+    try:
+        return date.fromisoformat(value)
+    except (TypeError, ValueError):
+        raise QueryError(f"{name}는 YYYY-MM-DD 형식이어야 합니다: {value!r}") from None
+
+
+def _floats(values):
+    """NaN은 null로 (JSON에 NaN을 쓰지 않는다)"""
+    return [None if v != v else round(v, 6) for v in values.tolist()]
+
+
+class QueryService:
+    """인구 행렬·가격 저장소를 읽기만 하는 질의 계층 (HTTP와 무관한 dict를 돌려준다).
+
+    페이지와 같은 캐시(인구 memmap, 집계 표, 이웃 인덱스, 가격 SQLite)를 그대로 쓴다.
+    각 질의의 version()은 (ETag에 넣을 데이터 버전, 마지막 수정 시각)이다.
+    """
+
+    def __init__(self, population_file=DEFAULT_POPULATION_FILE, price_path=DEFAULT_STORE_PATH):
+        self.population_file = population_file
+        self.price_path = price_path
+        self._store = None
+        self._store_lock = threading.Lock()
+
+    # 인구
+
+    @property
+    def population(self):
+        if not os.path.exists(self.population_file):
+            raise QueryError(f"인구 파일이 없습니다: {self.population_file}", status=503)
+        return load_population(self.population_file)
+
+    def population_version(self):
+        digest = self.population.digest  # 파일이 없으면 여기서 503
+        _, mtime_ns, _ = file_signature(self.population_file)
+        return digest[:16], mtime_ns / 1e9
+
+    def _regions(self, code, level=None):
+        level = level or region_level(code)
+        if level not in REPORT_LEVELS:
+            raise QueryError(f"알 수 없는 단위입니다: {level} ({', '.join(REPORT_LEVELS)} 중 하나)")
+        regions = level_regions(self.population, level)
+        row = regions.code_index.get(code)
+        if row is None:
+            raise QueryError(f"{level} 단위에 없는 행정코드입니다: {code}", status=404)
+        return regions, row, level
+
+    def region(self, code, level=None):
+        """지역 하나의 연령 × 성별 인구와 연령대 비중"""
+        regions, row, level = self._regions(code, level)
+        counts = {"계": regions.total[row].tolist()}
+        counts.update({sex: regions.sex(sex)[row].tolist() for sex in regions.sexes if sex != "계"})
+        return {
+            **self.bands(code, level),
+            "month": regions.month,
+            "ages": list(regions.ages),
+            "counts": counts,
+        }
+
+    def bands(self, code, level=None):
+        """지역 하나의 연령대 비중(%)과 대표 유형"""
+        regions, row, level = self._regions(code, level)
+        line = band_table(regions).iloc[row]
+        return {
+            "code": code,
+            "name": str(regions.names[row]),
+            "level": level,
+            "total": int(line["총인구"]),
+            "ratios": region_ratios(line),
+            "category": line["유형"],
+        }
+
+    def similar(self, code, level=None, k=DEFAULT_TOP_K, metric="hybrid", sex="total", bands=None):
+        """같은 단위에서 가장 비슷한 k개 지역 (기본 기준이면 미리 계산된 이웃 인덱스에서)"""
+        regions, row, level = self._regions(code, level)
+        if not 1 <= k <= MAX_TOP_K:
+            raise QueryError(f"k는 1~{MAX_TOP_K} 사이여야 합니다: {k}")
+        if metric not in METRICS:
+            raise QueryError(f"알 수 없는 척도입니다: {metric} ({', '.join(METRICS)} 중 하나)")
+        if sex not in SEX_MODES:
+            raise QueryError(f"sex는 {' 또는 '.join(SEX_MODES)}여야 합니다: {sex}")
+        unknown = [band for band in bands or () if band not in BANDS]
+        if unknown:
+            raise QueryError(f"알 수 없는 연령대입니다: {', '.join(unknown)} ({', '.join(BANDS)} 중)")
+
+        default = metric == "hybrid" and sex == "total" and (not bands or set(bands) == set(BANDS))
+        if default and k <= DEFAULT_K:
+            rows, scores = neighbor_index(regions).lookup(row, k=k)
+        else:
+            try:
+                engine = metric_engine(regions, metric, SEX_WEIGHTS[SEX_MODES[sex]], bands)
+            except ValueError as e:
+                raise QueryError(str(e)) from None
+            rows, scores = engine.top_k(row, k=k)
+        return {
+            "code": code,
+            "level": level,
+            "metric": metric,
+            "sex": sex,
+            "bands": list(bands or BANDS),
+            "results": [
+                {"code": str(regions.codes[other]), "name": str(regions.names[other]),
+                 "score": round(float(score), 6), "total": int(regions.total[other].sum())}
+                for other, score in zip(rows.tolist(), scores.tolist())
+            ],
+        }
+
+    def pyramid_spec(self, code, level=None):
+        """페이지와 같은 인구 피라미드의 plotly JSON (그림 캐시의 직렬화 결과를 그대로)"""
+        regions, row, level = self._regions(code, level)
+        if "남" not in regions.sexes or "여" not in regions.sexes:
+            raise QueryError("남녀 합계만 있는 인구 파일이라 피라미드를 그릴 수 없습니다", status=409)
+        pyramid, _ = region_figures(regions, row, level)
+        return pyramid.spec
+
+    # 가격
+
+    @property
+    def store(self):
+        # 받기 함수 없이 읽기 전용 연결로만 연다 (저장소 파일·표는 페이지 쪽이 만든다)
+        if not os.path.exists(self.price_path):
+            raise QueryError(f"가격 저장소가 없습니다: {self.price_path}", status=503)
+        if self._store is None:
+            with self._store_lock:
+                if self._store is None:
+                    self._store = PriceStore(self.price_path, fetch=None)
+        return self._store
+
+    def price_version(self, symbols):
+        version = self.store.version(symbols)
+        return repr(version), max(version, default=0.0)
+
+    def prices(self, symbols, start, end, field="Close"):
+        """저장된 가격 한 항목을 날짜 × 종목으로 (받아 두지 않은 날짜는 비어 있다)"""
+        start, end = _day(start, "start"), _day(end, "end")
+        if field not in PRICE_COLUMNS:
+            raise QueryError(f"알 수 없는 가격 항목입니다: {field} ({', '.join(PRICE_COLUMNS)} 중 하나)")
+        if not symbols:
+            raise QueryError("symbols가 비어 있습니다")
+        matrix = self.store.read_matrix(symbols, start, end, field)
+        return {
+            "field": field,
+            "start": start.isoformat(),
+            "end": end.isoformat(),
+            "dates": matrix.index.strftime("%Y-%m-%d").tolist(),
+            "values": {symbol: _floats(matrix[symbol].to_numpy()) for symbol in symbols},
+        }
+
+    def ohlcv(self, symbol, start, end):
+        """한 종목의 저장된 일봉 (열 이름 → 값 목록)"""
+        start, end = _day(start, "start"), _day(end, "end")
+        frame = self.store.read([symbol], start, end)[symbol]
+        return {
+            "symbol": symbol,
+            "start": start.isoformat(),
+            "end": end.isoformat(),
+            "dates": frame.index.strftime("%Y-%m-%d").tolist(),
+            **{column.lower(): _floats(frame[column].to_numpy(np.float64)) for column in PRICE_COLUMNS},
+        }
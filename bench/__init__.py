@@ -0,0 +1,11 @@
+from bench.stages import SUITES, Stage, market_stages, population_stages
+from bench.synthetic import synthetic_prices, write_population_csv
+
+__all__ = [
+    "SUITES",
+    "Stage",
+    "market_stages",
+    "population_stages",
+    "synthetic_prices",
+    "write_population_csv",
+]
@@ -0,0 +1,180 @@
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from bench.stages import DEFAULT_MAX_NEIGHBOR_REGIONS, SUITES
+from utils.cache import save_json_atomic
+
+# 결과 파일 형식이 바뀌면 올린다 (비교는 같은 형식끼리만)
+RESULTS_VERSION = 1
+DEFAULT_WORKDIR = os.path.join(".cache", "bench")
+DEFAULT_SCALES = (1, 10)
+DEFAULT_REPEAT = 3
+# 이전 결과보다 이 배수 이상 느려지면 회귀로 본다
+DEFAULT_THRESHOLD = 1.3
+# 이보다 짧은 단계는 잡음이 커서 회귀 판정에서 뺀다
+DEFAULT_MIN_SECONDS = 0.005
+DEFAULT_MIN_PEAK_MB = 1.0
+
+
+def measure(stage, repeat=DEFAULT_REPEAT):
+    """단계 하나를 재서 결과 dict를 돌려준다.
+
+    repeat번 시간을 잰 뒤(첫 실행이 import·템플릿 로딩 같은 준비를 끝낸다), 마지막에
+    한 번 더 tracemalloc을 켜고 돌려 최대 메모리를 잰다. 추적 비용은 시간에 섞이지 않는다.
+    """
+    seconds = []
+    for _ in range(max(repeat, 1)):
+        arg = stage.setup() if stage.setup else None
+        start = time.perf_counter()
+        stage.run(arg)
+        seconds.append(time.perf_counter() - start)
+
+    arg = stage.setup() if stage.setup else None
+    tracemalloc.start()
+    try:
+        stage.run(arg)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {
+        "seconds": [round(s, 6) for s in seconds],
+        "min": round(min(seconds), 6),
+        "median": round(statistics.median(seconds), 6),
+        "peak_mb": round(peak / 2**20, 3),
+    }
+
+
+def _git_commit():
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, timeout=5,
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return result.stdout.strip() or None
+
+
+def environment():
+    """결과를 비교할 때 함께 봐야 할 실행 환경"""
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "commit": _git_commit(),
+    }
+
+
+def run_suites(suites, scales, workdir=DEFAULT_WORKDIR, repeat=DEFAULT_REPEAT,
+               max_neighbor_regions=DEFAULT_MAX_NEIGHBOR_REGIONS, log=print):
+    """배율마다 합성 데이터를 만들고(있으면 재사용) 모든 단계를 잰 결과 목록"""
+    os.makedirs(workdir, exist_ok=True)
+    results = []
+    for scale in scales:
+        for suite in suites:
+            options = {"max_neighbor_regions": max_neighbor_regions} if suite == "population" else {}
+            for stage in SUITES[suite](workdir, scale, **options):
+                result = {"suite": suite, "stage": stage.name, "scale": scale, "size": stage.size}
+                if stage.skip:
+                    result["skipped"] = stage.skip
+                else:
+                    result.update(measure(stage, repeat))
+                results.append(result)
+                if log:
+                    log(_format_result(result))
+    return results
+
+
+def _format_result(result):
+    name = f"{result['suite']}/{result['stage']} x{result['scale']}"
+    if "skipped" in result:
+        return f"{name:<36} 건너뜀 ({result['skipped']})"
+    return f"{name:<36} {result['min'] * 1000:10.1f} ms  (중앙 {result['median'] * 1000:.1f})  최대 {result['peak_mb']:8.1f} MB"
+
+
+def save_results(path, results, repeat):
+    save_json_atomic(path, {
+        "version": RESULTS_VERSION,
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "repeat": repeat,
+        "environment": environment(),
+        "results": results,
+    })
+
+
+def load_results(path):
+    with open(path, encoding="utf-8") as f:
+        saved = json.load(f)
+    if saved.get("version") != RESULTS_VERSION:
+        raise ValueError(f"{path}: 결과 형식 버전이 다릅니다 ({saved.get('version')} ≠ {RESULTS_VERSION})")
+    return saved
+
+
+def compare(baseline, results, threshold=DEFAULT_THRESHOLD, min_seconds=DEFAULT_MIN_SECONDS,
+            min_peak_mb=DEFAULT_MIN_PEAK_MB):
+    """기준 결과와 같은 (묶음, 단계, 배율)끼리 최소 시간·최대 메모리 배수를 비교한다.
+
+    (비교 행 목록, 회귀 행 목록)을 돌려준다. 둘 중 하나라도 threshold 배 이상이면 회귀다
+    (min_seconds·min_peak_mb보다 작은 값끼리는 잡음으로 보고 넘어간다).
+    """
+    before = {(r["suite"], r["stage"], r["scale"]): r for r in baseline["results"] if "skipped" not in r}
+    rows, regressions = [], []
+    for result in results:
+        old = before.get((result["suite"], result["stage"], result["scale"]))
+        if old is None or "skipped" in result:
+            continue
+        time_ratio = result["min"] / old["min"] if old["min"] else float("inf")
+        memory_ratio = result["peak_mb"] / old["peak_mb"] if old["peak_mb"] else 1.0
+        row = {**result, "time_ratio": round(time_ratio, 3), "memory_ratio": round(memory_ratio, 3)}
+        rows.append(row)
+        slower = time_ratio >= threshold and max(result["min"], old["min"]) >= min_seconds
+        bigger = memory_ratio >= threshold and max(result["peak_mb"], old["peak_mb"]) >= min_peak_mb
+        if slower or bigger:
+            regressions.append(row)
+    return rows, regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="합성 데이터로 인구·주가 페이지의 주요 경로 시간과 최대 메모리를 잽니다.")
+    parser.add_argument("--suites", nargs="+", choices=list(SUITES), default=list(SUITES), help="잴 묶음")
+    parser.add_argument("--scales", nargs="+", type=int, default=list(DEFAULT_SCALES), help="현재 데이터 대비 배율 (예: 1 10 100)")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="단계마다 시간을 잴 횟수")
+    parser.add_argument("--workdir", default=DEFAULT_WORKDIR, help=f"합성 데이터를 두는 폴더 (기본: {DEFAULT_WORKDIR})")
+    parser.add_argument("--max-neighbor-regions", type=int, default=DEFAULT_MAX_NEIGHBOR_REGIONS,
+                        help="이웃 인덱스 단계를 잴 최대 지역 수")
+    parser.add_argument("--out", help="결과 JSON 경로 (기본: workdir/results-<시각>.json)")
+    parser.add_argument("--compare", help="비교할 이전 결과 JSON")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="회귀로 볼 느려짐·메모리 배수")
+    args = parser.parse_args(argv)
+
+    results = run_suites(args.suites, args.scales, args.workdir, args.repeat, args.max_neighbor_regions)
+    out = args.out or os.path.join(args.workdir, f"results-{datetime.now():%Y%m%d-%H%M%S}.json")
+    save_results(out, results, args.repeat)
+    print(f"결과 저장: {out}")
+
+    if args.compare:
+        rows, regressions = compare(load_results(args.compare), results, args.threshold)
+        for row in rows:
+            mark = "  ← 회귀" if row in regressions else ""
+            print(f"{row['suite']}/{row['stage']} x{row['scale']:<6} 시간 ×{row['time_ratio']:<6} 메모리 ×{row['memory_ratio']}{mark}")
+        if regressions:
+            print(f"{len(regressions)}개 단계가 {args.compare} 보다 {args.threshold}배 이상 나빠졌습니다.")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
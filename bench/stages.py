@@ -0,0 +1,125 @@
+import os
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Callable, Optional
+
+import numpy as np
+import pandas as pd
+import plotly.io as pio
+
+from bench.synthetic import population_file_name, synthetic_prices, write_population_csv
+from market import PriceStore, build_analytics, frame_fetcher, line_figure
+from population.bands import build_band_table
+from population.clusters import build_clusters
+from population.figures import compare_figure, distribution_figure, pyramid_figure
+from population.loader import _load_uncached, _parse_csv
+from population.neighbors import build_neighbor_index
+from population.projection import project
+from population.rollup import build_rollups
+from population.similarity import METRICS, MetricEngine, SimilarityEngine
+from utils.cache import file_digest
+
+# 전수 비교(지역 수²)라서 이보다 지역이 많으면 이웃 인덱스 단계는 건너뛴다
+DEFAULT_MAX_NEIGHBOR_REGIONS = 10_000
+# 유사 지역 검색 단계에서 던지는 질의 수
+SIMILARITY_QUERIES = 10
+
+
+@dataclass
+class Stage:
+    """벤치마크 한 단계. setup(있으면)은 매 반복 전에 시간을 재지 않고 불러 run에 넘긴다"""
+
+    name: str
+    run: Callable
+    size: int = 0
+    setup: Optional[Callable] = None
+    skip: str = ""  # 건너뛴 이유 (비어 있으면 실행)
+
+
+def population_stages(workdir, scale, max_neighbor_regions=DEFAULT_MAX_NEIGHBOR_REGIONS):
+    """인구 페이지 경로: CSV 읽기 → 캐시 → 집계 → 비율표 → 유사 지역 → 그림"""
+    path = os.path.join(workdir, population_file_name(scale))
+    if not os.path.exists(path):
+        write_population_csv(path, scale)
+    digest = file_digest(path)
+    data = _load_uncached(path)  # 캐시 단계가 읽을 .npy를 미리 만든다
+    dongs = data.dongs
+    queries = np.linspace(0, len(dongs) - 1, SIMILARITY_QUERIES).astype(int)
+    row, other = int(queries[1]), int(queries[2])
+
+    def similarity(_):
+        engine = SimilarityEngine(dongs.total)
+        return [engine.top_k(int(query), k=10) for query in queries]
+
+    def metrics(_):
+        # 척도마다 엔진을 새로 만들고(전처리 포함) 같은 질의를 던진다
+        return [MetricEngine(dongs, metric).top_k_many(queries, k=10) for metric in METRICS]
+
+    def figures(_):
+        return [
+            pio.to_json(figure)
+            for figure in (
+                pyramid_figure(dongs, row),
+                distribution_figure(dongs, row),
+                compare_figure(dongs, row, other, "동"),
+            )
+        ]
+
+    stages = [
+        # 천 단위 쉼표가 든 숫자 문자열 파싱 (pandas C 파서)
+        Stage("csv_read", lambda _: pd.read_csv(path, encoding="cp949", thousands=","), len(data)),
+        Stage("csv_parse", lambda _: _parse_csv(path, digest), len(data)),
+        Stage("cache_load", lambda _: _load_uncached(path).total, len(data)),
+        Stage("rollups", lambda _: build_rollups(data), len(data)),
+        Stage("band_table", lambda _: build_band_table(dongs), len(dongs)),
+        Stage("similarity_top_k", similarity, len(dongs)),
+        Stage("metric_top_k", metrics, len(dongs)),
+        Stage("projection", lambda _: project(data).band_ratios, len(data)),
+        Stage("clusters", lambda _: build_clusters(dongs), len(dongs)),
+        Stage("neighbor_index", lambda _: build_neighbor_index(dongs), len(dongs)),
+        Stage("figures", figures, 1),
+    ]
+    if len(dongs) > max_neighbor_regions:
+        stages[-2].skip = f"지역 {len(dongs):,}곳 > {max_neighbor_regions:,}"
+    return stages
+
+
+def market_stages(workdir, scale):
+    """주가 페이지 경로: 저장 → 읽기 → 종목 합치기 → 분석 → 줄인 그림"""
+    frames = synthetic_prices(scale)
+    symbols = list(frames)
+    index = next(iter(frames.values())).index
+    start, end = index[0].date(), index[-1].date() + timedelta(days=1)
+    path = os.path.join(workdir, f"prices-x{scale}.sqlite")
+    fetch = frame_fetcher(frames)
+
+    def fresh_store():
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+        return PriceStore(path, fetch=fetch)
+
+    store = fresh_store()
+    store.update(symbols, start, end)
+    matrix = store.read_matrix(symbols, start, end)
+
+    def concat(per_symbol):
+        # 종목별 표를 한 표로 합치는 예전 페이지 방식
+        return pd.concat({symbol: df["Close"] for symbol, df in per_symbol.items()}, axis=1)
+
+    def figure(analytics):
+        return pio.to_json(line_figure(analytics, "normalized", symbols))
+
+    n_bars = len(index) * len(symbols)
+    return [
+        Stage("store_update", lambda fresh: fresh.update(symbols, start, end), n_bars, setup=fresh_store),
+        Stage("store_read", lambda _: store.read(symbols, start, end), n_bars),
+        Stage("concat", concat, n_bars, setup=lambda: store.read(symbols, start, end)),
+        Stage("read_matrix", lambda _: store.read_matrix(symbols, start, end), n_bars),
+        Stage("analytics", lambda _: build_analytics(matrix), n_bars),
+        # 분석 객체마다 줄인 점을 붙여 두므로 매번 새 객체로 잰다
+        Stage("line_figure", figure, n_bars, setup=lambda: build_analytics(matrix)),
+    ]
+
+
+SUITES = {"population": population_stages, "market": market_stages}
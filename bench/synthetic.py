@@ -0,0 +1,124 @@
+import os
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+# 현재 데이터 크기 (1배 기준): 연령별인구현황 CSV의 읍면동 수, 주가 페이지의 종목 수와 1년치 거래일
+BASE_DONGS = 3_500
+DONGS_PER_SIGUNGU = 14
+TRADING_DAYS = 260
+TICKERS = ("AAPL", "MSFT", "2222.SR", "GOOGL", "AMZN", "NVDA", "BRK-B", "META", "TSM", "TSLA")
+AGES = tuple(f"{age}세" for age in range(100)) + ("100세 이상",)
+MONTH = "2025년04월"
+
+_SIDO = (
+    "서울특별시", "부산광역시", "대구광역시", "인천광역시", "광주광역시", "대전광역시",
+    "울산광역시", "세종특별자치시", "경기도", "충청북도", "충청남도", "전북특별자치도",
+    "전라남도", "경상북도", "경상남도", "제주특별자치도", "강원특별자치도",
+)
+# 읍·면도 섞어서 "동"으로 끝나는 지역만 고르는 경로도 실제처럼 걸리게 한다
+_SUFFIXES = ("동",) * 8 + ("읍", "면")
+_ROWS_PER_WRITE = 2_000
+
+
+def population_file_name(scale, sexes=("남", "여")):
+    kind = "남녀구분" if len(sexes) > 1 else "남녀합계"
+    return f"synthetic_x{scale}_연령별인구현황_월간_{kind}.csv"
+
+
+def _age_profile(rng, n):
+    """지역마다 조금씩 다른 연령 분포 (젊은 동네 ~ 고령 동네)"""
+    ages = np.arange(len(AGES))
+    peak = rng.uniform(25, 65, size=(n, 1))
+    width = rng.uniform(15, 30, size=(n, 1))
+    weights = np.exp(-0.5 * ((ages - peak) / width) ** 2) + 0.05
+    weights[:, 90:] *= np.linspace(1, 0.05, len(AGES) - 90)
+    return weights / weights.sum(axis=1, keepdims=True)
+
+
+def _region_counts(rng, n, sexes):
+    """(n, 연령, 성별) 인구"""
+    totals = rng.lognormal(9.5, 0.6, size=n).astype(np.int64)
+    counts = rng.multinomial(totals, _age_profile(rng, n)) if n else np.zeros((0, len(AGES)), dtype=np.int64)
+    if len(sexes) == 1:
+        return counts[:, :, None]
+    male = rng.binomial(counts, 0.49)
+    return np.stack([male, counts - male], axis=2)
+
+
+def _format_rows(labels, counts, sexes):
+    """행정구역 + (계[, 남, 여]) × (총인구수, 연령구간인구수, 연령별) — 천 단위 쉼표 문자열"""
+    groups = [counts.sum(axis=2)] + ([counts[:, :, i] for i in range(len(sexes))] if len(sexes) > 1 else [])
+    values = np.concatenate([
+        np.concatenate([group.sum(axis=1, keepdims=True)] * 2 + [group], axis=1) for group in groups
+    ], axis=1)
+    return [
+        f'"{label}",' + ",".join(f'"{value:,}"' for value in row)
+        for label, row in zip(labels, values.tolist())
+    ]
+
+
+def write_population_csv(path, scale=1, sexes=("남", "여"), seed=0):
+    """연령별인구현황(월간) CSV와 같은 모양의 합성 파일을 쓴다.
+
+    읍면동 BASE_DONGS × scale곳을 시도 17곳·시군구(약 DONGS_PER_SIGUNGU동씩)로 나누고,
+    시도·시군구 행은 하위 동의 합으로 넣는다. 인코딩(cp949)과 쉼표 숫자도 원본과 같다.
+    """
+    rng = np.random.default_rng(seed)
+    n_dongs = int(BASE_DONGS * scale)
+    per_sido = np.bincount(np.arange(n_dongs) % len(_SIDO), minlength=len(_SIDO))
+    header = ["행정구역"] + [
+        f"{MONTH}_{sex}_{label}"
+        for sex in ("계",) + (sexes if len(sexes) > 1 else ())
+        for label in ("총인구수", "연령구간인구수") + AGES
+    ]
+
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="cp949", newline="") as f:
+        f.write(",".join(header) + "\r\n")
+        for s, (sido, n_sido) in enumerate(zip(_SIDO, per_sido.tolist())):
+            sido_code = f"{11 + s * 2:02d}"
+            n_sigungu = min(999, max(1, -(-n_sido // DONGS_PER_SIGUNGU)))  # 시군구 코드는 세 자리
+            dong_counts = _region_counts(rng, n_sido, sexes)
+            sigungu_of = np.arange(n_sido) % n_sigungu
+            sigungu_counts = np.zeros((n_sigungu,) + dong_counts.shape[1:], dtype=np.int64)
+            np.add.at(sigungu_counts, sigungu_of, dong_counts)
+
+            lines = _format_rows([f"{sido}  ({sido_code}00000000)"], dong_counts.sum(axis=0, keepdims=True), sexes)
+            for g in range(n_sigungu):
+                sigungu = f"{sido} 합성{g + 1}구"
+                sigungu_code = f"{sido_code}{g + 1:03d}"
+                lines += _format_rows([f"{sigungu} ({sigungu_code}00000)"], sigungu_counts[g:g + 1], sexes)
+                members = np.flatnonzero(sigungu_of == g)
+                labels = [
+                    f"{sigungu} 합성{d + 1}{_SUFFIXES[d % len(_SUFFIXES)]}({sigungu_code}{d + 1:03d}00)"
+                    for d in range(len(members))
+                ]
+                lines += _format_rows(labels, dong_counts[members], sexes)
+                if len(lines) >= _ROWS_PER_WRITE:
+                    f.write("\r\n".join(lines) + "\r\n")
+                    lines = []
+            if lines:
+                f.write("\r\n".join(lines) + "\r\n")
+    os.replace(tmp_path, path)
+    return path
+
+
+def synthetic_prices(scale=1, symbols=TICKERS, seed=0, end=None):
+    """종목마다 TRADING_DAYS × scale 거래일의 일봉 {종목: DataFrame} (기하 브라운 운동)"""
+    rng = np.random.default_rng(seed)
+    index = pd.bdate_range(end=end or date.today(), periods=int(TRADING_DAYS * scale), name="Date")
+    frames = {}
+    for symbol in symbols:
+        close = 100 * np.exp(np.cumsum(rng.normal(0.0003, 0.02, len(index))))
+        open_ = close * (1 + rng.normal(0, 0.005, len(index)))
+        spread = 1 + np.abs(rng.normal(0, 0.01, len(index)))
+        frames[symbol] = pd.DataFrame({
+            "Open": open_,
+            "High": np.maximum(open_, close) * spread,
+            "Low": np.minimum(open_, close) / spread,
+            "Close": close,
+            "Volume": rng.integers(1_000_000, 50_000_000, len(index)).astype(float),
+        }, index=index)
+    return frames
@@ -0,0 +1,41 @@
+import importlib
+
+# 하위 모듈 → 패키지에서 바로 쓰는 이름. 처음 쓸 때 그 모듈만 불러온다 (저장소만 쓰는 쪽이 folium·pandas까지 읽지 않게)
+_SUBMODULES = {
+    "bookmarks.importer": ("ImportReport", "import_points", "iter_csv_chunks", "iter_geojson_chunks"),
+    "bookmarks.layer": ("CLUSTER_ZOOM", "MAX_MARKERS", "bookmark_layer", "parse_bounds", "view_bounds"),
+    "bookmarks.store": ("DEDUP_DEG", "GRID_DEG", "BookmarkStore", "bookmark_store", "check_coordinates"),
+}
+
+__all__ = [
+    "CLUSTER_ZOOM",
+    "DEDUP_DEG",
+    "GRID_DEG",
+    "MAX_MARKERS",
+    "BookmarkStore",
+    "ImportReport",
+    "bookmark_layer",
+    "bookmark_store",
+    "check_coordinates",
+    "import_points",
+    "iter_csv_chunks",
+    "iter_geojson_chunks",
+    "parse_bounds",
+    "view_bounds",
+]
+
+
+_EXPORTS = {name: module for module, names in _SUBMODULES.items() for name in names}
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
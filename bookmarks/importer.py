@@ -0,0 +1,261 @@
+import argparse
+import io
+import json
+import os
+import re
+import sqlite3
+from contextlib import contextmanager
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from bookmarks.store import DEDUP_DEG, DEFAULT_STORE_PATH, BookmarkStore
+
+# 한 번에 검사하고 한 트랜잭션으로 넣는 점 개수
+DEFAULT_CHUNK_SIZE = 50_000
+# CSV 열 이름 후보 (소문자로 비교)
+NAME_COLUMNS = ("name", "이름", "장소", "장소 이름", "place", "title")
+LAT_COLUMNS = ("lat", "latitude", "위도", "y")
+LON_COLUMNS = ("lon", "lng", "long", "longitude", "경도", "x")
+# GeoJSON 속성에서 이름으로 쓸 키 후보
+NAME_PROPERTIES = ("name", "이름", "title")
+
+_READ_SIZE = 1 << 20
+# JSON 원소 사이에서 건너뛰는 글자 (GeoJSONSeq의 레코드 구분자 RS 포함)
+_SEPARATORS = " \t\r\n,\x1e"
+_FEATURES = re.compile(r'"features"\s*:\s*\[')
+
+
+@dataclass
+class ImportReport:
+    """가져오기 결과 (읽은 점 = 잘못된 좌표 + 중복 + 저장)"""
+
+    read: int = 0
+    invalid: int = 0
+    duplicates: int = 0
+    inserted: int = 0
+
+
+@contextmanager
+def _text_stream(source):
+    """경로·바이너리 파일을 텍스트 스트림으로 연다. UTF-8이 아니면 cp949로 읽는다.
+
+    경로로 받은 파일만 닫고, 넘겨받은 파일 객체(업로드 파일 등)는 열어 둔 채 돌려준다.
+    """
+    opened = isinstance(source, (str, os.PathLike))
+    binary = open(source, "rb") if opened else source
+    try:
+        sample = binary.read(64 * 1024)
+        binary.seek(0)
+        encoding = "utf-8-sig"
+        try:
+            sample.decode("utf-8")
+        except UnicodeDecodeError as e:
+            # 표본 끝에서 잘린 글자 때문이면 UTF-8로 본다
+            if e.start < len(sample) - 3:
+                encoding = "cp949"
+        stream = io.TextIOWrapper(binary, encoding=encoding, newline="")
+        yield stream
+        if not opened:
+            stream.detach()
+    finally:
+        if opened:
+            binary.close()
+
+
+def _pick_column(columns, candidates, kind):
+    lowered = {str(column).strip().lower(): column for column in columns}
+    for candidate in candidates:
+        if candidate in lowered:
+            return lowered[candidate]
+    if kind == "name":
+        return None
+    raise ValueError(f"{kind} 열을 찾을 수 없습니다 (후보: {', '.join(candidates)})")
+
+
+def iter_csv_chunks(source, chunk_size=DEFAULT_CHUNK_SIZE):
+    """CSV를 chunk_size행씩 읽어 (이름 배열, 위도 배열, 경도 배열)을 차례로 돌려준다"""
+    with _text_stream(source) as stream:
+        columns = None
+        for chunk in pd.read_csv(stream, chunksize=chunk_size, dtype=str, keep_default_na=False):
+            if columns is None:
+                columns = (
+                    _pick_column(chunk.columns, NAME_COLUMNS, "name"),
+                    _pick_column(chunk.columns, LAT_COLUMNS, "위도"),
+                    _pick_column(chunk.columns, LON_COLUMNS, "경도"),
+                )
+            name_column, lat_column, lon_column = columns
+            if name_column is None:
+                names = np.full(len(chunk), "", dtype=object)
+            else:
+                names = chunk[name_column].to_numpy(dtype=object)
+            yield (
+                names,
+                pd.to_numeric(chunk[lat_column], errors="coerce").to_numpy(dtype=float),
+                pd.to_numeric(chunk[lon_column], errors="coerce").to_numpy(dtype=float),
+            )
+
+
+def _iter_json_items(stream, buffer):
+    """buffer 이후 스트림에서 JSON 배열 원소를 하나씩 읽는다 (배열 끝 ']'에서 멈춤)"""
+    decoder = json.JSONDecoder()
+    pos = 0
+    while True:
+        while pos < len(buffer) and buffer[pos] in _SEPARATORS:
+            pos += 1
+        if pos == len(buffer):
+            more = stream.read(_READ_SIZE)
+            if not more:
+                return
+            buffer, pos = more, 0
+            continue
+        if buffer[pos] == "]":
+            return
+        try:
+            item, end = decoder.raw_decode(buffer, pos)
+        except json.JSONDecodeError:
+            # 원소가 읽은 부분 끝에서 잘렸으면 더 읽어서 다시 시도
+            more = stream.read(_READ_SIZE)
+            if not more:
+                raise
+            buffer, pos = buffer[pos:] + more, 0
+            continue
+        yield item
+        pos = end
+        if pos > _READ_SIZE:
+            buffer, pos = buffer[pos:], 0
+
+
+def _iter_features(stream):
+    """FeatureCollection의 features 배열이나 줄마다 Feature가 있는 GeoJSONSeq를 흘려 읽는다"""
+    buffer = stream.read(_READ_SIZE)
+    match = _FEATURES.search(buffer)
+    while match is None and '"FeatureCollection"' in buffer[:_READ_SIZE]:
+        more = stream.read(_READ_SIZE)
+        if not more:
+            break
+        buffer += more
+        match = _FEATURES.search(buffer)
+    if match is not None:
+        yield from _iter_json_items(stream, buffer[match.end():])
+        return
+    # features 배열이 없으면 한 줄(또는 이어진 객체)마다 Feature 하나로 본다
+    for item in _iter_json_items(stream, buffer):
+        if isinstance(item, dict) and item.get("type") == "FeatureCollection":
+            yield from item.get("features", [])
+        else:
+            yield item
+
+
+def _feature_points(feature):
+    if not isinstance(feature, dict):
+        raise ValueError(f"Feature가 객체가 아닙니다: {json.dumps(feature, ensure_ascii=False)[:60]}")
+    geometry = feature.get("geometry") or {}
+    properties = feature.get("properties") or {}
+    if not isinstance(geometry, dict) or not isinstance(properties, dict):
+        raise ValueError("geometry와 properties는 객체여야 합니다")
+    name = next((str(properties[key]) for key in NAME_PROPERTIES if properties.get(key) is not None), "")
+    coordinates = geometry.get("coordinates")
+    if geometry.get("type") not in ("Point", "MultiPoint"):
+        return
+    if coordinates is not None and not isinstance(coordinates, list):
+        raise ValueError(f"coordinates가 배열이 아닙니다: {coordinates!r}")
+    if geometry.get("type") == "Point":
+        coordinates = [coordinates]
+    for point in coordinates or []:
+        try:
+            yield name, float(point[1]), float(point[0])  # GeoJSON은 [경도, 위도] 순서
+        except (TypeError, ValueError, IndexError):
+            yield name, np.nan, np.nan
+
+
+def iter_geojson_chunks(source, chunk_size=DEFAULT_CHUNK_SIZE):
+    """GeoJSON의 Point·MultiPoint를 chunk_size개씩 (이름 목록, 위도 배열, 경도 배열)로 돌려준다.
+
+    파일 전체를 메모리에 올리지 않고 Feature를 하나씩 읽는다. 점이 아닌 도형은 건너뛴다.
+    JSON이 깨졌거나 Feature 모양이 잘못됐으면 몇 번째 Feature인지 담은 ValueError를 낸다.
+    """
+    names, lats, lons = [], [], []
+    number = 0
+    with _text_stream(source) as stream:
+        features = enumerate(_iter_features(stream), 1)
+        while True:
+            try:
+                number, feature = next(features)
+            except StopIteration:
+                break
+            except json.JSONDecodeError as e:
+                raise ValueError(f"{number + 1}번째 Feature를 JSON으로 읽지 못했습니다: {e.msg}") from e
+            try:
+                points = list(_feature_points(feature))
+            except ValueError as e:
+                raise ValueError(f"{number}번째 Feature: {e}") from e
+            for name, lat, lon in points:
+                names.append(name)
+                lats.append(lat)
+                lons.append(lon)
+            if len(names) >= chunk_size:
+                yield names, np.array(lats), np.array(lons)
+                names, lats, lons = [], [], []
+    if names:
+        yield names, np.array(lats), np.array(lons)
+
+
+def _is_geojson(name):
+    return os.path.splitext(str(name))[1].lower() in (".geojson", ".json", ".geojsonl", ".geojsons")
+
+
+def import_points(store, source, kind=None, chunk_size=DEFAULT_CHUNK_SIZE, tolerance=DEDUP_DEG, progress=None):
+    """CSV/GeoJSON 점 파일을 묶음 단위로 검사해 북마크 저장소에 넣는다.
+
+    kind는 "csv" 또는 "geojson" (없으면 파일 이름 확장자로 판단). 묶음마다 좌표 범위를
+    검사하고, 저장소 격자 인덱스로 가까운 점을 걸러 묶음마다 한 트랜잭션으로 넣는다.
+    중간에 파일이 깨져 있거나 저장소가 잠겨 넣지 못하면, 앞서 저장한 묶음은 남겨 두고
+    몇 개를 저장했는지 담은 ValueError를 낸다. progress(report)는 묶음이 끝날 때마다 불린다.
+    """
+    if kind is None:
+        kind = "geojson" if _is_geojson(getattr(source, "name", source)) else "csv"
+    chunks = iter_geojson_chunks if kind == "geojson" else iter_csv_chunks
+    report = ImportReport()
+    try:
+        with store.bulk_insert(tolerance) as add:
+            for names, lats, lons in chunks(source, chunk_size):
+                valid = (np.abs(lats) <= 90) & (np.abs(lons) <= 180)  # NaN도 여기서 걸러진다
+                inserted = add(np.asarray(names, dtype=object)[valid], lats[valid], lons[valid])
+                report.read += len(lats)
+                report.invalid += len(lats) - int(valid.sum())
+                report.duplicates += int(valid.sum()) - inserted
+                report.inserted += inserted
+                if progress is not None:
+                    progress(report)
+    except (ValueError, sqlite3.OperationalError) as e:
+        raise ValueError(
+            f"가져오기를 중단했습니다 — 앞 묶음 {report.read:,}개 중 {report.inserted:,}개는 저장됐습니다: {e}"
+        ) from e
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="CSV/GeoJSON 점 파일을 북마크 저장소로 가져옵니다.")
+    parser.add_argument("files", nargs="+", help="가져올 CSV 또는 GeoJSON 파일")
+    parser.add_argument("--store", default=DEFAULT_STORE_PATH, help=f"북마크 저장소 (기본: {DEFAULT_STORE_PATH})")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="한 트랜잭션에 넣을 점 개수")
+    parser.add_argument("--tolerance", type=float, default=DEDUP_DEG, help="같은 장소로 볼 좌표 차이 (도)")
+    args = parser.parse_args(argv)
+
+    store = BookmarkStore(args.store)
+    for path in args.files:
+        try:
+            report = import_points(store, path, chunk_size=args.chunk_size, tolerance=args.tolerance)
+        except ValueError as e:
+            print(f"{path}: {e}")
+            continue
+        print(
+            f"{path}: 읽음 {report.read:,} · 저장 {report.inserted:,} · "
+            f"중복 {report.duplicates:,} · 잘못된 좌표 {report.invalid:,}"
+        )
+
+
+if __name__ == "__main__":
+    main()
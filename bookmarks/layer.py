@@ -0,0 +1,78 @@
+import math
+
+import folium
+from folium.plugins import MarkerCluster
+
+# 화면 안 북마크가 이보다 많으면 개별 마커 대신 칸별 묶음 원으로 그린다
+MAX_MARKERS = 500
+# 이 확대 단계보다 멀리서 볼 때는 개별 마커도 클러스터로 묶는다
+CLUSTER_ZOOM = 13
+# 서버에서 묶을 때 한 칸의 화면 크기 (픽셀)
+CLUSTER_PIXELS = 64
+_TILE_SIZE = 256
+
+
+def _mercator_y(lat):
+    lat = max(min(lat, 85.0511), -85.0511)
+    return math.log(math.tan(math.pi / 4 + math.radians(lat) / 2))
+
+
+def _mercator_lat(y):
+    return math.degrees(2 * math.atan(math.exp(y)) - math.pi / 2)
+
+
+def view_bounds(center, zoom, width, height):
+    """지도 중심·확대 단계·크기(픽셀)로 어림한 화면 범위 (남, 서, 북, 동)"""
+    lat, lon = center
+    scale = _TILE_SIZE * 2 ** zoom
+    half_lon = width / 2 * 360 / scale
+    y = _mercator_y(lat)
+    half_y = height / 2 * 2 * math.pi / scale
+    return (
+        _mercator_lat(y - half_y),
+        max(lon - half_lon, -180.0),
+        _mercator_lat(y + half_y),
+        min(lon + half_lon, 180.0),
+    )
+
+
+def parse_bounds(bounds):
+    """st_folium이 돌려준 bounds를 (남, 서, 북, 동)으로. 아직 없으면 None"""
+    if not bounds:
+        return None
+    south_west, north_east = bounds.get("_southWest") or {}, bounds.get("_northEast") or {}
+    values = (south_west.get("lat"), south_west.get("lng"), north_east.get("lat"), north_east.get("lng"))
+    if any(value is None for value in values):
+        return None
+    south, west, north, east = values
+    # 경도를 한 바퀴 넘게 본 경우는 전체 경도로 본다
+    if east - west >= 360:
+        west, east = -180.0, 180.0
+    return max(south, -90.0), max(west, -180.0), min(north, 90.0), min(east, 180.0)
+
+
+def bookmark_layer(store, bounds, zoom):
+    """화면 범위 안의 북마크만 담은 FeatureGroup과 (그린 북마크 수, 화면 안 북마크 수).
+
+    적으면 개별 마커(멀리서 볼 때는 MarkerCluster)로, 많으면 서버에서 격자 칸으로
+    묶은 원으로 그려서 브라우저로 보내는 양이 북마크 수와 상관없이 일정하다.
+    """
+    layer = folium.FeatureGroup(name="북마크")
+    in_view = store.count(bounds)
+    if in_view <= MAX_MARKERS:
+        target = MarkerCluster().add_to(layer) if zoom < CLUSTER_ZOOM else layer
+        for _, name, lat, lon in store.in_bounds(bounds):
+            folium.Marker([lat, lon], tooltip=name).add_to(target)
+        return layer, in_view, in_view
+
+    cell_deg = CLUSTER_PIXELS * 360 / (_TILE_SIZE * 2 ** zoom)
+    for lat, lon, count in store.clusters(bounds, cell_deg):
+        folium.CircleMarker(
+            [lat, lon],
+            radius=6 + 3 * math.log10(count),
+            color="#3186cc",
+            fill=True,
+            fill_opacity=0.6,
+            tooltip=f"북마크 {count:,}곳",
+        ).add_to(layer)
+    return layer, 0, in_view
@@ -0,0 +1,364 @@
+import math
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+import numpy as np
+
+# 기본 북마크 저장소 위치 (페이지 실행 폴더 기준)
+DEFAULT_STORE_PATH = os.path.join(".cache", "bookmarks.sqlite")
+# 공간 격자 한 칸의 크기 (도). 0.01도는 위도 방향으로 약 1.1km
+GRID_DEG = 0.01
+# 위도·경도 차이가 둘 다 이 값 이하면 같은 장소로 본다 (약 1m)
+DEDUP_DEG = 1e-5
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS bookmarks (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    lat REAL NOT NULL,
+    lon REAL NOT NULL,
+    gy INTEGER NOT NULL,
+    gx INTEGER NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS bookmarks_grid ON bookmarks (gy, gx, lat, lon);
+"""
+
+# 한 묶음을 넣기 전 잠시 담아 두는 표 (격자 순서로 정렬해 넣고, 주변 칸 범위를 미리 계산해 둔다)
+_INCOMING_SCHEMA = """
+CREATE TEMP TABLE IF NOT EXISTS incoming (
+    name TEXT NOT NULL,
+    lat REAL NOT NULL,
+    lon REAL NOT NULL,
+    gy INTEGER NOT NULL,
+    gx INTEGER NOT NULL,
+    gy0 INTEGER NOT NULL,
+    gy1 INTEGER NOT NULL,
+    gx0 INTEGER NOT NULL,
+    gx1 INTEGER NOT NULL
+)
+"""
+# 대량으로 넣을 때 연결에 쓰는 설정: 인덱스 페이지를 메모리에 16MB까지 두고,
+# WAL에서는 안전한 NORMAL 동기화로 트랜잭션마다 fsync를 줄인다
+_BULK_PRAGMAS = "PRAGMA cache_size=-16384; PRAGMA synchronous=NORMAL;"
+# 중복을 찾을 때 나누는 칸의 최소 크기 (도) — 칸 번호 하나가 int64를 넘지 않도록
+_MIN_DEDUP_CELL = 1e-6
+
+
+def _cell_keys(lats, lons, cell):
+    """위경도를 cell 크기 칸 번호 하나(int64)로 바꾼다. 남북 이웃 칸은 ±width, 동서 이웃 칸은 ±1 차이"""
+    width = int(360 / cell) + 3
+    ky = np.floor(np.asarray(lats) / cell).astype(np.int64) + (int(90 / cell) + 1)
+    kx = np.floor(np.asarray(lons) / cell).astype(np.int64) + (int(180 / cell) + 1)
+    return ky * width + kx, width
+
+
+def _neighbor_offsets(width):
+    return [dy * width + dx for dy in (-1, 0, 1) for dx in (-1, 0, 1)]
+
+
+def _search(sorted_keys, keys, order):
+    """keys 각각의 sorted_keys 안 자리와 같은 값이 있는지 — order(keys를 정렬하는 순서)대로 찾으면 메모리 접근이 몰려 빠르다.
+
+    keys에 같은 수를 더해도 순서는 그대로라 이웃 칸을 찾을 때 order를 다시 쓴다.
+    """
+    pos = np.empty(len(keys), dtype=np.intp)
+    pos[order] = np.searchsorted(sorted_keys, keys[order])
+    found = pos < len(sorted_keys)
+    found[found] = sorted_keys[pos[found]] == keys[found]
+    return pos, found
+
+
+def _is_near(lat, lon, other_lat, other_lon, tolerance):
+    # 저장소 SQL의 BETWEEN 비교와 같은 식
+    return lat - tolerance <= other_lat <= lat + tolerance and lon - tolerance <= other_lon <= lon + tolerance
+
+
+def _first_of_near(lats, lons, tolerance):
+    """앞선 점과 위도·경도 차이가 모두 tolerance 이하인 점을 뺀 (N,) bool 표시.
+
+    tolerance 크기 칸으로 나눠 자기·이웃 칸에 다른 점이 없는 점(대부분)은 바로 남기고,
+    이웃이 있는 점만 원래 순서대로 실제 좌표를 비교한다. 앞선 점은 빠졌더라도 기준이 된다.
+    """
+    keep = np.ones(len(lats), dtype=bool)
+    if len(lats) < 2:
+        return keep
+    keys, width = _cell_keys(lats, lons, max(tolerance, _MIN_DEDUP_CELL))
+    order = np.argsort(keys, kind="stable")
+    occupied, counts = np.unique(keys[order], return_counts=True)
+    crowded = np.zeros(len(lats), dtype=bool)
+    for offset in _neighbor_offsets(width):
+        pos, found = _search(occupied, keys + offset, order)
+        others = counts[np.minimum(pos, len(occupied) - 1)] - (1 if offset == 0 else 0)  # 자기 칸은 자기 자신을 뺀다
+        crowded |= found & (others > 0)
+
+    seen = {}
+    rows = np.flatnonzero(crowded)
+    for row, key, lat, lon in zip(rows.tolist(), keys[rows].tolist(), lats[rows].tolist(), lons[rows].tolist()):
+        keep[row] = not any(
+            _is_near(lat, lon, other_lat, other_lon, tolerance)
+            for offset in _neighbor_offsets(width)
+            for other_lat, other_lon in seen.get(key + offset, ())
+        )
+        seen.setdefault(key, []).append((lat, lon))
+    return keep
+
+
+class _PointIndex:
+    """tolerance 크기 칸 번호 순으로 정렬해 둔 점들 — 새 점 가운데 가까운 점이 이미 있는 것을 numpy로 찾는다"""
+
+    def __init__(self, tolerance):
+        self.tolerance = tolerance
+        self.cell = max(tolerance, _MIN_DEDUP_CELL)
+        self.keys = np.empty(0, dtype=np.int64)
+        self.lats = np.empty(0)
+        self.lons = np.empty(0)
+
+    def near(self, lats, lons):
+        """(N,) bool — 넣어 둔 점과 위도·경도 차이가 모두 tolerance 이하인 새 점"""
+        result = np.zeros(len(lats), dtype=bool)
+        if len(self.keys) == 0 or len(lats) == 0:
+            return result
+        keys, width = _cell_keys(lats, lons, self.cell)
+        order = np.argsort(keys, kind="stable")
+        for offset in _neighbor_offsets(width):
+            pos, found = _search(self.keys, keys + offset, order)
+            # 이웃 칸에 점이 있는 새 점(드물다)만 그 칸의 점들과 실제 좌표를 비교한다
+            for row in np.flatnonzero(found & ~result).tolist():
+                key, lat, lon = keys[row] + offset, lats[row], lons[row]
+                p = pos[row]
+                while p < len(self.keys) and self.keys[p] == key:
+                    if _is_near(lat, lon, self.lats[p], self.lons[p], self.tolerance):
+                        result[row] = True
+                        break
+                    p += 1
+        return result
+
+    def add(self, lats, lons):
+        keys, _ = _cell_keys(lats, lons, self.cell)
+        order = np.argsort(keys, kind="stable")
+        pos = np.searchsorted(self.keys, keys[order], side="right")
+        self.keys = np.insert(self.keys, pos, keys[order])
+        self.lats = np.insert(self.lats, pos, np.asarray(lats)[order])
+        self.lons = np.insert(self.lons, pos, np.asarray(lons)[order])
+
+
+def check_coordinates(lat, lon):
+    """위도·경도 범위를 확인한다. 벗어나면 ValueError"""
+    if not (-90.0 <= lat <= 90.0) or not (-180.0 <= lon <= 180.0) or math.isnan(lat + lon):
+        raise ValueError(f"좌표 범위를 벗어났습니다: ({lat}, {lon})")
+
+
+class BookmarkStore:
+    """북마크를 SQLite에 저장하고 격자 칸 번호로 화면 범위 안의 점만 찾는 저장소.
+
+    점마다 (gy, gx) = (위도, 경도) // GRID_DEG 칸 번호를 함께 저장하고 그 위에
+    인덱스를 둔다. 화면 범위 조회는 해당하는 칸 범위만 읽은 뒤 실제 좌표로 거른다.
+    bounds는 (남, 서, 북, 동) 위경도 튜플이다.
+    """
+
+    def __init__(self, path=DEFAULT_STORE_PATH, grid_deg=GRID_DEG):
+        self.path = path
+        self.grid_deg = grid_deg
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        # 세션 스레드마다 짧게 열고 닫는다 (WAL이라 읽기와 쓰기가 서로 막지 않음)
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def cell(self, lat, lon):
+        return math.floor(lat / self.grid_deg), math.floor(lon / self.grid_deg)
+
+    def _grid_clause(self, bounds):
+        south, west, north, east = bounds
+        (gy0, gx0), (gy1, gx1) = self.cell(south, west), self.cell(north, east)
+        clause = "gy BETWEEN ? AND ? AND gx BETWEEN ? AND ? AND lat BETWEEN ? AND ? AND lon BETWEEN ? AND ?"
+        return clause, (gy0, gy1, gx0, gx1, south, north, west, east)
+
+    def add(self, name, lat, lon):
+        """북마크 하나를 저장하고 id를 돌려준다"""
+        check_coordinates(lat, lon)
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "INSERT INTO bookmarks (name, lat, lon, gy, gx, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (name, lat, lon, *self.cell(lat, lon), time.time()),
+            )
+            return cursor.lastrowid
+
+    def add_many(self, places):
+        """(이름, 위도, 경도) 여러 개를 한 트랜잭션으로 저장한다. 저장한 개수를 돌려준다"""
+        now = time.time()
+        rows = []
+        for name, lat, lon in places:
+            check_coordinates(lat, lon)
+            rows.append((name, lat, lon, *self.cell(lat, lon), now))
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT INTO bookmarks (name, lat, lon, gy, gx, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+        return len(rows)
+
+    def add_chunk(self, names, lats, lons, tolerance=DEDUP_DEG):
+        """좌표 배열 한 묶음을 한 트랜잭션으로 넣는다. 넣은 개수를 돌려준다 (bulk_insert 참고)"""
+        with self.bulk_insert(tolerance) as add:
+            return add(names, lats, lons)
+
+    @contextmanager
+    def bulk_insert(self, tolerance=DEDUP_DEG):
+        """여러 묶음을 연결 하나로 넣는 add(names, lats, lons) 함수를 빌려준다.
+
+        add는 넣은 개수를 돌려준다. 이미 저장된 점이나 앞서 넣은 점과 위도·경도 차이가 모두
+        tolerance 이하인 점은 건너뛴다. 이번에 넣는 점끼리는 numpy로 비교하고, 저장소에 있던 점
+        (다른 세션이 그사이 넣은 점 포함)과는 그 점들이 있는 격자 칸에 들어가는 점만 SQLite 격자
+        인덱스로 비교한다. 좌표 범위 검사는 호출하는 쪽에서 끝낸 것으로 본다.
+        add 한 번이 트랜잭션 하나라 다른 세션의 쓰기는 묶음 하나만큼만 기다린다. add가 예외로
+        끝나면 그 묶음만 되돌리고, 앞서 끝난 묶음은 저장된 채로 남는다.
+        """
+        if tolerance >= self.grid_deg:
+            raise ValueError("tolerance는 격자 칸 크기보다 작아야 합니다")
+        columns = "name, lat, lon, gy, gx, created_at"
+        # tolerance가 칸보다 작으므로 이웃 칸은 축마다 많아야 두 개 — IN으로 인덱스를 등호 조회
+        insert_new = (
+            f"INSERT INTO bookmarks ({columns}) "
+            "SELECT i.name, i.lat, i.lon, i.gy, i.gx, :now FROM incoming i "
+            "WHERE NOT EXISTS (SELECT 1 FROM bookmarks b WHERE b.gy IN (i.gy0, i.gy1) AND b.gx IN (i.gx0, i.gx1) "
+            "AND b.lat BETWEEN i.lat - :tol AND i.lat + :tol AND b.lon BETWEEN i.lon - :tol AND i.lon + :tol) "
+            "ORDER BY i.rowid"
+        )
+        # 이번에 넣은 점 (묶음 사이 중복 확인용)
+        session = _PointIndex(tolerance)
+
+        def cells(values):
+            return np.floor(values / self.grid_deg).astype(np.int64)
+
+        with self._connect() as conn:
+            conn.executescript(_BULK_PRAGMAS + _INCOMING_SCHEMA)
+            grid_width = int(360 / self.grid_deg) + 3
+            # 다른 세션이 넣은 점이 있는 격자 칸 번호 (정렬됨) — 이 칸들에 닿는 점만 SQLite에서 비교한다.
+            # last_id는 이 세션이 마지막으로 확인한 id라, 그 뒤의 행은 모두 다른 세션이 넣은 것이다.
+            state = {"cells": np.empty(0, dtype=np.int64), "last_id": -1}
+
+            def refresh_stored_cells():
+                rows = conn.execute(
+                    "SELECT DISTINCT gy, gx FROM bookmarks WHERE id > ?", (state["last_id"],)
+                ).fetchall()
+                if rows:
+                    stored = np.array(rows, dtype=np.int64)
+                    state["cells"] = np.union1d(state["cells"], stored[:, 0] * grid_width + stored[:, 1])
+
+            def add(names, lats, lons):
+                lats = np.asarray(lats, dtype=float)
+                lons = np.asarray(lons, dtype=float)
+                keep = _first_of_near(lats, lons, tolerance)
+                keep[keep] = ~session.near(lats[keep], lons[keep])
+                # 묶음 안에서처럼 앞 묶음의 점은 빠졌더라도 기준이 된다
+                session.add(lats, lons)
+                names = np.asarray(names, dtype=object)[keep]
+                lats, lons = lats[keep], lons[keep]
+                if len(lats) == 0:
+                    return 0
+
+                gy, gx = cells(lats), cells(lons)
+                near_cells = (cells(lats - tolerance), cells(lats + tolerance), cells(lons - tolerance), cells(lons + tolerance))
+                gy0, gy1, gx0, gx1 = near_cells
+                # 격자 순서로 넣으면 격자 인덱스에 쓰는 페이지가 몰려서 빠르다
+                order = np.lexsort((gx, gy))
+
+                # 쓰기 잠금을 먼저 잡아 칸 확인과 넣기 사이에 다른 세션이 끼어들지 못하게 한다
+                conn.execute("BEGIN IMMEDIATE")
+                try:
+                    refresh_stored_cells()
+                    maybe_stored = np.zeros(len(lats), dtype=bool)
+                    if len(state["cells"]):
+                        for y, x in ((gy0, gx0), (gy0, gx1), (gy1, gx0), (gy1, gx1)):
+                            keys = y * grid_width + x
+                            maybe_stored |= _search(state["cells"], keys, np.argsort(keys))[1]
+                    fresh, check = order[~maybe_stored[order]], order[maybe_stored[order]]
+                    now = time.time()
+                    conn.executemany(
+                        f"INSERT INTO bookmarks ({columns}) VALUES (?, ?, ?, ?, ?, {now!r})",
+                        zip(*(column[fresh].tolist() for column in (names, lats, lons, gy, gx))),
+                    )
+                    inserted = len(fresh)
+                    if len(check):
+                        conn.executemany(
+                            "INSERT INTO incoming VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                            zip(*(column[check].tolist() for column in (names, lats, lons, gy, gx, *near_cells))),
+                        )
+                        before = conn.total_changes
+                        conn.execute(insert_new, {"tol": tolerance, "now": now})
+                        inserted += conn.total_changes - before
+                        conn.execute("DELETE FROM incoming")
+                    state["last_id"] = conn.execute("SELECT COALESCE(MAX(id), -1) FROM bookmarks").fetchone()[0]
+                    conn.commit()
+                except BaseException:
+                    conn.rollback()
+                    raise
+                return inserted
+
+            yield add
+
+    def delete(self, bookmark_id):
+        with self._connect() as conn:
+            conn.execute("DELETE FROM bookmarks WHERE id = ?", (bookmark_id,))
+
+    def count(self, bounds=None):
+        """전체 또는 화면 범위 안의 북마크 수"""
+        with self._connect() as conn:
+            if bounds is None:
+                return conn.execute("SELECT COUNT(*) FROM bookmarks").fetchone()[0]
+            clause, params = self._grid_clause(bounds)
+            return conn.execute(f"SELECT COUNT(*) FROM bookmarks WHERE {clause}", params).fetchone()[0]
+
+    def in_bounds(self, bounds, limit=None):
+        """화면 범위 안의 [(id, 이름, 위도, 경도)] — 최근 저장한 순"""
+        clause, params = self._grid_clause(bounds)
+        sql = f"SELECT id, name, lat, lon FROM bookmarks WHERE {clause} ORDER BY id DESC"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params += (limit,)
+        with self._connect() as conn:
+            return conn.execute(sql, params).fetchall()
+
+    def clusters(self, bounds, cell_deg):
+        """화면 범위 안의 북마크를 cell_deg 크기 칸으로 묶은 [(평균 위도, 평균 경도, 개수)]"""
+        clause, params = self._grid_clause(bounds)
+        factor = max(1, round(cell_deg / self.grid_deg))
+        # 저장된 칸 번호를 factor개씩 묶는다 (음수 칸도 내림이 되도록)
+        coarse = "(CASE WHEN {0} >= 0 THEN {0} / {1} ELSE ({0} - {1} + 1) / {1} END)"
+        with self._connect() as conn:
+            return conn.execute(
+                f"SELECT AVG(lat), AVG(lon), COUNT(*) FROM bookmarks WHERE {clause} "
+                f"GROUP BY {coarse.format('gy', factor)}, {coarse.format('gx', factor)}",
+                params,
+            ).fetchall()
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def bookmark_store(path=DEFAULT_STORE_PATH):
+    """경로별로 프로세스에 하나만 두는 BookmarkStore"""
+    store = _stores.get(path)
+    if store is None:
+        with _stores_lock:
+            store = _stores.get(path)
+            if store is None:
+                store = BookmarkStore(path)
+                _stores[path] = store
+    return store
@@ -1,27 +1,135 @@
+import sqlite3
+
 import streamlit as st
-import folium
-from streamlit_folium import st_folium
+
+from bookmarks import bookmark_store
+from utils.debug_panel import page_trace, show_trace
+from utils.trace import span
+
+page_trace("main")  # ?debug=1로 열면 사이드바에 구간 시간표
 
 st.title("🗺️ 나만의 위치 북마크 지도")
 
 st.write("아래에 장소 정보를 입력하고 지도에 표시해보세요!")
 
+# 북마크 저장소 (SQLite, 세션이 끝나도 남는다)
+store = bookmark_store()
+
 # 장소 입력
 place = st.text_input("장소 이름", value="서울 시청")
 lat = st.number_input("위도 (Latitude)", value=37.5665, format="%.6f")
 lon = st.number_input("경도 (Longitude)", value=126.9780, format="%.6f")
 
-# 세션 상태 저장
-if "places" not in st.session_state:
-    st.session_state.places = []
-
 if st.button("지도에 추가하기"):
-    st.session_state.places.append((place, lat, lon))
+    try:
+        store.add(place, lat, lon)
+    except ValueError as e:
+        st.error(str(e))
+    except sqlite3.OperationalError as e:  # 다른 세션이 오래 쓰고 있어 잠금을 못 잡은 경우
+        st.error(f"저장소가 사용 중이라 저장하지 못했습니다. 잠시 뒤 다시 시도해 주세요 ({e})")
+
+# 여러 장소 한 번에 가져오기 (큰 파일도 묶음 단위로 읽어 한 트랜잭션씩 저장)
+with st.expander("📂 CSV / GeoJSON 파일로 여러 장소 가져오기"):
+    st.caption("CSV는 이름·위도·경도 열(name/lat/lon 등)이 필요하고, GeoJSON은 Point·MultiPoint만 가져옵니다. 약 1m 안에 이미 있는 장소는 건너뜁니다.")
+    uploaded = st.file_uploader("파일 선택", type=["csv", "geojson", "json", "geojsonl", "geojsons"])
+    if uploaded is not None and st.button("가져오기"):
+        from bookmarks import import_points  # 가져오기(pandas)는 누를 때만 불러온다
 
-# 지도 그리기
+        progress = st.empty()
+        try:
+            with span("import_points", file=uploaded.name):
+                report = import_points(
+                    store, uploaded,
+                    progress=lambda r: progress.write(f"⏳ {r.read:,}개 읽음 · {r.inserted:,}개 저장"),
+                )
+        except ValueError as e:
+            progress.empty()
+            st.error(str(e))
+        else:
+            progress.empty()
+            st.success(
+                f"{report.read:,}개 중 {report.inserted:,}개를 저장했습니다 "
+                f"(중복 {report.duplicates:,}개, 잘못된 좌표 {report.invalid:,}개 건너뜀)"
+            )
+
+# 지도 모듈(folium)은 입력란을 먼저 그린 뒤에 불러온다
+import folium
+from streamlit_folium import st_folium
+
+from bookmarks import bookmark_layer, parse_bounds, view_bounds
+
+# 지도 화면 상태: 마지막으로 본 중심·확대 단계·범위 (st_folium이 key 아래에 남겨 둔다)
+map_width, map_height = 700, 500
+view = st.session_state.get("bookmark_map") or {}
+center = view.get("center") or {"lat": 37.5665, "lng": 126.9780}
+center = (center["lat"], center["lng"])
+zoom = view.get("zoom") or 6
+bounds = parse_bounds(view.get("bounds")) or view_bounds(center, zoom, map_width, map_height)
+
+# 지도 그리기: 바탕 지도는 그대로 두고, 화면 안 레이어들만 바꿔 끼운다
 m = folium.Map(location=[37.5665, 126.9780], zoom_start=6)
-for name, lat, lon in st.session_state.places:
-    folium.Marker([lat, lon], tooltip=name).add_to(m)
+layers = []
+
+# 인구 구조 지도: 행정동 경계를 연령대 비율로 칠한다 (경계 파일이 있을 때만)
+mode = st.radio("🗺️ 지도 보기", options=["북마크", "인구 구조 지도"], horizontal=True)
+if mode == "인구 구조 지도":
+    # 인구·경계 모듈은 이 모드에서만 불러온다 (북마크만 볼 때 첫 화면이 빨라지도록)
+    from population import (
+        BAND_LABELS,
+        BANDS,
+        DEFAULT_BOUNDARY_FILE,
+        band_colormap,
+        boundary_tiles,
+        choropleth_layer,
+        choropleth_values,
+        load_population,
+    )
+
+    col_level, col_band = st.columns(2)
+    with col_level:
+        map_level = st.radio("🧭 칠할 단위", options=["읍면동", "시군구", "시도"], horizontal=True)
+    with col_band:
+        map_band = st.selectbox("📊 연령대", options=BANDS, format_func=BAND_LABELS.get, index=BANDS.index("elderly"))
+
+    with span("boundary_tiles"):
+        tiles = boundary_tiles()
+    if tiles is None:
+        st.info(
+            f"행정동 경계 파일({DEFAULT_BOUNDARY_FILE})을 앱 폴더에 두면 인구 구조 지도를 볼 수 있습니다. "
+            "(예: github.com/vuski/admdongkor 의 HangJeongDong GeoJSON)"
+        )
+    else:
+        with span("choropleth_values", level=map_level):
+            population = load_population("202504_202504_연령별인구현황_월간_남녀구분.csv")
+            values = choropleth_values(population, map_level, map_band)
+            colormap = band_colormap(values["value"], map_band)
+            colormap.add_to(m)  # 범례
+        with span("choropleth_layer", zoom=zoom):
+            choropleth, painted = choropleth_layer(
+                tiles, bounds, zoom, values, colormap, outline=(map_level == "읍면동")
+            )
+        layers.append(choropleth)
+        st.caption(f"화면 안 행정동 경계 {painted:,}곳 (확대 단계 {tiles.zoom_for(zoom)}에 맞게 단순화)")
+
+with span("bookmark_layer", zoom=zoom):
+    layer, shown, in_view = bookmark_layer(store, bounds, zoom)
+layers.append(layer)
+
+st.caption(
+    f"저장된 북마크 {store.count():,}곳 · 화면 안 {in_view:,}곳"
+    + ("" if shown == in_view else " (많아서 지역별로 묶어 표시 — 확대하면 개별 마커가 보입니다)")
+)
 
-st_folium(m, width=700, height=500)
+with span("st_folium"):
+    st_folium(
+        m,
+        key="bookmark_map",
+        center=center,
+        zoom=zoom,
+        feature_group_to_add=layers,
+        returned_objects=["bounds", "zoom", "center"],  # 화면 범위만 돌려받는다
+        width=map_width,
+        height=map_height,
+    )
 
+show_trace()
@@ -0,0 +1,24 @@
+from market.analytics import PriceAnalytics, build_analytics, price_analytics
+from market.charts import line_figure, series_points
+from market.downsample import downsample
+from market.fetch import PRICE_COLUMNS, frame_fetcher, yfinance_fetch
+from market.refresh import BackgroundRefresher, Freshness, price_refresher
+from market.store import PriceStore, price_store, recent_range
+
+__all__ = [
+    "PRICE_COLUMNS",
+    "BackgroundRefresher",
+    "Freshness",
+    "PriceAnalytics",
+    "PriceStore",
+    "build_analytics",
+    "downsample",
+    "frame_fetcher",
+    "line_figure",
+    "price_analytics",
+    "price_refresher",
+    "price_store",
+    "recent_range",
+    "series_points",
+    "yfinance_fetch",
+]
@@ -0,0 +1,110 @@
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from utils.trace import count
+
+# 연율화에 쓰는 1년 거래일 수
+TRADING_DAYS = 252
+# 변동성을 계산하는 기본 이동 구간 (거래일)
+DEFAULT_WINDOW = 20
+# 프로세스에 남겨 둘 분석 결과 수 (종목 조합·기간별)
+_MAX_CACHED = 16
+
+
+@dataclass(frozen=True, eq=False)
+class PriceAnalytics:
+    """날짜 × 종목 넓은 표 위에서 한 번에 계산한 종목 간 분석 결과.
+
+    모든 표는 같은 날짜 인덱스와 열(종목)을 가지므로, 여러 기업을 비교할 때는
+    필요한 열만 잘라 쓰면 된다.
+    """
+
+    close: pd.DataFrame         # 거래일을 합쳐 맞추고 앞 값으로 채운 종가
+    normalized: pd.DataFrame    # 종목별 첫 종가 = 100 기준 누적 성과
+    returns: pd.DataFrame       # 일간 수익률
+    volatility: pd.DataFrame    # 이동 구간 연율화 변동성
+    drawdown: pd.DataFrame      # 직전 고점 대비 하락률 (0 이하)
+    correlation: pd.DataFrame   # 일간 수익률 상관계수 (종목 × 종목)
+    last_dates: pd.Series       # 종목별 실제 마지막 거래일 (채운 값 제외)
+
+    @property
+    def symbols(self):
+        return list(self.close.columns)
+
+    def summary(self, symbols=None):
+        """종목별 기간 수익률·최근 변동성·최대 낙폭 표"""
+        symbols = self.symbols if symbols is None else list(symbols)
+        return pd.DataFrame({
+            "기간 수익률": self.normalized[symbols].iloc[-1:].mean() / 100 - 1,
+            "최근 변동성": self.volatility[symbols].iloc[-1:].mean(),
+            "최대 낙폭": self.drawdown[symbols].min(),
+        }, index=symbols)
+
+
+def build_analytics(matrix, window=DEFAULT_WINDOW):
+    """날짜 × 종목 종가 표 전체에 대해 분석 표를 한 번에 계산한다.
+
+    거래소마다 쉬는 날이 달라 생긴 빈칸은 직전 종가로 채워 달력을 맞춘다
+    (그날 수익률은 0). 상장 전처럼 앞쪽이 비어 있는 칸은 그대로 NaN이다.
+    """
+    last_dates = matrix.apply(pd.Series.last_valid_index)
+    close = matrix.ffill()
+    values = close.to_numpy(dtype=float)
+
+    # 종목별 첫 유효 종가 (앞쪽이 비어 있는 종목 대비), 아직 가격이 없으면 NaN
+    first = np.full(values.shape[1], np.nan)
+    if len(values):
+        first_rows = np.argmax(~np.isnan(values), axis=0)
+        first = values[first_rows, np.arange(values.shape[1])]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        normalized = values / first * 100
+        returns = np.full_like(values, np.nan)
+        returns[1:] = values[1:] / values[:-1] - 1
+        drawdown = values / np.fmax.accumulate(values, axis=0) - 1
+
+    def frame(array):
+        return pd.DataFrame(array, index=close.index, columns=close.columns)
+
+    returns = frame(returns)
+    volatility = returns.rolling(window, min_periods=window).std() * np.sqrt(TRADING_DAYS)
+    return PriceAnalytics(
+        close=close,
+        normalized=frame(normalized),
+        returns=returns,
+        volatility=volatility,
+        drawdown=frame(drawdown),
+        correlation=returns.corr(),
+        last_dates=last_dates,
+    )
+
+
+_lock = threading.Lock()
+_cache = OrderedDict()
+
+
+def price_analytics(store, symbols, start, end, window=DEFAULT_WINDOW):
+    """저장소의 종가로 만든 PriceAnalytics — 저장된 가격이 바뀔 때만 다시 계산한다.
+
+    캐시 키에 종목별 마지막 저장 시각을 넣으므로, 뒤에서 갱신이 끝나면
+    다음 호출에서 자동으로 새로 계산한다.
+    """
+    symbols = tuple(symbols)
+    key = (store.path, symbols, str(start), str(end), window, store.version(symbols))
+    with _lock:
+        analytics = _cache.get(key)
+        if analytics is not None:
+            _cache.move_to_end(key)
+    count("price_analytics", analytics is not None)
+    if analytics is not None:
+        return analytics
+
+    analytics = build_analytics(store.read_matrix(symbols, start, end), window=window)
+    with _lock:
+        _cache[key] = analytics
+        while len(_cache) > _MAX_CACHED:
+            _cache.popitem(last=False)
+    return analytics
@@ -0,0 +1,49 @@
+import threading
+import weakref
+
+import plotly.graph_objects as go
+
+from market.downsample import downsample
+from utils.trace import count
+
+# 종목 하나를 그릴 때 보내는 기본 점 개수 (넓은 화면의 차트 가로 픽셀 수 정도)
+DEFAULT_POINTS = 1200
+# 그림 전체 점 개수가 이보다 많으면 SVG 대신 WebGL(Scattergl)로 그린다
+GL_THRESHOLD = 5000
+
+_lock = threading.Lock()
+_series = weakref.WeakKeyDictionary()
+
+
+def series_points(analytics, table, symbol, points=DEFAULT_POINTS, method="lttb"):
+    """analytics의 table 표에서 symbol 열을 points개 안팎으로 줄인 (x, y).
+
+    PriceAnalytics는 종목 조합·기간·저장 시각마다 하나씩 만들어지므로, 그 객체에
+    (표, 종목, 해상도, 방식)별로 붙여 두면 같은 화면을 다시 그릴 때 다시 줄이지 않는다.
+    """
+    key = (table, symbol, points, method)
+    with _lock:
+        cached = _series.setdefault(analytics, {})
+        hit = key in cached
+        if hit:
+            result = cached[key]
+    count("series_points", hit)
+    if hit:
+        return result
+    column = getattr(analytics, table)[symbol]
+    result = downsample(column.index.to_numpy(), column.to_numpy(), points, method=method)
+    with _lock:
+        cached[key] = result
+    return result
+
+
+def line_figure(analytics, table, symbols, names=None, points=DEFAULT_POINTS, method="lttb"):
+    """선택한 종목을 줄인 점으로 그린 선 그래프. 점이 많으면 Scattergl을 쓴다"""
+    names = names or {}
+    series = [(symbol, *series_points(analytics, table, symbol, points, method)) for symbol in symbols]
+    total_points = sum(len(x) for _, x, _ in series)
+    trace = go.Scattergl if total_points > GL_THRESHOLD else go.Scatter
+    fig = go.Figure()
+    for symbol, x, y in series:
+        fig.add_trace(trace(x=x, y=y, mode='lines', name=names.get(symbol, symbol)))
+    return fig
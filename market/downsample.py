@@ -0,0 +1,80 @@
+import numpy as np
+
+# 지원하는 줄이기 방식
+METHODS = ("lttb", "minmax")
+
+
+def _as_float(x):
+    """날짜 축은 ns 정수로 바꿔 넓이 계산에 쓴다"""
+    x = np.asarray(x)
+    if np.issubdtype(x.dtype, np.datetime64):
+        return x.astype("datetime64[ns]").astype(np.int64).astype(float)
+    return x.astype(float)
+
+
+def _bucket_edges(n, n_buckets):
+    # 첫 점과 마지막 점을 뺀 가운데 구간을 n_buckets개로 고르게 나눈다
+    return np.linspace(1, n - 1, n_buckets + 1).astype(np.intp)
+
+
+def lttb_indices(x, y, n_out):
+    """Largest-Triangle-Three-Buckets로 고른 점의 위치 (첫 점·끝 점 포함 n_out개).
+
+    구간마다 직전에 고른 점과 다음 구간 평균점으로 만든 삼각형 넓이가 가장 큰 점을
+    남겨, 적은 점으로도 봉우리와 골짜기 모양을 유지한다.
+    """
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    x, y = _as_float(x), np.asarray(y, dtype=float)
+    edges = _bucket_edges(n, n_out - 2)
+    # 다음 구간 평균점은 누적합으로 한 번에 구한다
+    cum_x = np.concatenate(([0.0], np.cumsum(x)))
+    cum_y = np.concatenate(([0.0], np.cumsum(y)))
+    next_starts = np.append(edges[1:-1], n - 1)
+    next_ends = np.append(edges[2:], n)
+    counts = next_ends - next_starts
+    mean_x = (cum_x[next_ends] - cum_x[next_starts]) / counts
+    mean_y = (cum_y[next_ends] - cum_y[next_starts]) / counts
+
+    picked = np.empty(n_out, dtype=np.intp)
+    picked[0], picked[-1] = 0, n - 1
+    prev = 0
+    for b in range(n_out - 2):
+        lo, hi = edges[b], edges[b + 1]
+        bx, by = x[lo:hi], y[lo:hi]
+        area = np.abs((x[prev] - mean_x[b]) * (by - y[prev]) - (x[prev] - bx) * (mean_y[b] - y[prev]))
+        prev = lo + int(np.argmax(area))
+        picked[b + 1] = prev
+    return picked
+
+
+def minmax_indices(y, n_out):
+    """구간마다 최솟값과 최댓값 두 점을 남긴 위치 (시간 순서, 약 n_out개)"""
+    n = len(y)
+    if n_out >= n or n_out < 4:
+        return np.arange(n)
+    y = np.asarray(y, dtype=float)
+    edges = _bucket_edges(n, (n_out - 2) // 2)
+    buckets = np.repeat(np.arange(len(edges) - 1), np.diff(edges))
+    inner = np.arange(edges[0], edges[-1])
+    # 구간 번호, 값 순으로 정렬하면 구간마다 첫 점이 최솟값, 끝 점이 최댓값
+    order = inner[np.lexsort((y[inner], buckets))]
+    starts = edges[:-1] - 1
+    ends = edges[1:] - 2
+    picked = np.concatenate(([0], order[starts], order[ends], [n - 1]))
+    return np.unique(picked)
+
+
+def downsample(x, y, n_out, method="lttb"):
+    """NaN을 뺀 (x, y)를 n_out개 안팎의 점으로 줄인다. 원래 점이 더 적으면 그대로"""
+    if method not in METHODS:
+        raise ValueError(f"알 수 없는 줄이기 방식입니다: {method}")
+    x, y = np.asarray(x), np.asarray(y, dtype=float)
+    keep = ~np.isnan(y)
+    x, y = x[keep], y[keep]
+    if method == "lttb":
+        picked = lttb_indices(x, y, n_out)
+    else:
+        picked = minmax_indices(y, n_out)
+    return x[picked], y[picked]
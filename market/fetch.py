@@ -0,0 +1,72 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+# 가격 저장소가 쓰는 컬럼 (yfinance 일봉 기준)
+PRICE_COLUMNS = ("Open", "High", "Low", "Close", "Volume")
+
+
+def _normalize(df):
+    """날짜 인덱스(tz 없음) + PRICE_COLUMNS만 남긴 일봉 표"""
+    if df is None or df.empty:
+        return pd.DataFrame(columns=list(PRICE_COLUMNS), index=pd.DatetimeIndex([], name="Date"))
+    df = df.dropna(how="all")
+    df = df.reindex(columns=list(PRICE_COLUMNS))
+    index = pd.DatetimeIndex(df.index)
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    df.index = index.normalize().rename("Date")
+    return df
+
+
+def _history(yf, symbol, start, end, timeout):
+    """한 종목 일봉. 받기에 실패하면 None, 구간에 봉이 없다고 확인되면 빈 표"""
+    from yfinance.exceptions import YFPricesMissingError
+
+    try:
+        # raise_errors가 없으면 yfinance는 네트워크 오류도 로그만 남기고 빈 표를 돌려준다
+        df = yf.Ticker(symbol).history(
+            start=start, end=end, actions=False, timeout=timeout, raise_errors=True,
+        )
+    except YFPricesMissingError as e:
+        # 응답은 왔지만 그 구간에 봉이 없다 (상장 전 등). Yahoo 오류 상태 코드는 실패로 본다.
+        return None if "status_code" in (e.debug_info or "") else _normalize(None)
+    except Exception:
+        return None
+    return _normalize(df)
+
+
+def yfinance_fetch(symbols, start, end, timeout=10, max_workers=8):
+    """종목마다 Ticker.history로 받는다 (스레드 여러 개로 동시에). end는 포함하지 않는다.
+
+    반환: {종목: 일봉 DataFrame} — 받기에 실패한 종목은 빠지고, 그 구간에 거래가 없으면 빈 표.
+    yf.download은 종목별 실패를 알려 주지 않아 빈 표와 구분할 수 없으므로 쓰지 않는다.
+    """
+    import yfinance as yf
+
+    symbols = list(symbols)
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(symbols)))) as executor:
+        results = executor.map(lambda symbol: _history(yf, symbol, start, end, timeout), symbols)
+        frames = dict(zip(symbols, results))
+    return {symbol: df for symbol, df in frames.items() if df is not None}
+
+
+def frame_fetcher(frames, failing=()):
+    """네트워크 대신 미리 준비한 {종목: DataFrame}에서 잘라 주는 fetch 함수 (오프라인 테스트용).
+
+    failing에 든 종목은 받기에 실패한 것처럼 결과에서 뺀다.
+    """
+    frames = {symbol: _normalize(df) for symbol, df in frames.items()}
+    failing = set(failing)
+
+    def fetch(symbols, start, end, timeout=None):
+        start, end = pd.Timestamp(start), pd.Timestamp(end)
+        result = {}
+        for symbol in symbols:
+            if symbol in failing:
+                continue
+            df = frames.get(symbol, _normalize(None))
+            result[symbol] = df[(df.index >= start) & (df.index < end)]
+        return result
+
+    return fetch
@@ -0,0 +1,140 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+from market.store import price_store
+
+# 종목 하나를 받을 때 기다리는 최대 시간 (초)
+DEFAULT_TIMEOUT = 15
+# 받기에 실패한 종목을 다시 시도하기 전 기다리는 시간 (초) — 연달아 실패할 때마다 두 배로 늘린다
+DEFAULT_RETRY_AFTER = 5 * 60
+# 다시 시도 간격의 상한 (초)
+MAX_RETRY_AFTER = 6 * 60 * 60
+
+
+@dataclass(frozen=True)
+class Freshness:
+    """종목별 갱신 상태"""
+
+    state: str          # "fresh" | "refreshing" | "failed" | "empty"
+    fetched_at: float   # 마지막으로 받아 저장한 시각 (없으면 0)
+    error: str = ""
+    retry_at: float = 0.0  # 실패한 종목을 다시 받을 수 있는 시각
+
+
+class BackgroundRefresher:
+    """저장된 가격을 바로 쓰게 두고, 오래된 종목은 뒤에서 종목별로 동시에 다시 받는다.
+
+    refresh()는 기다리지 않고 돌아오며, 같은 종목이 이미 받는 중이면 또 요청하지 않는다.
+    느린 종목 하나가 다른 종목이나 페이지 렌더링을 막지 않도록 종목마다 따로
+    timeout을 건 작업으로 나눈다. 받기에 실패한 종목은 retry_after부터 실패할 때마다
+    두 배씩(max_retry_after까지) 기다린 뒤에 다시 받는다.
+    """
+
+    def __init__(self, store, max_workers=8, timeout=DEFAULT_TIMEOUT, retry_after=DEFAULT_RETRY_AFTER,
+                 max_retry_after=MAX_RETRY_AFTER):
+        self.store = store
+        self.timeout = timeout
+        self.retry_after = retry_after
+        self.max_retry_after = max_retry_after
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="price-refresh")
+        self._lock = threading.Lock()
+        self._inflight = set()
+        self._errors = {}
+        self._failures = {}  # 종목별 연속 실패 횟수
+        self._retry_at = {}
+
+    def _backoff(self, failures):
+        return min(self.retry_after * 2 ** (failures - 1), self.max_retry_after)
+
+    def refresh(self, symbols, start, end, now=None):
+        """빠진 구간이 있는 종목을 뒤에서 받기 시작한다. 새로 시작한 종목 목록을 돌려준다"""
+        stale = set()
+        for group in self.store.missing_ranges(symbols, start, end).values():
+            stale.update(group)
+
+        started = []
+        now = time.time() if now is None else now
+        with self._lock:
+            for symbol in symbols:
+                if now < self._retry_at.get(symbol, 0.0):
+                    continue
+                if symbol in stale and symbol not in self._inflight:
+                    self._inflight.add(symbol)
+                    started.append(symbol)
+        for symbol in started:
+            self._executor.submit(self._refresh_one, symbol, start, end)
+        return started
+
+    def _refresh_one(self, symbol, start, end):
+        try:
+            self.store.update([symbol], start, end, timeout=self.timeout)
+            if self.store.missing_ranges([symbol], start, end):
+                raise LookupError("가격을 받지 못했습니다")
+            with self._lock:
+                self._errors.pop(symbol, None)
+                self._failures.pop(symbol, None)
+                self._retry_at.pop(symbol, None)
+        except Exception as exc:  # 한 종목 실패가 다른 종목에 번지지 않게
+            with self._lock:
+                failures = self._failures.get(symbol, 0) + 1
+                self._errors[symbol] = f"{type(exc).__name__}: {exc}"
+                self._failures[symbol] = failures
+                self._retry_at[symbol] = time.time() + self._backoff(failures)
+        finally:
+            with self._lock:
+                self._inflight.discard(symbol)
+
+    def busy(self, symbols=None):
+        with self._lock:
+            if symbols is None:
+                return bool(self._inflight)
+            return any(symbol in self._inflight for symbol in symbols)
+
+    def status(self, symbols):
+        """{종목: Freshness}"""
+        covered = self.store.coverage(symbols)
+        with self._lock:
+            inflight = set(self._inflight)
+            errors = dict(self._errors)
+            retry_at = dict(self._retry_at)
+        result = {}
+        for symbol in symbols:
+            fetched_at = covered[symbol][2] if symbol in covered else 0.0
+            if symbol in inflight:
+                state = "refreshing"
+            elif symbol in errors:
+                state = "failed"
+            elif symbol in covered:
+                state = "fresh"
+            else:
+                state = "empty"
+            result[symbol] = Freshness(state, fetched_at, errors.get(symbol, ""), retry_at.get(symbol, 0.0))
+        return result
+
+    def wait(self, symbols=None, timeout=None):
+        """받는 중인 종목이 끝날 때까지 기다린다 (배치 작업·워밍업용). 다 끝났으면 True"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self.busy(symbols):
+            if deadline is not None and time.monotonic() > deadline:
+                return False
+            time.sleep(0.05)
+        return True
+
+
+_refreshers = {}
+_refreshers_lock = threading.Lock()
+
+
+def price_refresher(store=None):
+    """저장소별로 프로세스에 하나만 두는 BackgroundRefresher"""
+    store = price_store() if store is None else store
+    refresher = _refreshers.get(store.path)
+    if refresher is None:
+        with _refreshers_lock:
+            refresher = _refreshers.get(store.path)
+            if refresher is None:
+                refresher = BackgroundRefresher(store)
+                _refreshers[store.path] = refresher
+    return refresher
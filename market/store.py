@@ -0,0 +1,225 @@
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from datetime import date, timedelta
+from pathlib import Path
+
+import pandas as pd
+
+from market.fetch import PRICE_COLUMNS, yfinance_fetch
+
+# 기본 가격 저장소 위치 (페이지 실행 폴더 기준)
+DEFAULT_STORE_PATH = os.path.join(".cache", "prices.sqlite")
+# 오늘 봉처럼 아직 끝나지 않은 구간을 다시 받기 전 기다리는 시간 (초)
+DEFAULT_REFRESH_AFTER = 60 * 60
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS prices (
+    symbol TEXT NOT NULL,
+    date TEXT NOT NULL,
+    open REAL, high REAL, low REAL, close REAL, volume REAL,
+    PRIMARY KEY (symbol, date)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS coverage (
+    symbol TEXT PRIMARY KEY,
+    start TEXT NOT NULL,
+    end TEXT NOT NULL,
+    fetched_at REAL NOT NULL
+);
+"""
+
+
+def _day(value):
+    return pd.Timestamp(value).date()
+
+
+class PriceStore:
+    """종목별 일봉을 SQLite에 쌓아 두고, 없는 날짜 구간만 받아 채우는 저장소.
+
+    종목마다 받아 둔 구간 [start, end)를 coverage 표에 기록한다. 요청 구간에서
+    앞뒤로 빠진 부분만 계산해, 빠진 구간이 같은 종목끼리 묶어 fetch를 한 번씩 부른다.
+    fetch는 (symbols, start, end) → {종목: DataFrame} 함수면 무엇이든 된다. 받기에 실패한
+    종목은 결과에서 빠지고(None도 같다), 빈 표는 그 구간에 봉이 없다는 뜻이라 받은 것으로 기록한다.
+    fetch가 None이면 읽기 전용이다: 파일·표를 만들지 않고 읽기 전용 연결로만 연다
+    (파일이 없으면 읽을 때 sqlite3.OperationalError).
+    """
+
+    def __init__(self, path=DEFAULT_STORE_PATH, fetch=yfinance_fetch, refresh_after=DEFAULT_REFRESH_AFTER):
+        self.path = path
+        self.fetch = fetch
+        self.refresh_after = refresh_after
+        if self.read_only:
+            return
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+
+    @property
+    def read_only(self):
+        return self.fetch is None
+
+    @contextmanager
+    def _connect(self):
+        # 세션 스레드마다 짧게 열고 닫는다 (WAL이라 읽기와 쓰기가 서로 막지 않음)
+        if self.read_only:
+            conn = sqlite3.connect(f"{Path(os.path.abspath(self.path)).as_uri()}?mode=ro", timeout=30, uri=True)
+        else:
+            conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            if not self.read_only:  # WAL 설정은 파일에 남으므로 읽기 전용 연결도 WAL로 읽는다
+                conn.execute("PRAGMA journal_mode=WAL")
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def coverage(self, symbols):
+        """{종목: (start, end, fetched_at)} — 받아 둔 적 없는 종목은 빠진다"""
+        symbols = list(symbols)
+        with self._connect() as conn:
+            rows = conn.execute(
+                f"SELECT symbol, start, end, fetched_at FROM coverage WHERE symbol IN ({','.join('?' * len(symbols))})",
+                symbols,
+            ).fetchall()
+        return {symbol: (_day(start), _day(end), fetched_at) for symbol, start, end, fetched_at in rows}
+
+    def missing_ranges(self, symbols, start, end, now=None):
+        """{(구간 시작, 구간 끝): [종목, ...]} — 받아야 할 구간별로 종목을 묶는다"""
+        start, end = _day(start), _day(end)
+        now = time.time() if now is None else now
+        today = date.fromtimestamp(now)
+        covered = self.coverage(symbols)
+        missing = {}
+        for symbol in symbols:
+            if symbol not in covered:
+                missing.setdefault((start, end), []).append(symbol)
+                continue
+            have_start, have_end, fetched_at = covered[symbol]
+            if start < have_start:
+                missing.setdefault((start, have_start), []).append(symbol)
+            if end > have_end:
+                # 아직 끝나지 않은 오늘 구간은 refresh_after마다 한 번만 다시 받는다
+                if have_end >= today and now - fetched_at < self.refresh_after:
+                    continue
+                missing.setdefault((have_end, end), []).append(symbol)
+        return missing
+
+    def update(self, symbols, start, end, timeout=None):
+        """요청 구간에서 빠진 날짜만 받아 저장한다. 받은 종목 수를 돌려준다.
+
+        받는 동안 잠금을 잡지 않으므로 서로 다른 종목은 동시에 갱신할 수 있다
+        (쓰기 직렬화는 SQLite가 맡는다).
+        """
+        if self.read_only:
+            raise RuntimeError("읽기 전용 가격 저장소에는 받아 쓸 수 없습니다")
+        missing = self.missing_ranges(symbols, start, end)
+        for (range_start, range_end), group in missing.items():
+            if timeout is None:
+                frames = self.fetch(group, range_start, range_end)
+            else:
+                frames = self.fetch(group, range_start, range_end, timeout=timeout)
+            self._write(group, frames, range_start, range_end)
+        return sum(len(group) for group in missing.values())
+
+    def _write(self, symbols, frames, start, end):
+        now = time.time()
+        # 오늘 이후는 아직 확정되지 않았으므로 coverage를 오늘까지만 기록
+        covered_end = min(end, date.fromtimestamp(now))
+        with self._connect() as conn:
+            for symbol in symbols:
+                df = frames.get(symbol)
+                if df is None:
+                    continue  # 받기 실패 — 다음에 같은 구간을 다시 받는다
+                if not df.empty:
+                    conn.executemany(
+                        "INSERT OR REPLACE INTO prices VALUES (?, ?, ?, ?, ?, ?, ?)",
+                        [
+                            (symbol, day.strftime("%Y-%m-%d"), *(None if pd.isna(v) else float(v) for v in values))
+                            for day, values in zip(df.index, df[list(PRICE_COLUMNS)].itertuples(index=False))
+                        ],
+                    )
+                row = conn.execute("SELECT start, end FROM coverage WHERE symbol = ?", (symbol,)).fetchone()
+                new_start, new_end = start, max(covered_end, start)
+                if row is not None:
+                    new_start = min(new_start, _day(row[0]))
+                    new_end = max(new_end, _day(row[1]))
+                conn.execute(
+                    "INSERT OR REPLACE INTO coverage VALUES (?, ?, ?, ?)",
+                    (symbol, new_start.isoformat(), new_end.isoformat(), now),
+                )
+
+    def read(self, symbols, start, end):
+        """저장된 일봉만 읽는다 (네트워크 없음). {종목: Date 인덱스 DataFrame}"""
+        start, end = _day(start).isoformat(), _day(end).isoformat()
+        frames = {}
+        with self._connect() as conn:
+            for symbol in symbols:
+                df = pd.read_sql_query(
+                    "SELECT date, open, high, low, close, volume FROM prices "
+                    "WHERE symbol = ? AND date >= ? AND date < ? ORDER BY date",
+                    conn,
+                    params=(symbol, start, end),
+                )
+                df.columns = ["Date", *PRICE_COLUMNS]
+                df["Date"] = pd.to_datetime(df["Date"])
+                frames[symbol] = df.set_index("Date")
+        return frames
+
+    def read_matrix(self, symbols, start, end, field="Close"):
+        """저장된 한 가격 항목을 날짜 × 종목 넓은 표로 읽는다 (쿼리 한 번).
+
+        열 순서는 symbols와 같고, 어떤 종목이 거래하지 않은 날은 NaN으로 남는다.
+        """
+        if field not in PRICE_COLUMNS:
+            raise ValueError(f"알 수 없는 가격 항목입니다: {field}")
+        symbols = list(symbols)
+        start, end = _day(start).isoformat(), _day(end).isoformat()
+        with self._connect() as conn:
+            df = pd.read_sql_query(
+                f"SELECT date, symbol, {field.lower()} AS value FROM prices "
+                f"WHERE symbol IN ({','.join('?' * len(symbols))}) AND date >= ? AND date < ?",
+                conn,
+                params=(*symbols, start, end),
+            )
+        matrix = df.pivot(index="date", columns="symbol", values="value").reindex(columns=symbols)
+        matrix.index = pd.to_datetime(matrix.index)
+        matrix.index.name = "Date"
+        matrix.columns.name = None
+        return matrix.sort_index().astype(float)
+
+    def version(self, symbols):
+        """종목들의 마지막 저장 시각 — 저장된 가격이 바뀌었는지 확인하는 캐시 키"""
+        covered = self.coverage(symbols)
+        return tuple(covered[symbol][2] if symbol in covered else 0.0 for symbol in symbols)
+
+    def get_prices(self, symbols, start, end):
+        """빠진 구간만 받아 채운 뒤 저장소에서 읽는다"""
+        symbols = list(symbols)
+        self.update(symbols, start, end)
+        return self.read(symbols, start, end)
+
+
+def recent_range(days=365, today=None):
+    """최근 days일 [start, end) — 매 호출 시점 기준 (import 시점에 고정되지 않음)"""
+    today = date.today() if today is None else today
+    end = today + timedelta(days=1)
+    return end - timedelta(days=days + 1), end
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def price_store(path=DEFAULT_STORE_PATH):
+    """경로별로 프로세스에 하나만 두는 PriceStore"""
+    store = _stores.get(path)
+    if store is None:
+        with _stores_lock:
+            store = _stores.get(path)
+            if store is None:
+                store = PriceStore(path)
+                _stores[path] = store
+    return store
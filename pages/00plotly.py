@@ -1,140 +1,153 @@
 import streamlit as st
 import pandas as pd
-import plotly.graph_objects as go
 import numpy as np
 
+from population import (
+    BAND_LABELS,
+    BANDS,
+    DEFAULT_TFR,
+    DEFAULT_YEARS,
+    METRIC_LABELS,
+    METRICS,
+    SEX_WEIGHTS,
+    band_table,
+    cluster_figures,
+    compare_figures,
+    demographic_clusters,
+    load_population,
+    metric_engine,
+    neighbor_index,
+    population_projection,
+    projection_figures,
+    region_figures,
+    region_ratios,
+    region_registry,
+    rollups,
+    view_counter,
+    warm_figures,
+)
+from utils.debug_panel import page_trace, show_trace
+from utils.trace import span
+
 st.set_page_config(layout="wide")
+page_trace("00plotly")  # ?debug=1로 열면 사이드바에 구간 시간표
 st.title("📍 우리 동네 인구 구조, 데이터로 읽다")
 
 # 파일 경로
 file_gender = "202504_202504_연령별인구현황_월간_남녀구분.csv"
 
-# CSV 불러오기
-df_gender = pd.read_csv(file_gender, encoding="cp949")
-
-# 행정구역 이름 정제: 괄호 앞 지역명만 추출
-df_gender = df_gender[df_gender["행정구역"].str.contains("(\d+)", regex=True)]
-df_gender["지역명"] = df_gender["행정구역"].str.split("(").str[0].str.strip()
-
-# 동 단위만 필터링
-df_gender = df_gender[df_gender["지역명"].str.endswith("동")]
-
-# 연령 컬럼 정의
-age_columns_male = [col for col in df_gender.columns if "세" in col and "_남_" in col]
-age_columns_female = [col for col in df_gender.columns if "세" in col and "_여_" in col]
-ages = [col.split("_")[-1] for col in age_columns_male]
-
-# 지역 선택
-selected_region = st.selectbox("📍 분석할 지역을 선택하세요:", options=df_gender["지역명"].unique())
-region_data = df_gender[df_gender["지역명"] == selected_region].iloc[0]
-
-# 값 처리 및 정수형 변환
-population_male = region_data[age_columns_male].str.replace(",", "").fillna("0").astype(int).tolist()
-population_female = region_data[age_columns_female].str.replace(",", "").fillna("0").astype(int).tolist()
-
-# 총합 및 비율 계산
-total_male = sum(population_male)
-total_female = sum(population_female)
-
-male_ratio = [round(p / total_male * 100, 2) for p in population_male]
-female_ratio = [round(p / total_female * 100, 2) for p in population_female]
+# 인구 행렬 불러오기 (CSV는 프로세스 전체에서 한 번만 파싱, 이후 바이너리 캐시 사용)
+with span("load_population"):
+    population = load_population(file_gender)
+
+# 분석 단위 선택: 동은 원본 행, 시군구·시도는 미리 집계된 표 사용
+level = st.radio("🧭 분석 단위", options=["동", "시군구", "시도"], horizontal=True)
+with span("rollups", level=level):
+    regions = population.dongs if level == "동" else rollups(population)[level]
+
+# 지역 선택: 시도 → 시군구 → 동 (행정코드 기준이라 이름이 같은 동도 구분됨)
+registry = region_registry(population)
+col_sido, col_sigungu, col_dong = st.columns(3)
+with col_sido:
+    selected_code = st.selectbox("🏙️ 시도", options=registry.children(), format_func=registry.short_name)
+if level != "시도":
+    with col_sigungu:
+        if level == "시군구":
+            sigungu_options = [code for code in registry.children(selected_code) if code in regions.code_index]
+        else:
+            sigungu_options = [
+                code for code in registry.children(selected_code)
+                if any(child in regions.code_index for child in registry.children(code))
+            ]
+        selected_code = st.selectbox("🏘️ 시군구", options=sigungu_options, format_func=registry.short_name)
+if level == "동":
+    with col_dong:
+        dong_options = [code for code in registry.children(selected_code) if code in regions.code_index]
+        selected_code = st.selectbox("📍 분석할 동을 선택하세요:", options=dong_options, format_func=registry.short_name)
+
+region_row = regions.code_index[selected_code]
+selected_region = registry.name(selected_code)
+
+# 성별 인구 (이미 정수형)
+population_male = regions.male[region_row].tolist()
+population_female = regions.female[region_row].tolist()
+
+# 미리 계산된 이웃 인덱스 (CSV가 바뀔 때만 다시 계산)
+with span("neighbor_index"):
+    neighbors = neighbor_index(regions)
+
+# 그림 캐시: 최근 본 지역은 그림을 다시 만들거나 직렬화하지 않는다
+# (프로세스 시작 후 처음 한 번은 많이 본 지역을 미리 그려 둔다)
+with span("figures"):
+    warm_figures(regions, level, neighbors)
+    view_counter(regions).record(level, selected_code)
+    fig_pyramid, fig_all = region_figures(regions, region_row, level)
 
 # 🎯 선택 지역 인구 피라미드
-fig_pyramid = go.Figure()
-fig_pyramid.add_trace(go.Bar(
-    y=ages,
-    x=[-v for v in male_ratio],
-    name="👨 남성 (%)",
-    orientation='h',
-    marker=dict(color='rgba(54, 162, 235, 0.8)')
-))
-fig_pyramid.add_trace(go.Bar(
-    y=ages,
-    x=female_ratio,
-    name="👩 여성 (%)",
-    orientation='h',
-    marker=dict(color='rgba(255, 99, 132, 0.8)')
-))
-
-fig_pyramid.update_layout(
-    title=dict(text=f"📊 {selected_region} 연령별 인구 피라미드 (비율 기준)", font=dict(size=24)),
-    barmode='overlay',
-    xaxis=dict(title='인구 비율 (%)', tickvals=[-10, -5, 0, 5, 10], ticktext=['10%', '5%', '0', '5%', '10%']),
-    yaxis=dict(title='연령'),
-    height=650,
-    legend=dict(x=0.02, y=1.05, orientation="h")
-)
-
-st.plotly_chart(fig_pyramid, use_container_width=True)
+with span("plotly_chart", figure="pyramid"):
+    st.plotly_chart(fig_pyramid.figure, use_container_width=True)
+
+# 🔮 미래 인구 구조 전망 (코호트 요인법: 모든 지역을 생존율·출산율로 한꺼번에 굴려 둔 결과에서 조회)
+st.markdown(f"### 🔮 {selected_region} 미래 인구 구조 전망")
+with st.expander("⚙️ 전망 가정"):
+    col_years, col_tfr, col_mortality = st.columns(3)
+    with col_years:
+        projection_years = st.slider("전망 기간 (년)", min_value=5, max_value=30, value=DEFAULT_YEARS, step=5)
+    with col_tfr:
+        tfr = st.number_input("합계출산율", min_value=0.3, max_value=2.5, value=DEFAULT_TFR, step=0.05)
+    with col_mortality:
+        mortality_scale = st.slider("사망률 배수 (1보다 작으면 수명 증가)", min_value=0.5, max_value=1.5, value=1.0, step=0.05)
+with span("projection", years=projection_years):
+    outlook = population_projection(regions, projection_years, tfr, mortality_scale)
+target_year = st.select_slider("전망 연도", options=outlook.years.tolist()[1:], value=int(outlook.years[-1]))
+with span("figures", figure="projection"):
+    fig_projection, fig_projection_bands = projection_figures(regions, region_row, level, outlook, target_year)
+col_projection, col_projection_bands = st.columns(2)
+with col_projection, span("plotly_chart", figure="projection"):
+    st.plotly_chart(fig_projection.figure, use_container_width=True)
+with col_projection_bands, span("plotly_chart", figure="projection_bands"):
+    st.plotly_chart(fig_projection_bands.figure, use_container_width=True)
+st.caption("지역 간 전입·전출은 넣지 않은 자연 증감 전망입니다 (기본 가정: 합계출산율 0.75, 기대수명 남 80세·여 86세 안팎).")
 
 # 📈 전체 인구 흐름 그래프
 population_total = [m + f for m, f in zip(population_male, population_female)]
-df_all = pd.DataFrame({"연령": ages, "총인구": population_total})
-
-fig_all = go.Figure(go.Bar(
-    x=df_all["연령"],
-    y=df_all["총인구"],
-    marker=dict(color='mediumseagreen'),
-    text=df_all["총인구"],
-    textposition='outside',
-    hovertemplate='연령 %{x}<br>인구수 %{y:,}명<extra></extra>'
-))
-
-fig_all.update_layout(
-    title=dict(text="📈 전체 연령대별 인구 분포", font=dict(size=24)),
-    xaxis_title="연령",
-    yaxis_title="인구 수",
-    height=500,
-    margin=dict(t=60, l=60, r=40, b=40)
-)
-
-st.plotly_chart(fig_all, use_container_width=True)
-
-# 🔍 유사한 지역 찾기 (동 단위, 혼합 기준: 비율 + 절댓값 차이 포함)
-def hybrid_distance(vec1, vec2):
-    vec1 = np.array(vec1)
-    vec2 = np.array(vec2)
-    ratio_dist = np.linalg.norm((vec1 / vec1.sum()) - (vec2 / vec2.sum()))
-    scale_dist = abs(vec1.sum() - vec2.sum()) / vec1.sum()
-    return ratio_dist + scale_dist
-
-current_vector = np.array(population_total)
-
-best_match = None
-best_score = float('inf')
-
-for _, row in df_gender.iterrows():
-    if row["지역명"] == selected_region:
-        continue
-    male = row[age_columns_male].str.replace(",", "").fillna("0").astype(int).tolist()
-    female = row[age_columns_female].str.replace(",", "").fillna("0").astype(int).tolist()
-    total_vec = np.array([m + f for m, f in zip(male, female)])
-    if total_vec.sum() == 0:
-        continue
-    score = hybrid_distance(current_vector, total_vec)
-    if score < best_score:
-        best_score = score
-        best_match = row["지역명"]
-        best_total = total_vec.tolist()
+with span("plotly_chart", figure="distribution"):
+    st.plotly_chart(fig_all.figure, use_container_width=True)
+
+# 🔍 유사한 지역 찾기 (선택한 단위 안에서, 기본은 혼합 기준: 비율 + 절댓값 차이 포함)
+with st.expander("🔧 유사 지역 비교 기준"):
+    col_metric, col_sex, col_bands = st.columns(3)
+    with col_metric:
+        similarity_metric = st.selectbox("거리 척도", options=list(METRICS), format_func=METRIC_LABELS.get)
+    with col_sex:
+        sex_mode = st.radio("성별 반영", options=list(SEX_WEIGHTS), horizontal=True)
+    with col_bands:
+        similar_bands = st.multiselect("비교할 연령대", options=list(BANDS), default=list(BANDS), format_func=BAND_LABELS.get)
+default_similarity = similarity_metric == "hybrid" and sex_mode == "남녀 합계" and len(similar_bands) in (0, len(BANDS))
+with span("similar_lookup", metric=similarity_metric):
+    if default_similarity:
+        # 기본 기준은 미리 계산된 이웃 인덱스에서 조회
+        similar_rows, similar_scores = neighbors.lookup(region_row, k=10)
+    else:
+        # 다른 기준은 전체 지역 거리를 그 자리에서 한 번에 계산 (척도·설정별 엔진은 재사용)
+        engine = metric_engine(regions, similarity_metric, SEX_WEIGHTS[sex_mode], similar_bands)
+        similar_rows, similar_scores = engine.top_k(region_row, k=10)
+
+best_match = regions.names[similar_rows[0]]
 
 # 📊 선택 지역 인구 구조 분석
 
-def extract_age(age_label):
-    if '이상' in age_label:
-        return 100
-    return int(age_label.replace('세', '').strip())
-
-age_ranges = list(range(len(ages)))
-under20 = [i for i in age_ranges if extract_age(ages[i]) < 20]
-youth = [i for i in age_ranges if 20 <= extract_age(ages[i]) < 40]
-middle = [i for i in age_ranges if 40 <= extract_age(ages[i]) < 65]
-elderly = [i for i in age_ranges if extract_age(ages[i]) >= 65]
+# 전체 지역 연령대 비율표에서 한 줄 조회
+with span("band_table"):
+    bands = band_table(regions)
+region_bands = bands.loc[selected_code]
 
 total_population = sum(population_total)
-under20_ratio = round(sum(population_total[i] for i in under20) / total_population * 100, 2)
-youth_ratio = round(sum(population_total[i] for i in youth) / total_population * 100, 2)
-middle_ratio = round(sum(population_total[i] for i in middle) / total_population * 100, 2)
-elderly_ratio = round(sum(population_total[i] for i in elderly) / total_population * 100, 2)
+ratios = region_ratios(region_bands)  # 유형 판단과 같은 반올림
+under20_ratio = ratios["under20"]
+youth_ratio = ratios["youth"]
+middle_ratio = ratios["middle"]
+elderly_ratio = ratios["elderly"]
 
 st.markdown(f"""
 ### 🧾 {selected_region} 인구 비율 분석
@@ -146,67 +159,75 @@ st.markdown(f"""
 """)
 st.write("")
 
-if elderly_ratio >= 25:
-    st.markdown("""
+# 대표 유형(비율표의 "유형" 열, 공통 분류 규칙)별 설명
+CATEGORY_TEXTS = {
+    "고령형": """
 🧓 **고령 인구 비중이 높은 지역입니다.**  
 - 복지관, 실버문화센터, 한방병원 등 고령 친화 시설 확충이 시급합니다.  
 - 무장애 보행환경, 건강보조식품점, 전통시장 중심의 상권이 적합합니다.
-""")
-
-elif youth_ratio >= 30:
-    st.markdown("""
+""",
+    "청년형": """
 👩‍🎓 **청년층이 많은 지역입니다.**  
 - 청년 창업지원, 임대주택, 문화예술 공간과 야간 활동 기반이 중요합니다.  
 - 공유 오피스, 감성 카페, 푸드트럭 거리 같은 트렌디한 상권이 적합합니다.
-""")
-
-elif under20_ratio >= 25:
-    st.markdown("""
+""",
+    "아동·청소년형": """
 👶 **어린이·청소년 비중이 높은 지역입니다.**  
 - 학군, 놀이시설, 돌봄센터, 청소년 문화공간 확충이 요구됩니다.  
 - 학원가, 키즈카페, 문구점 중심 상권이 발달할 수 있습니다.
-""")
-
-elif middle_ratio >= 35:
-    st.markdown("""
+""",
+    "중장년형": """
 👨‍💼 **중장년층 중심 지역입니다.**  
 - 평생교육시설, 건강관리센터, 재취업센터와 생활편의시설이 필요합니다.  
 - 약국, 대형마트, 실속형 생활밀착 상권이 효과적입니다.
-""")
-
-else:
-    st.markdown("""
+""",
+    "균형형": """
 🏙️ **세대가 고르게 분포된 균형형 지역입니다.**  
 - 세대 간 공존 가능한 복합문화공간, 도서관, 가족공원 등 조화로운 인프라가 적합합니다.  
 - 세대 연계를 고려한 복합형 상권 설계가 바람직합니다.
-""")
+""",
+}
+st.markdown(CATEGORY_TEXTS[region_bands["유형"]])
 st.write(" " *3)
 
 # 📍 유사 지역 시각화 (겹쳐서 비교)
-st.markdown(f"### 🔄 {selected_region} 와(과) 가장 유사한 동: **{best_match}**")
-
-fig_compare = go.Figure()
-fig_compare.add_trace(go.Scatter(
-    x=ages,
-    y=population_total,
-    mode='lines+markers',
-    name=selected_region,
-    line=dict(color='royalblue')
-))
-fig_compare.add_trace(go.Scatter(
-    x=ages,
-    y=best_total,
-    mode='lines+markers',
-    name=best_match,
-    line=dict(color='orangered', dash='dot')
-))
-
-fig_compare.update_layout(
-    title="👥 선택 동과 유사 동의 연령별 인구 구조 비교",
-    xaxis_title="연령",
-    yaxis_title="인구 수",
-    height=500,
-    legend=dict(x=0.01, y=1.1, orientation="h")
-)
-
-st.plotly_chart(fig_compare, use_container_width=True)
+st.markdown(f"### 🔄 {selected_region} 와(과) 가장 유사한 {level}: **{best_match}**")
+
+with span("figures", figure="compare"):
+    fig_compare = compare_figures(regions, region_row, similar_rows[0], level)
+with span("plotly_chart", figure="compare"):
+    st.plotly_chart(fig_compare.figure, use_container_width=True)
+
+# 유사 지역 Top 10
+similar_table = pd.DataFrame({
+    "지역명": regions.names[similar_rows],
+    "유사도 거리": np.round(similar_scores, 4),
+    "총인구": regions.total[similar_rows].sum(axis=1),
+})
+with st.expander(f"🔎 {selected_region} 와(과) 유사한 {level} Top {len(similar_rows)}"):
+    st.dataframe(similar_table, use_container_width=True, hide_index=True)
+
+# 🧬 인구 유형 (모든 지역을 연령 구조로 미리 묶어 데이터 캐시에 저장해 둔 결과에서 조회)
+with span("clusters"):
+    clusters = demographic_clusters(regions)
+region_cluster = int(clusters.labels[region_row])
+if region_cluster >= 0:
+    cluster_names = clusters.names(regions)
+    same_type_rows = clusters.same_type(region_row, limit=20)
+    st.markdown(f"### 🧬 {selected_region}의 인구 유형: **{cluster_names[region_cluster]}**")
+    col_cluster, col_same_type = st.columns(2)
+    with col_cluster:
+        with span("figures", figure="cluster"):
+            fig_cluster = cluster_figures(regions, level, clusters, region_cluster)
+        with span("plotly_chart", figure="cluster"):
+            st.plotly_chart(fig_cluster.figure, use_container_width=True)
+    with col_same_type:
+        st.markdown(f"#### 같은 유형의 {level} (가장 대표적인 {len(same_type_rows)}곳)")
+        st.dataframe(pd.DataFrame({
+            "지역명": regions.names[same_type_rows],
+            "총인구": regions.total[same_type_rows].sum(axis=1),
+        }), use_container_width=True, hide_index=True)
+    with st.expander(f"📋 {level} 인구 유형별 통계 ({clusters.k}개 유형)"):
+        st.dataframe(clusters.stats(regions), use_container_width=True, hide_index=True)
+
+show_trace()
@@ -1,11 +1,21 @@
 import streamlit as st
-import yfinance as yf
 import pandas as pd
 import plotly.graph_objects as go
-from datetime import datetime, timedelta
+
+from market import line_figure, price_analytics, price_refresher, price_store, recent_range
+from utils.debug_panel import page_trace, show_trace
+from utils.trace import span
 
 st.set_page_config(layout="wide")
-st.title("📈 글로벌 시가총액 Top 10 기업 주가 변화 (최근 1년)")
+page_trace("02_야후주식데이터")  # ?debug=1로 열면 사이드바에 구간 시간표
+
+# 조회 기간과 차트 해상도 (긴 기간은 화면 폭에 맞춰 점을 줄여 보낸다)
+periods = {"1년": 1, "3년": 3, "5년": 5, "10년": 10}
+period = st.sidebar.selectbox("조회 기간", list(periods.keys()))
+chart_points = st.sidebar.select_slider("차트 해상도 (종목당 점 개수)", options=[300, 600, 1200, 2400], value=1200)
+downsample_method = st.sidebar.radio("줄이기 방식", ["lttb", "minmax"], format_func={"lttb": "LTTB (모양 유지)", "minmax": "구간 최소·최대"}.get)
+
+st.title(f"📈 글로벌 시가총액 Top 10 기업 주가 변화 (최근 {period})")
 
 # 시가총액 기준 글로벌 Top 10 기업 (2025년 기준 예상)
 top10_tickers = {
@@ -21,42 +31,96 @@ top10_tickers = {
     "Tesla (TSLA)": "TSLA"
 }
 
-# 기간 설정
-end_date = datetime.today()
-start_date = end_date - timedelta(days=365)
+# 가격 저장소: 받아 둔 가격을 바로 보여 주고, 오래된 종목은 뒤에서 종목별로 동시에 갱신
+store = price_store()
+refresher = price_refresher(store)
+start_date, end_date = recent_range(days=365 * periods[period])
+tickers = list(top10_tickers.values())
+with span("refresh"):  # 받기는 뒤 스레드에서 하고, 여기서는 갱신 요청만 건다
+    refresher.refresh(tickers, start_date, end_date)
+
+# 사용자 선택
+selected_names = st.multiselect("📌 표시할 기업을 선택하세요", options=list(top10_tickers.keys()), default=list(top10_tickers.keys())[:5])
 
-# 여러 주식 정보 가져오기
-@st.cache_data
-def fetch_data(ticker):
-    df = yf.download(ticker, start=start_date, end=end_date)
-    df["Symbol"] = ticker
-    return df
+state_labels = {"fresh": "✅ 최신", "refreshing": "🔄 갱신 중", "failed": "⚠️ 갱신 실패", "empty": "⏳ 데이터 없음"}
 
-# 데이터 취합
-price_data = []
-for name, ticker in top10_tickers.items():
-    df = fetch_data(ticker)
-    df["Name"] = name
-    price_data.append(df)
 
-# 병합
-all_data = pd.concat(price_data)
-all_data.reset_index(inplace=True)
+# 받는 중인 종목이 있으면 이 부분만 2초마다 다시 그려서 도착한 가격을 채워 넣는다
+polling = refresher.busy(tickers)
 
-# 사용자 선택
-selected_names = st.multiselect("📌 표시할 기업을 선택하세요", options=list(top10_tickers.keys()), default=list(top10_tickers.keys())[:5])
 
-# 시각화
-fig = go.Figure()
-for name in selected_names:
-    company_df = all_data[all_data["Name"] == name]
-    fig.add_trace(go.Scatter(x=company_df["Date"], y=company_df["Close"], mode='lines', name=name))
+@st.fragment(run_every="2s" if polling else None)
+def price_chart():
+    # 날짜 × 종목 넓은 표와 분석 표는 저장된 가격이 바뀔 때만 다시 계산된다
+    with span("price_analytics"):
+        analytics = price_analytics(store, tickers, start_date, end_date)
+    ticker_names = {ticker: name for name, ticker in top10_tickers.items()}
+    selected = [top10_tickers[name] for name in selected_names]
+
+    def line_chart(table, title, yaxis_title, tickformat=None):
+        # 선택한 기업은 열만 잘라, 해상도에 맞게 줄인 점으로 그린다
+        with span("line_figure", table=table):
+            fig = line_figure(analytics, table, selected, ticker_names, points=chart_points, method=downsample_method)
+            fig.update_layout(title=title, xaxis_title="날짜", yaxis_title=yaxis_title, height=600)
+            if tickformat:
+                fig.update_yaxes(tickformat=tickformat)
+        with span("plotly_chart", table=table):
+            st.plotly_chart(fig, use_container_width=True)
+
+    tab_close, tab_perf, tab_vol, tab_dd, tab_corr = st.tabs(["종가", "누적 성과", "변동성", "낙폭", "상관관계"])
+
+    # 시각화
+    with tab_close:
+        line_chart("close", f"최근 {period}간 주가 변화 (종가 기준)", "종가 (USD or 현지 통화)")
+    with tab_perf:
+        line_chart("normalized", "누적 성과 (기간 첫날 = 100)", "지수")
+    with tab_vol:
+        line_chart("volatility", "20거래일 이동 변동성 (연율화)", "변동성", tickformat=".0%")
+    with tab_dd:
+        line_chart("drawdown", "고점 대비 낙폭", "낙폭", tickformat=".0%")
+    with tab_corr:
+        corr = analytics.correlation.loc[selected, selected]
+        labels = [ticker_names[ticker] for ticker in selected]
+        fig_corr = go.Figure(go.Heatmap(
+            z=corr.to_numpy(), x=labels, y=labels,
+            zmin=-1, zmax=1, colorscale="RdBu", reversescale=True,
+            text=corr.round(2).to_numpy(), texttemplate="%{text}",
+        ))
+        fig_corr.update_layout(title="일간 수익률 상관관계", height=600)
+        st.plotly_chart(fig_corr, use_container_width=True)
+
+    summary = analytics.summary(selected)
+    summary.index = [ticker_names[ticker] for ticker in selected]
+    st.dataframe(
+        summary,
+        use_container_width=True,
+        column_config={column: st.column_config.NumberColumn(format="percent") for column in summary.columns},
+    )
+
+    # 종목별 갱신 상태
+    status = refresher.status(tickers)
+    freshness = pd.DataFrame({
+        "기업": list(top10_tickers.keys()),
+        "상태": [state_labels[status[ticker].state] for ticker in tickers],
+        "마지막 갱신": [
+            pd.Timestamp(status[ticker].fetched_at, unit="s", tz="UTC").tz_convert("Asia/Seoul").strftime("%Y-%m-%d %H:%M")
+            if status[ticker].fetched_at else "-"
+            for ticker in tickers
+        ],
+        "최근 거래일": [
+            analytics.last_dates[ticker].strftime("%Y-%m-%d") if pd.notna(analytics.last_dates[ticker]) else "-"
+            for ticker in tickers
+        ],
+        "비고": [status[ticker].error for ticker in tickers],
+    })
+    with st.expander("🕒 종목별 데이터 갱신 상태"):
+        st.dataframe(freshness, use_container_width=True, hide_index=True)
+
+    # 갱신이 모두 끝나면 전체를 한 번 다시 실행해서 주기적 갱신을 멈춘다
+    if polling and not refresher.busy(tickers):
+        st.rerun()
+
 
-fig.update_layout(
-    title="최근 1년간 주가 변화 (종가 기준)",
-    xaxis_title="날짜",
-    yaxis_title="종가 (USD or 현지 통화)",
-    height=600
-)
+price_chart()
 
-st.plotly_chart(fig, use_container_width=True)
+show_trace()
@@ -0,0 +1,82 @@
+import streamlit as st
+import plotly.graph_objects as go
+
+from population import BAND_LABELS, BANDS, band_table, load_population, region_registry, rollups
+from utils.debug_panel import page_trace, show_trace
+from utils.trace import span
+
+st.set_page_config(layout="wide")
+page_trace("03_연령대 비율 순위")  # ?debug=1로 열면 사이드바에 구간 시간표
+st.title("🏆 연령대 비율로 지역 찾기")
+
+# 파일 경로
+file_gender = "202504_202504_연령별인구현황_월간_남녀구분.csv"
+
+# 인구 행렬과 전체 지역 연령대 비율표 (캐시됨)
+with span("load_population"):
+    population = load_population(file_gender)
+    registry = region_registry(population)
+
+col_level, col_sido, col_band = st.columns(3)
+with col_level:
+    level = st.radio("🧭 분석 단위", options=["동", "읍면동", "시군구", "시도"], horizontal=True)
+with col_sido:
+    sido = st.selectbox(
+        "🏙️ 시도",
+        options=[None] + registry.children(),
+        format_func=lambda code: "전국" if code is None else registry.short_name(code),
+    )
+with col_band:
+    band = st.selectbox("📊 기준 연령대", options=BANDS, format_func=BAND_LABELS.get)
+
+with span("rollups", level=level):
+    regions = population.dongs if level == "동" else rollups(population)[level]
+with span("band_table"):
+    bands = band_table(regions)
+
+col_min, col_top, col_type = st.columns(3)
+with col_min:
+    min_ratio = st.slider(f"{BAND_LABELS[band]} 최소 비중 (%)", 0.0, 100.0, 0.0, 0.5)
+with col_top:
+    top_n = st.number_input("표시할 지역 수", min_value=1, max_value=1000, value=50)
+with col_type:
+    categories = st.multiselect("🏷️ 지역 유형", options=sorted(bands["유형"].unique()))
+
+# 필터링과 정렬 (전체 표에 대한 벡터 연산)
+with span("filter", rows=len(bands)):
+    view = bands
+    if sido is not None:
+        view = view[view.index.str.startswith(sido[:2])]
+    view = view[view[band] >= min_ratio]
+    if categories:
+        view = view[view["유형"].isin(categories)]
+
+st.markdown(f"**조건에 맞는 지역: {len(view):,}곳** (상위 {min(top_n, len(view)):,}곳 표시)")
+view = view.nlargest(int(top_n), band)
+
+# 📊 상위 지역 막대 그래프
+fig_rank = go.Figure(go.Bar(
+    x=view["지역명"],
+    y=view[band],
+    marker=dict(color='mediumseagreen'),
+    hovertemplate='%{x}<br>비중 %{y:.2f}%<extra></extra>'
+))
+fig_rank.update_layout(
+    title=dict(text=f"📊 {BAND_LABELS[band]} 비중 상위 지역", font=dict(size=24)),
+    xaxis_title="지역",
+    yaxis_title="비중 (%)",
+    height=500,
+    margin=dict(t=60, l=60, r=40, b=40)
+)
+with span("plotly_chart", figure="rank"):
+    st.plotly_chart(fig_rank, use_container_width=True)
+
+# 🧾 상세 표
+table = view[["지역명", "총인구", *BANDS, "유형"]].rename(columns=BAND_LABELS)
+st.dataframe(
+    table,
+    use_container_width=True,
+    column_config={label: st.column_config.NumberColumn(format="%.2f%%") for label in BAND_LABELS.values()},
+)
+
+show_trace()
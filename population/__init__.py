@@ -0,0 +1,121 @@
+import importlib
+
+# 하위 모듈 → 패키지에서 바로 쓰는 이름. 처음 쓸 때 그 모듈만 불러온다 (pandas·plotly 등을 import 시점에 치르지 않게)
+_SUBMODULES = {
+    "population.bands": ("BAND_LABELS", "BANDS", "band_table", "build_band_table"),
+    "population.boundaries": ("DEFAULT_BOUNDARY_FILE", "BoundaryTiles", "boundary_tiles", "build_boundary_tiles"),
+    "population.choropleth": ("band_colormap", "choropleth_layer", "choropleth_values"),
+    "population.clusters": ("DemographicClusters", "build_clusters", "demographic_clusters"),
+    "population.cube": ("PopulationCube", "append_month", "open_cube"),
+    "population.figures": (
+        "FigureCache",
+        "cluster_figures",
+        "compare_figures",
+        "figure_cache",
+        "projection_figures",
+        "region_figures",
+        "view_counter",
+        "warm_figures",
+    ),
+    "population.insights": ("region_insights", "region_ratios", "similar_summary", "similar_traits", "summary_lines"),
+    "population.loader": ("PopulationData", "age_years", "load_population"),
+    "population.neighbors": ("NeighborIndex", "build_neighbor_index", "neighbor_index"),
+    "population.projection": (
+        "DEFAULT_TFR",
+        "DEFAULT_YEARS",
+        "Projection",
+        "ProjectionRates",
+        "population_projection",
+        "project",
+        "projection_rates",
+    ),
+    "population.regions": ("LEVELS", "RegionRegistry", "region_level", "region_registry"),
+    "population.rollup": ("build_rollups", "rollups"),
+    "population.similarity": (
+        "METRIC_LABELS",
+        "METRICS",
+        "SEX_WEIGHTS",
+        "MetricEngine",
+        "SimilarityEngine",
+        "hybrid_distance",
+        "metric_engine",
+        "similarity_engine",
+    ),
+}
+
+__all__ = [
+    "BAND_LABELS",
+    "BANDS",
+    "DEFAULT_BOUNDARY_FILE",
+    "DEFAULT_TFR",
+    "DEFAULT_YEARS",
+    "LEVELS",
+    "METRIC_LABELS",
+    "METRICS",
+    "SEX_WEIGHTS",
+    "BoundaryTiles",
+    "DemographicClusters",
+    "FigureCache",
+    "MetricEngine",
+    "NeighborIndex",
+    "PopulationCube",
+    "PopulationData",
+    "Projection",
+    "ProjectionRates",
+    "RegionRegistry",
+    "SimilarityEngine",
+    "age_years",
+    "append_month",
+    "band_colormap",
+    "band_table",
+    "boundary_tiles",
+    "build_band_table",
+    "build_boundary_tiles",
+    "build_clusters",
+    "build_neighbor_index",
+    "build_rollups",
+    "choropleth_layer",
+    "choropleth_values",
+    "cluster_figures",
+    "compare_figures",
+    "demographic_clusters",
+    "figure_cache",
+    "hybrid_distance",
+    "load_population",
+    "metric_engine",
+    "neighbor_index",
+    "open_cube",
+    "population_projection",
+    "project",
+    "projection_figures",
+    "projection_rates",
+    "region_figures",
+    "region_insights",
+    "region_level",
+    "region_ratios",
+    "region_registry",
+    "rollups",
+    "similar_summary",
+    "similar_traits",
+    "similarity_engine",
+    "summary_lines",
+    "view_counter",
+    "warm_figures",
+]
+
+
+_EXPORTS = {name: module for module, names in _SUBMODULES.items() for name in names}
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
+
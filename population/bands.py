@@ -0,0 +1,91 @@
+import threading
+import weakref
+
+import numpy as np
+import pandas as pd
+
+from utils.trace import count
+
+# 연령대 구간 [시작, 끝) — 끝이 None이면 그 이상 전부
+BANDS = ("under20", "youth", "middle", "elderly")
+BAND_RANGES = {
+    "under20": (0, 20),
+    "youth": (20, 40),
+    "middle": (40, 65),
+    "elderly": (65, None),
+}
+BAND_LABELS = {
+    "under20": "어린이·청소년",
+    "youth": "청년층",
+    "middle": "중장년층",
+    "elderly": "고령층",
+}
+
+# 인구데이터 분석 페이지의 종합 분석 기준 (비중 %, 여러 개가 동시에 해당될 수 있음)
+INSIGHT_THRESHOLDS = {"under20": 20, "youth": 30, "middle": 35, "elderly": 25}
+
+# 대표 유형: 위에서부터 먼저 맞는 조건 하나 (plotly 페이지의 분기 순서와 같음)
+CATEGORY_RULES = (
+    ("elderly", 25, "고령형"),
+    ("youth", 30, "청년형"),
+    ("under20", 25, "아동·청소년형"),
+    ("middle", 35, "중장년형"),
+)
+DEFAULT_CATEGORY = "균형형"
+# 유형·인사이트 기준은 화면에 보이는 비중(소수 둘째 자리 반올림)으로 판단한다
+RATIO_DIGITS = 2
+
+
+def band_mask(age_years):
+    """(A, B) 0/1 행렬 — 연령별 인구 @ band_mask = 연령대별 인구"""
+    age_years = np.asarray(age_years)
+    mask = np.zeros((len(age_years), len(BANDS)))
+    for b, band in enumerate(BANDS):
+        start, end = BAND_RANGES[band]
+        mask[:, b] = (age_years >= start) & (age_years < (np.inf if end is None else end))
+    return mask
+
+
+def band_ratios(totals, age_years):
+    """모든 지역의 연령대 비중(%) (R, B) — 행렬곱 한 번"""
+    totals = np.asarray(totals, dtype=np.float64)
+    band_counts = totals @ band_mask(age_years)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return band_counts / totals.sum(axis=1, keepdims=True) * 100
+
+
+def band_categories(ratios):
+    """연령대 비중(%) (..., B) → 대표 유형. RATIO_DIGITS 자리로 반올림한 값에 CATEGORY_RULES를 차례로 적용한다"""
+    ratios = np.round(np.asarray(ratios, dtype=np.float64), RATIO_DIGITS)
+    conditions = [ratios[..., BANDS.index(band)] >= threshold for band, threshold, _ in CATEGORY_RULES]
+    return np.select(conditions, [label for _, _, label in CATEGORY_RULES], DEFAULT_CATEGORY)
+
+
+def build_band_table(data):
+    """지역별 연령대 비중, 대표 유형, 인사이트 해당 여부를 담은 표 (행정코드 인덱스)"""
+    ratios = band_ratios(data.total, data.age_years)
+    table = pd.DataFrame(ratios, columns=list(BANDS), index=pd.Index(data.codes, name="코드"))
+    table.insert(0, "지역명", data.names)
+    table.insert(1, "총인구", data.total.sum(axis=1))
+
+    table["유형"] = band_categories(ratios)
+    for band, threshold in INSIGHT_THRESHOLDS.items():
+        table[f"{band}_high"] = table[band].round(RATIO_DIGITS) >= threshold
+    return table
+
+
+_lock = threading.Lock()
+_tables = weakref.WeakKeyDictionary()
+
+
+def band_table(data):
+    """PopulationData별로 한 번만 만드는 연령대 비율표"""
+    table = _tables.get(data)
+    count("band_table", table is not None)
+    if table is None:
+        with _lock:
+            table = _tables.get(data)
+            if table is None:
+                table = build_band_table(data)
+                _tables[data] = table
+    return table
@@ -0,0 +1,247 @@
+import json
+import math
+import os
+import shutil
+import threading
+
+import numpy as np
+
+from utils.cache import cache_dir, file_digest, file_signature, save_json_atomic
+from utils.trace import count
+
+# 행정동 경계 GeoJSON (예: github.com/vuski/admdongkor 의 HangJeongDong_ver*.geojson)
+DEFAULT_BOUNDARY_FILE = "HangJeongDong_ver20250401.geojson"
+# 경계 캐시 형식이 바뀌면 올려서 디스크의 이전 타일을 무효화한다
+BOUNDARY_VERSION = 1
+# 단순화해 둘 확대 단계. 화면 확대 단계보다 작거나 같은 것 중 가장 큰 단계를 쓴다
+SIMPLIFY_ZOOMS = (6, 8, 10, 12)
+# 행정코드·이름으로 쓸 속성 이름 후보 (앞에 있을수록 우선)
+CODE_PROPERTIES = ("adm_cd2", "adm_cd", "code", "ADM_CD", "EMD_CD", "SIG_CD")
+NAME_PROPERTIES = ("adm_nm", "name", "ADM_NM", "EMD_KOR_NM", "SIG_KOR_NM")
+_TILE_SIZE = 256
+# 타일 한 장이 차지하는 범위: 단순화 단계보다 이만큼 낮은 확대 단계의 타일 (화면 몇 장 크기)
+_TILE_ZOOM_OFFSET = 2
+
+
+def _pixel_deg(zoom):
+    """확대 단계에서 화면 1픽셀에 해당하는 경도 폭"""
+    return 360 / (_TILE_SIZE * 2 ** zoom)
+
+
+def _decimals(zoom):
+    # 1픽셀보다 열 배 세밀한 자리까지만 남긴다
+    return max(0, math.ceil(-math.log10(_pixel_deg(zoom) / 10)))
+
+
+def simplify_ring(points, tolerance):
+    """Douglas–Peucker로 닫힌 고리(N×2, 첫 점 = 끝 점)의 점을 줄인다"""
+    n = len(points)
+    if n <= 4:
+        return points
+    keep = np.zeros(n, dtype=bool)
+    keep[0] = keep[-1] = True
+    stack = [(0, n - 1)]
+    while stack:
+        start, end = stack.pop()
+        if end - start < 2:
+            continue
+        segment = points[end] - points[start]
+        offsets = points[start + 1:end] - points[start]
+        length = math.hypot(*segment)
+        if length == 0:
+            dist = np.hypot(offsets[:, 0], offsets[:, 1])
+        else:
+            dist = np.abs(segment[0] * offsets[:, 1] - segment[1] * offsets[:, 0]) / length
+        i = int(np.argmax(dist))
+        if dist[i] > tolerance:
+            split = start + 1 + i
+            keep[split] = True
+            stack.append((start, split))
+            stack.append((split, end))
+    return points[keep]
+
+
+def _bbox_ring(points):
+    (west, south), (east, north) = points.min(axis=0), points.max(axis=0)
+    return np.array([[west, south], [east, south], [east, north], [west, north], [west, south]])
+
+
+def _polygons(geometry):
+    if geometry.get("type") == "Polygon":
+        return [geometry["coordinates"]]
+    if geometry.get("type") == "MultiPolygon":
+        return geometry["coordinates"]
+    return []
+
+
+def _simplify_polygons(polygons, zoom):
+    """한 지역의 다각형 고리들을 zoom 단계에 맞게 줄인다. 바깥 고리가 사라지면 외곽 사각형으로"""
+    tolerance = _pixel_deg(zoom)
+    decimals = _decimals(zoom)
+    result = []
+    for polygon in polygons:
+        rings = []
+        for i, ring in enumerate(polygon):
+            simplified = simplify_ring(ring, tolerance)
+            if len(simplified) < 4:
+                if i > 0:
+                    continue  # 작은 구멍은 버린다
+                simplified = _bbox_ring(ring)
+            rings.append(np.round(simplified, decimals).tolist())
+        result.append(rings)
+    return result
+
+
+def _feature_code(properties):
+    for key in CODE_PROPERTIES:
+        value = properties.get(key)
+        if value not in (None, ""):
+            return str(value).strip().ljust(10, "0")
+    return None
+
+
+def _feature_name(properties):
+    return next((str(properties[key]) for key in NAME_PROPERTIES if properties.get(key)), "")
+
+
+def _tile_xy(lon, lat, zoom):
+    n = 2 ** zoom
+    lat = max(min(lat, 85.0511), -85.0511)
+    x = int((lon + 180) / 360 * n)
+    y = int((1 - math.asinh(math.tan(math.radians(lat))) / math.pi) / 2 * n)
+    return min(max(x, 0), n - 1), min(max(y, 0), n - 1)
+
+
+def _tile_range(bounds, zoom):
+    south, west, north, east = bounds
+    x0, y0 = _tile_xy(west, north, zoom)
+    x1, y1 = _tile_xy(east, south, zoom)
+    return [(x, y) for x in range(x0, x1 + 1) for y in range(y0, y1 + 1)]
+
+
+def build_boundary_tiles(path, zooms=SIMPLIFY_ZOOMS):
+    """경계 GeoJSON을 확대 단계별로 단순화해 {단계: {"features": [...], "tiles": {"x/y": [번호, ...]}}}로 나눈다.
+
+    feature는 {"code", "name", "bbox", "coordinates"(MultiPolygon)} 형태이고, 외곽 사각형이
+    걸치는 모든 타일에 번호가 들어간다.
+    """
+    with open(path, encoding="utf-8") as f:
+        collection = json.load(f)
+
+    regions = []
+    for feature in collection.get("features", []):
+        properties = feature.get("properties") or {}
+        code = _feature_code(properties)
+        polygons = [
+            [np.asarray(ring, dtype=float)[:, :2] for ring in polygon if len(ring) >= 4]
+            for polygon in _polygons(feature.get("geometry") or {})
+        ]
+        polygons = [polygon for polygon in polygons if polygon]
+        if code is None or not polygons:
+            continue
+        outer = np.concatenate([polygon[0] for polygon in polygons])
+        (west, south), (east, north) = outer.min(axis=0), outer.max(axis=0)
+        regions.append((code, _feature_name(properties), (south, west, north, east), polygons))
+
+    levels = {}
+    for zoom in zooms:
+        features, tiles = [], {}
+        for index, (code, name, bbox, polygons) in enumerate(regions):
+            features.append({
+                "code": code,
+                "name": name,
+                "bbox": [round(float(v), 6) for v in bbox],
+                "coordinates": _simplify_polygons(polygons, zoom),
+            })
+            for x, y in _tile_range(bbox, max(zoom - _TILE_ZOOM_OFFSET, 0)):
+                tiles.setdefault(f"{x}/{y}", []).append(index)
+        levels[zoom] = {"features": features, "tiles": tiles}
+    return levels
+
+
+class BoundaryTiles:
+    """확대 단계별로 단순화한 경계를 타일 단위로 꺼내 쓰는 표"""
+
+    def __init__(self, levels):
+        self.levels = {int(zoom): level for zoom, level in levels.items()}
+        self.zooms = tuple(sorted(self.levels))
+
+    def __len__(self):
+        return len(self.levels[self.zooms[0]]["features"]) if self.zooms else 0
+
+    def zoom_for(self, zoom):
+        """화면 확대 단계에 쓸 단순화 단계"""
+        usable = [z for z in self.zooms if z <= zoom]
+        return usable[-1] if usable else self.zooms[0]
+
+    def features(self, bounds, zoom):
+        """화면 범위에 걸치는 타일의 경계들 (zoom에 맞게 단순화된 것)"""
+        level_zoom = self.zoom_for(zoom)
+        level = self.levels[level_zoom]
+        indices = set()
+        for x, y in _tile_range(bounds, max(level_zoom - _TILE_ZOOM_OFFSET, 0)):
+            indices.update(level["tiles"].get(f"{x}/{y}", ()))
+        south, west, north, east = bounds
+        result = []
+        for index in sorted(indices):
+            feature = level["features"][index]
+            f_south, f_west, f_north, f_east = feature["bbox"]
+            if f_north >= south and f_south <= north and f_east >= west and f_west <= east:
+                result.append(feature)
+        return result
+
+
+def _tiles_path(path):
+    name = f"boundaries-{file_digest(path)[:16]}-v{BOUNDARY_VERSION}"
+    return os.path.join(cache_dir(path), name)
+
+
+def _read_tiles(tiles_path):
+    levels = {}
+    for zoom in SIMPLIFY_ZOOMS:
+        with open(os.path.join(tiles_path, f"z{zoom}.json"), encoding="utf-8") as f:
+            levels[zoom] = json.load(f)
+    return BoundaryTiles(levels)
+
+
+_lock = threading.Lock()
+_loaded = {}
+
+
+def boundary_tiles(path=DEFAULT_BOUNDARY_FILE):
+    """경계 파일의 단계별 단순화 타일. 경계 파일이 없으면 None.
+
+    처음 한 번 단순화해 데이터 옆 캐시 폴더에 단계별 JSON으로 저장해 두고,
+    이후에는 그 파일만 읽는다.
+    """
+    if not os.path.exists(path):
+        return None
+    signature = file_signature(path)
+    tiles = _loaded.get(signature)
+    count("boundaries", tiles is not None)
+    if tiles is not None:
+        return tiles
+
+    with _lock:
+        tiles = _loaded.get(signature)
+        if tiles is not None:
+            return tiles
+
+        tiles_path = _tiles_path(path)
+        if os.path.isdir(tiles_path):
+            try:
+                tiles = _read_tiles(tiles_path)
+            except (OSError, ValueError, KeyError):
+                shutil.rmtree(tiles_path, ignore_errors=True)  # 깨진 타일은 다시 만든다
+
+        if tiles is None:
+            levels = build_boundary_tiles(path)
+            os.makedirs(tiles_path, exist_ok=True)
+            for zoom, level in levels.items():
+                save_json_atomic(os.path.join(tiles_path, f"z{zoom}.json"), level, compact=True)
+            tiles = BoundaryTiles(levels)
+
+        for key in [key for key in _loaded if key[0] == signature[0]]:
+            del _loaded[key]
+        _loaded[signature] = tiles
+    return tiles
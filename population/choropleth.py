@@ -0,0 +1,77 @@
+import pandas as pd
+
+from population.bands import BAND_LABELS, band_table
+from population.rollup import rollups
+
+# 값이 없는(경계 파일과 인구 자료의 행정코드가 맞지 않는) 지역의 색
+MISSING_COLOR = "#d9d9d9"
+_COLORS = ["#ffffcc", "#fd8d3c", "#800026"]
+_PREFIX_LENGTHS = {"시군구": 5, "시도": 2}
+
+
+def choropleth_values(population, level, band):
+    """읍면동 코드마다 칠할 (지역명, 값) 표.
+
+    읍면동 단계는 그 지역의 연령대 비율을, 시군구·시도 단계는 상위 지역의 비율을
+    그대로 물려 준다. 경계를 합치지 않고 읍면동 경계를 상위 지역 값으로 칠하는 방식이다.
+    """
+    tables = rollups(population)
+    leaves = band_table(tables["읍면동"])
+    if level == "읍면동":
+        return pd.DataFrame({"지역명": leaves["지역명"], "value": leaves[band]})
+
+    upper = band_table(tables[level])
+    # 일반구 아래 동도 5자리 접두사가 곧 구(장안구 등) 코드다
+    parents = leaves.index.str[:_PREFIX_LENGTHS[level]].str.ljust(10, "0")
+    values = upper[band].reindex(parents).to_numpy()
+    names = upper["지역명"].reindex(parents).to_numpy()
+    return pd.DataFrame({"지역명": names, "value": values}, index=leaves.index)
+
+
+def band_colormap(values, band):
+    """비율 값 범위에 맞춘 색 막대 (범례로도 쓴다)"""
+    import branca.colormap as cm  # 지도 화면에서만 쓰므로 필요할 때 불러온다
+
+    finite = values.dropna()
+    vmin, vmax = (float(finite.min()), float(finite.max())) if len(finite) else (0.0, 100.0)
+    colormap = cm.LinearColormap(_COLORS, vmin=vmin, vmax=max(vmax, vmin + 1e-9))
+    colormap.caption = f"{BAND_LABELS[band]} 비율 (%)"
+    return colormap
+
+
+def choropleth_layer(tiles, bounds, zoom, values, colormap, outline=True):
+    """화면 범위에 걸치는 경계만, 확대 단계에 맞게 단순화된 것으로 칠한 FeatureGroup"""
+    import folium
+
+    shapes = tiles.features(bounds, zoom)
+    # 화면 안 경계의 값을 한 번에 찾는다 (코드가 없는 경계는 NaN)
+    matched = values.reindex([shape["code"] for shape in shapes])
+    names = matched["지역명"].tolist()
+    rounded = matched["value"].round(1).tolist()
+    features = []
+    for shape, name, value in zip(shapes, names, rounded):
+        value = None if pd.isna(value) else value
+        features.append({
+            "type": "Feature",
+            "properties": {
+                "name": shape["name"] if pd.isna(name) else str(name),
+                "value": value,
+                "color": MISSING_COLOR if value is None else colormap(value),
+            },
+            "geometry": {"type": "MultiPolygon", "coordinates": shape["coordinates"]},
+        })
+
+    layer = folium.FeatureGroup(name="인구 구조")
+    if features:
+        weight = 0.3 if outline else 0
+        folium.GeoJson(
+            {"type": "FeatureCollection", "features": features},
+            style_function=lambda feature: {
+                "fillColor": feature["properties"]["color"],
+                "fillOpacity": 0.7,
+                "color": "#555555",
+                "weight": weight,
+            },
+            tooltip=folium.GeoJsonTooltip(fields=["name", "value"], aliases=["지역", "비율 (%)"]),
+        ).add_to(layer)
+    return layer, len(features)
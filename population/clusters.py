@@ -0,0 +1,270 @@
+import hashlib
+import os
+import shutil
+import threading
+import weakref
+
+import numpy as np
+import pandas as pd
+
+from population.bands import BANDS, RATIO_DIGITS, band_categories, band_ratios
+from population.loader import PopulationData
+from utils.cache import cache_dir, load_arrays, save_arrays_atomic
+from utils.trace import count
+
+# 저장 형식이나 학습 방식이 바뀌면 올려서 디스크의 이전 결과를 무효화한다
+CLUSTER_VERSION = 2
+# 자동으로 고를 유형 수 범위 [최소, 최대]
+K_RANGE = (3, 12)
+DEFAULT_BATCH_SIZE = 256
+DEFAULT_ITERATIONS = 100
+# 미니배치로 자리를 잡은 뒤 전체 데이터로 다듬는 횟수
+_REFINE_STEPS = 3
+# 실루엣 점수를 낼 표본 지역 수 (표본² 거리 행렬을 만든다)
+_SILHOUETTE_SAMPLE = 2_000
+# 연령 비율을 이 나이 폭으로 묶어 특징으로 쓴다 (한 살 단위 잡음 줄이기)
+AGE_GROUP = 5
+SEED = 0
+
+
+def profile_features(data):
+    """지역별 연령 비율을 AGE_GROUP세 묶음으로 합친 (R, G) 특징 행렬과 인구가 있는 지역 표시"""
+    totals = data.total.astype(np.float64)
+    groups = data.age_years // AGE_GROUP
+    grouped = totals @ (groups[:, None] == np.arange(groups.max() + 1)[None, :])
+    sums = grouped.sum(axis=1)
+    valid = sums > 0
+    grouped[valid] /= sums[valid, None]
+    return grouped, valid
+
+
+def _sq_distances(x, centers):
+    """(N, K) 제곱 거리 — ||x||² + ||c||² - 2x·c 를 행렬곱 한 번으로"""
+    sq = np.einsum("ij,ij->i", x, x)[:, None] + np.einsum("ij,ij->i", centers, centers)[None, :]
+    sq -= 2.0 * (x @ centers.T)
+    return np.maximum(sq, 0.0)
+
+
+def assign(x, centers):
+    """가장 가까운 중심 번호와 그 제곱 거리"""
+    sq = _sq_distances(x, centers)
+    labels = sq.argmin(axis=1)
+    return labels, sq[np.arange(len(x)), labels]
+
+
+def _init_centers(x, k, rng):
+    """탐욕적 k-means++ 초기 중심 — 후보 몇 개를 뽑아 전체 제곱 거리를 가장 줄이는 것을 고른다"""
+    trials = 2 + int(np.log(k))
+    centers = [x[rng.integers(len(x))]]
+    closest = _sq_distances(x, centers[0][None, :])[:, 0]
+    for _ in range(1, k):
+        total = closest.sum()
+        if total > 0:
+            rows = rng.choice(len(x), size=trials, p=closest / total)
+        else:
+            rows = rng.integers(len(x), size=trials)
+        candidates = np.minimum(closest[:, None], _sq_distances(x, x[rows]))  # (N, trials)
+        best = candidates.sum(axis=0).argmin()
+        centers.append(x[rows[best]])
+        closest = candidates[:, best]
+    return np.array(centers)
+
+
+def minibatch_kmeans(x, k, batch_size=DEFAULT_BATCH_SIZE, iterations=DEFAULT_ITERATIONS, seed=SEED):
+    """미니배치 k-평균 (Sculley 2010) 중심 (k, G).
+
+    배치마다 가까운 중심을 찾고, 중심별로 지금까지 받은 점 수에 반비례하는 학습률로 옮긴다.
+    마지막에 전체 데이터로 몇 번 다듬는다.
+    """
+    rng = np.random.default_rng(seed)
+    centers = _init_centers(x, k, rng)
+    seen = np.zeros(k)
+    for _ in range(iterations):
+        batch = x[rng.integers(len(x), size=min(batch_size, len(x)))]
+        labels, _ = assign(batch, centers)
+        n = np.bincount(labels, minlength=k).astype(np.float64)
+        sums = np.zeros_like(centers)
+        np.add.at(sums, labels, batch)
+        seen += n
+        moved = n > 0
+        centers[moved] += (sums[moved] - n[moved, None] * centers[moved]) / seen[moved, None]
+    for _ in range(_REFINE_STEPS):
+        labels, _ = assign(x, centers)
+        n = np.bincount(labels, minlength=k)
+        sums = np.zeros_like(centers)
+        np.add.at(sums, labels, x)
+        centers[n > 0] = sums[n > 0] / n[n > 0, None]
+    return centers
+
+
+def silhouette(x, labels, sample=_SILHOUETTE_SAMPLE, seed=SEED):
+    """표본 지역의 평균 실루엣 점수 (-1 ~ 1, 클수록 유형이 잘 갈린다)"""
+    if len(x) > sample:
+        rows = np.random.default_rng(seed).choice(len(x), sample, replace=False)
+        x, labels = x[rows], labels[rows]
+    k = labels.max() + 1
+    dist = np.sqrt(_sq_distances(x, x))
+    onehot = np.zeros((len(x), k))
+    onehot[np.arange(len(x)), labels] = 1
+    sizes = onehot.sum(axis=0)
+    mean_dist = dist @ onehot  # (N, K) 유형별 거리 합
+    own = sizes[labels] - 1
+    with np.errstate(divide="ignore", invalid="ignore"):
+        a = mean_dist[np.arange(len(x)), labels] / own
+        mean_dist /= sizes
+    mean_dist[np.arange(len(x)), labels] = np.inf
+    mean_dist[:, sizes == 0] = np.inf
+    b = mean_dist.min(axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        scores = np.where(own > 0, (b - a) / np.maximum(a, b), 0.0)
+    return float(np.nanmean(scores))
+
+
+class DemographicClusters:
+    """연령 구조가 비슷한 지역끼리 묶은 인구 유형.
+
+    labels는 지역별 유형 번호(인구가 없으면 -1), 유형은 평균 나이가 어린 순서로 번호를 매긴다.
+    counts는 유형별 소속 지역 인구 합이라 그대로 유형 피라미드가 된다.
+    """
+
+    def __init__(self, labels, distances, centers, counts, silhouettes):
+        self.labels = labels            # (R,) int32
+        self.distances = distances      # (R,) 자기 유형 중심까지 거리
+        self.centers = centers          # (K, G) 연령 묶음 비율 중심
+        self.counts = counts            # (K, A, S) 유형별 인구 합
+        self.silhouettes = silhouettes  # {k: 실루엣 점수} — 유형 수를 고른 근거
+
+    @property
+    def k(self):
+        return len(self.centers)
+
+    def members(self, cluster):
+        """유형에 속한 지역 행 번호 — 중심에 가까운(그 유형다운) 순서"""
+        rows = np.flatnonzero(self.labels == cluster)
+        return rows[np.argsort(self.distances[rows], kind="stable")]
+
+    def same_type(self, row, limit=None):
+        """row와 같은 유형의 다른 지역 (중심에 가까운 순서)"""
+        if self.labels[row] < 0:
+            return np.empty(0, dtype=np.intp)
+        rows = self.members(self.labels[row])
+        rows = rows[rows != row]
+        return rows[:limit] if limit is not None else rows
+
+    def names(self, data):
+        """'유형 1 · 청년형'처럼 번호와 중심 연령 구조에 맞는 대표 유형"""
+        totals = self.counts.sum(axis=2)
+        kinds = band_categories(band_ratios(totals, data.age_years))
+        return [f"유형 {i + 1} · {kind}" for i, kind in enumerate(kinds)]
+
+    def as_population(self, data):
+        """유형별 인구 합을 지역처럼 다루는 PopulationData (피라미드 그림을 그대로 쓰려고)"""
+        return PopulationData(
+            codes=np.array([f"C{i + 1:02d}" for i in range(self.k)], dtype="U10"),
+            names=np.array(self.names(data)),
+            ages=data.ages,
+            sexes=data.sexes,
+            counts=np.ascontiguousarray(self.counts),
+            month=data.month,
+            digest=f"{data.digest}-clusters-v{CLUSTER_VERSION}-k{self.k}",
+            source=data.source,
+        )
+
+    def stats(self, data):
+        """유형별 지역 수·총인구·연령대 비중·대표 지역 표"""
+        totals = self.counts.sum(axis=2)
+        table = pd.DataFrame(band_ratios(totals, data.age_years).round(RATIO_DIGITS), columns=list(BANDS))
+        table.insert(0, "유형", self.names(data))
+        table.insert(1, "지역 수", np.bincount(self.labels[self.labels >= 0], minlength=self.k))
+        table.insert(2, "총인구", totals.sum(axis=1))
+        table["대표 지역"] = [
+            str(data.names[rows[0]]) if len(rows) else "" for rows in map(self.members, range(self.k))
+        ]
+        return table
+
+
+def build_clusters(data, k=None, k_range=K_RANGE, seed=SEED):
+    """지역 연령 구조를 미니배치 k-평균으로 묶는다. k가 없으면 실루엣 점수가 가장 높은 수를 고른다"""
+    features, valid = profile_features(data)
+    x = features[valid]
+    low, high = k_range if k is None else (k, k)
+    high = min(high, len(x) - 1)
+    low = min(low, high)
+    if high < 2:
+        raise ValueError(f"인구 유형을 나누기에 지역이 너무 적습니다 ({len(x)}곳)")
+
+    silhouettes, best = {}, None
+    for candidate in range(low, high + 1):
+        centers = minibatch_kmeans(x, candidate, seed=seed)
+        labels, _ = assign(x, centers)
+        silhouettes[candidate] = silhouette(x, labels, seed=seed)
+        if best is None or silhouettes[candidate] > silhouettes[best[0]]:
+            best = (candidate, centers)
+    centers = best[1]
+
+    # 빈 유형은 빼고, 평균 나이가 어린 유형부터 번호를 매긴다
+    labels, sq = assign(x, centers)
+    centers = centers[np.unique(labels)]
+    mean_age = centers @ (np.arange(centers.shape[1]) * AGE_GROUP)
+    centers = centers[np.argsort(mean_age, kind="stable")]
+    labels, sq = assign(x, centers)
+
+    all_labels = np.full(len(data), -1, dtype=np.int32)
+    all_labels[valid] = labels
+    distances = np.full(len(data), np.inf)
+    distances[valid] = np.sqrt(sq)
+    counts = np.zeros((len(centers),) + data.counts.shape[1:], dtype=np.int64)
+    np.add.at(counts, labels, data.counts[valid])
+    return DemographicClusters(all_labels, distances, centers, counts, silhouettes)
+
+
+def _clusters_path(data):
+    # 같은 CSV라도 지역 부분집합(동만 등)이 다르면 별도 결과
+    subset = hashlib.sha1(data.codes.tobytes()).hexdigest()[:12]
+    name = f"clusters-{data.digest[:16]}-{subset}-v{CLUSTER_VERSION}"
+    return os.path.join(cache_dir(data.source), name)
+
+
+def _read_clusters(path):
+    arrays, meta = load_arrays(path, ("labels", "distances", "centers", "counts"))
+    silhouettes = {int(k): score for k, score in meta["silhouettes"].items()}
+    return DemographicClusters(arrays["labels"], arrays["distances"], arrays["centers"], arrays["counts"], silhouettes)
+
+
+_lock = threading.Lock()
+_clusters = weakref.WeakKeyDictionary()
+
+
+def demographic_clusters(data):
+    """데이터 옆 캐시에 저장된 인구 유형을 읽고, 없거나 CSV가 바뀌었으면 새로 묶는다"""
+    clusters = _clusters.get(data)
+    count("clusters", clusters is not None)
+    if clusters is not None:
+        return clusters
+
+    with _lock:
+        clusters = _clusters.get(data)
+        if clusters is not None:
+            return clusters
+
+        path = _clusters_path(data) if data.source else None
+        if path and os.path.isdir(path):
+            try:
+                clusters = _read_clusters(path)
+            except (OSError, ValueError, KeyError):
+                shutil.rmtree(path, ignore_errors=True)  # 깨진 결과는 다시 만든다
+
+        if clusters is None:
+            clusters = build_clusters(data)
+            if path:
+                save_arrays_atomic(
+                    path,
+                    meta={"silhouettes": {str(k): score for k, score in clusters.silhouettes.items()}},
+                    labels=clusters.labels,
+                    distances=clusters.distances,
+                    centers=clusters.centers,
+                    counts=clusters.counts,
+                )
+                clusters = _read_clusters(path)
+        _clusters[data] = clusters
+    return clusters
@@ -0,0 +1,160 @@
+import argparse
+import json
+import os
+import threading
+
+import numpy as np
+
+from population.loader import age_years, load_population
+from utils.cache import file_signature, save_json_atomic
+
+# 월별 CSV를 쌓아 두는 기본 위치 (데이터 폴더 기준)
+DEFAULT_CUBE_DIR = "population_cube"
+_META_FILE = "cube.json"
+
+
+class PopulationCube:
+    """월 × 지역 × 연령 × 성별 인구 큐브 (int32, 월별 memmap).
+
+    월마다 .npy 한 장을 쓰고 메타데이터만 갱신하는 추가 전용 구조다.
+    지역 축은 모든 월이 공유하며 새 행정코드는 뒤에 덧붙기만 하므로,
+    이전 달 파일은 다시 쓰지 않는다. 예전 달에 없던 지역은 0으로 본다.
+    """
+
+    def __init__(self, path, meta):
+        self.path = path
+        self.ages = tuple(meta["ages"])
+        self.sexes = tuple(meta["sexes"])
+        self.codes = list(meta["codes"])
+        self.names = list(meta["names"])
+        self.row_of = {code: row for row, code in enumerate(self.codes)}
+        self._months = meta["months"]
+        self.months = sorted(self._months)
+        self._slices = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.months)
+
+    def month_slice(self, month):
+        """한 달치 (R_m, A, S) memmap — 디스크에서 필요한 페이지만 읽힌다"""
+        data = self._slices.get(month)
+        if data is None:
+            with self._lock:
+                data = self._slices.get(month)
+                if data is None:
+                    file = os.path.join(self.path, self._months[month]["file"])
+                    data = np.load(file, mmap_mode="r")
+                    self._slices[month] = data
+        return data
+
+    def series(self, code, months=None):
+        """지역 하나의 월별 인구 (M, A, S). 해당 월에 없던 지역은 0"""
+        row = self.row_of[code]
+        months = self.months if months is None else months
+        out = np.zeros((len(months), len(self.ages), len(self.sexes)), dtype=np.int32)
+        for i, month in enumerate(months):
+            data = self.month_slice(month)
+            if row < len(data):
+                out[i] = data[row]
+        return out
+
+    def share_series(self, code, min_age, max_age=None, months=None):
+        """연령대 인구 비중(%)의 월별 추이 — 예: 고령 비중은 min_age=65"""
+        totals = self.series(code, months).sum(axis=2, dtype=np.int64)
+        years = age_years(self.ages)
+        band = years >= min_age
+        if max_age is not None:
+            band &= years < max_age
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return totals[:, band].sum(axis=1) / totals.sum(axis=1) * 100
+
+    def deltas(self, code, months=None):
+        """전월 대비 연령별 인구 증감 (M-1, A, S)"""
+        return np.diff(self.series(code, months).astype(np.int64), axis=0)
+
+
+def _read_meta(path):
+    with open(os.path.join(path, _META_FILE), encoding="utf-8") as f:
+        return json.load(f)
+
+
+def append_month(path, csv_path, replace=False):
+    """월별 CSV 하나를 파싱해 큐브에 한 달치 조각을 추가한다 (기존 달은 건드리지 않음)"""
+    data = load_population(csv_path)
+    os.makedirs(path, exist_ok=True)
+    meta_path = os.path.join(path, _META_FILE)
+    if os.path.exists(meta_path):
+        meta = _read_meta(path)
+    else:
+        meta = {"ages": list(data.ages), "sexes": list(data.sexes), "codes": [], "names": [], "months": {}}
+
+    if tuple(meta["ages"]) != data.ages or tuple(meta["sexes"]) != data.sexes:
+        raise ValueError(f"{csv_path}: 연령/성별 컬럼 구성이 큐브와 다릅니다")
+
+    existing = meta["months"].get(data.month)
+    if existing is not None:
+        if existing["digest"] == data.digest:
+            return False  # 이미 들어간 파일
+        if not replace:
+            raise ValueError(f"{data.month}은(는) 이미 큐브에 있습니다 (replace=True로 교체)")
+
+    # 새 행정코드는 지역 축 뒤에 덧붙인다
+    row_of = {code: row for row, code in enumerate(meta["codes"])}
+    for code, name in zip(data.codes.tolist(), data.names.tolist()):
+        if code not in row_of:
+            row_of[code] = len(meta["codes"])
+            meta["codes"].append(code)
+            meta["names"].append(name)
+
+    month_counts = np.zeros((len(meta["codes"]), len(data.ages), len(data.sexes)), dtype=np.int32)
+    month_counts[[row_of[code] for code in data.codes.tolist()]] = data.counts
+
+    file = f"{data.month}-{data.digest[:8]}.npy"
+    np.save(os.path.join(path, file), month_counts)
+    meta["months"][data.month] = {"file": file, "digest": data.digest, "source": os.path.basename(csv_path)}
+    save_json_atomic(meta_path, meta)
+
+    if existing is not None and existing["file"] != file:
+        old = os.path.join(path, existing["file"])
+        if os.path.exists(old):
+            os.unlink(old)
+    return True
+
+
+_lock = threading.Lock()
+_cubes = {}
+
+
+def open_cube(path=DEFAULT_CUBE_DIR):
+    """큐브를 연다 (메타데이터가 바뀌지 않았으면 같은 객체). 없으면 None"""
+    meta_path = os.path.join(path, _META_FILE)
+    if not os.path.exists(meta_path):
+        return None
+    signature = file_signature(meta_path)
+    cube = _cubes.get(signature)
+    if cube is None:
+        with _lock:
+            cube = _cubes.get(signature)
+            if cube is None:
+                cube = PopulationCube(path, _read_meta(path))
+                for stale in [key for key in _cubes if key[0] == signature[0]]:
+                    del _cubes[stale]
+                _cubes[signature] = cube
+    return cube
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="월별 연령별인구현황 CSV를 인구 큐브에 추가합니다.")
+    parser.add_argument("csv", nargs="+", help="추가할 월별 CSV 파일")
+    parser.add_argument("--cube", default=DEFAULT_CUBE_DIR, help=f"큐브 폴더 (기본: {DEFAULT_CUBE_DIR})")
+    parser.add_argument("--replace", action="store_true", help="같은 달이 있으면 새 파일로 교체")
+    args = parser.parse_args(argv)
+
+    for csv_path in args.csv:
+        added = append_month(args.cube, csv_path, replace=args.replace)
+        print(f"{'추가' if added else '건너뜀(동일 파일)'}: {csv_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,386 @@
+import json
+import os
+import threading
+from collections import Counter, OrderedDict
+
+import plotly.graph_objects as go
+import plotly.io as pio
+
+from population.bands import BANDS
+from utils.cache import cache_dir, save_json_atomic
+from utils.trace import count
+
+# 캐시에 남겨 둘 그림 JSON의 총 크기 (바이트)
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+# 직렬화하지 않고 그림 JSON 크기를 어림할 때: 레이아웃 몫 + 값 하나당 바이트
+_BASE_BYTES = 3_000
+_VALUE_BYTES = 16
+_TRACE_ARRAYS = ("x", "y", "text", "customdata")
+# 미리 그려 둘 많이 본 지역 수
+DEFAULT_WARM_LIMIT = 20
+# 조회 수를 이만큼 모을 때마다 디스크에 기록한다
+_SAVE_VIEWS_EVERY = 20
+_VIEWS_FILE = "figure-views.json"
+
+
+def pyramid_figure(regions, row):
+    """선택 지역 연령별 인구 피라미드 (남녀 비율 기준)"""
+    ages = list(regions.ages)
+    population_male = regions.male[row].tolist()
+    population_female = regions.female[row].tolist()
+    total_male = sum(population_male)
+    total_female = sum(population_female)
+    male_ratio = [round(p / total_male * 100, 2) for p in population_male]
+    female_ratio = [round(p / total_female * 100, 2) for p in population_female]
+
+    fig_pyramid = go.Figure()
+    fig_pyramid.add_trace(go.Bar(
+        y=ages,
+        x=[-v for v in male_ratio],
+        name="👨 남성 (%)",
+        orientation='h',
+        marker=dict(color='rgba(54, 162, 235, 0.8)')
+    ))
+    fig_pyramid.add_trace(go.Bar(
+        y=ages,
+        x=female_ratio,
+        name="👩 여성 (%)",
+        orientation='h',
+        marker=dict(color='rgba(255, 99, 132, 0.8)')
+    ))
+    fig_pyramid.update_layout(
+        title=dict(text=f"📊 {regions.names[row]} 연령별 인구 피라미드 (비율 기준)", font=dict(size=24)),
+        barmode='overlay',
+        xaxis=dict(title='인구 비율 (%)', tickvals=[-10, -5, 0, 5, 10], ticktext=['10%', '5%', '0', '5%', '10%']),
+        yaxis=dict(title='연령'),
+        height=650,
+        legend=dict(x=0.02, y=1.05, orientation="h")
+    )
+    return fig_pyramid
+
+
+def distribution_figure(regions, row):
+    """전체 연령대별 인구 분포 막대그래프"""
+    population_total = regions.total[row]
+    fig_all = go.Figure(go.Bar(
+        x=list(regions.ages),
+        y=population_total,
+        marker=dict(color='mediumseagreen'),
+        text=population_total,
+        textposition='outside',
+        hovertemplate='연령 %{x}<br>인구수 %{y:,}명<extra></extra>'
+    ))
+    fig_all.update_layout(
+        title=dict(text="📈 전체 연령대별 인구 분포", font=dict(size=24)),
+        xaxis_title="연령",
+        yaxis_title="인구 수",
+        height=500,
+        margin=dict(t=60, l=60, r=40, b=40)
+    )
+    return fig_all
+
+
+def compare_figure(regions, row, other_row, level):
+    """선택 지역과 유사 지역의 연령별 인구 구조를 겹쳐 그린 선 그래프"""
+    ages = list(regions.ages)
+    fig_compare = go.Figure()
+    fig_compare.add_trace(go.Scatter(
+        x=ages,
+        y=regions.total[row].tolist(),
+        mode='lines+markers',
+        name=str(regions.names[row]),
+        line=dict(color='royalblue')
+    ))
+    fig_compare.add_trace(go.Scatter(
+        x=ages,
+        y=regions.total[other_row].tolist(),
+        mode='lines+markers',
+        name=str(regions.names[other_row]),
+        line=dict(color='orangered', dash='dot')
+    ))
+    fig_compare.update_layout(
+        title=f"👥 선택 {level}과(와) 유사 {level}의 연령별 인구 구조 비교",
+        xaxis_title="연령",
+        yaxis_title="인구 수",
+        height=500,
+        legend=dict(x=0.01, y=1.1, orientation="h")
+    )
+    return fig_compare
+
+
+# 연령대 비중 추이 선 (월별 추이 그림과 같은 이름·색)
+BAND_LINES = (
+    ("under20", "👶 0~19세", "gold"),
+    ("youth", "👩‍🎓 20~39세", "mediumseagreen"),
+    ("middle", "👨‍💼 40~64세", "royalblue"),
+    ("elderly", "🧓 65세 이상", "orangered"),
+)
+
+
+def projection_pyramid_figure(regions, row, projection, year):
+    """year년 전망 피라미드 (비율 기준) — 현재 구조는 점선으로 겹쳐 그린다"""
+    ages = list(regions.ages)
+    index = projection.year_index(year)
+    fig_projection = go.Figure()
+    for sex, sign, name, color in (
+        ("남", -1, "👨 남성", "rgba(54, 162, 235, 0.8)"),
+        ("여", 1, "👩 여성", "rgba(255, 99, 132, 0.8)"),
+    ):
+        s = projection.sexes.index(sex)
+        current = projection.counts[0, row, :, s]
+        future = projection.counts[index, row, :, s]
+        current_ratio = current / max(current.sum(), 1) * 100 * sign
+        future_ratio = future / max(future.sum(), 1) * 100 * sign
+        fig_projection.add_trace(go.Bar(
+            y=ages,
+            x=future_ratio.round(2),
+            name=f"{name} {year}년 (%)",
+            orientation='h',
+            marker=dict(color=color)
+        ))
+        fig_projection.add_trace(go.Scatter(
+            y=ages,
+            x=current_ratio.round(2),
+            name=f"{name} {projection.years[0]}년",
+            mode='lines',
+            line=dict(color='gray', dash='dot', width=1)
+        ))
+    fig_projection.update_layout(
+        title=dict(text=f"🔮 {regions.names[row]} {year}년 전망 인구 피라미드", font=dict(size=24)),
+        barmode='overlay',
+        xaxis=dict(title='인구 비율 (%)', tickvals=[-10, -5, 0, 5, 10], ticktext=['10%', '5%', '0', '5%', '10%']),
+        yaxis=dict(title='연령'),
+        height=650,
+        legend=dict(x=0.02, y=1.05, orientation="h")
+    )
+    return fig_projection
+
+
+def projection_band_figure(regions, row, projection):
+    """연도별 연령대 비중 전망 선 그래프"""
+    ratios = projection.band_ratios[:, row]
+    fig_bands = go.Figure()
+    for band, label, color in BAND_LINES:
+        fig_bands.add_trace(go.Scatter(
+            x=projection.years,
+            y=ratios[:, BANDS.index(band)].round(2),
+            mode='lines+markers',
+            name=label,
+            line=dict(color=color)
+        ))
+    fig_bands.update_layout(
+        title=f"📈 {regions.names[row]} 연령대 비중 전망",
+        xaxis_title="연도",
+        yaxis_title="비중 (%)",
+        height=650,
+        legend=dict(x=0.01, y=1.1, orientation="h")
+    )
+    return fig_bands
+
+
+def _estimate_size(figure):
+    """그림 JSON 크기 어림값 (바이트) — 트레이스 값 개수로 센다"""
+    values = sum(
+        len(trace[name]) for trace in figure.data for name in _TRACE_ARRAYS if trace[name] is not None
+    )
+    return _BASE_BYTES + _VALUE_BYTES * values
+
+
+class CachedFigure:
+    """그린 그림과, 처음 요청할 때 한 번만 만드는 plotly JSON.
+
+    페이지는 figure를 그대로 넘기고(직렬화는 Streamlit이 한다), JSON은 API처럼 요청하는 쪽이 있을 때만 만든다.
+    """
+
+    __slots__ = ("figure", "size", "_spec")
+
+    def __init__(self, figure):
+        self.figure = figure
+        self.size = _estimate_size(figure)
+        self._spec = None
+
+    @property
+    def spec(self):
+        if self._spec is None:
+            self._spec = pio.to_json(self.figure, validate=False)
+        return self._spec
+
+
+class FigureCache:
+    """(그림 종류, 데이터, 지역 코드…)별 그림을 어림한 JSON 크기 합으로 제한한 LRU.
+
+    최근에 본 지역으로 돌아가면 그림을 다시 만들거나 직렬화하지 않고 그대로 쓴다.
+    """
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._bytes = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    @property
+    def nbytes(self):
+        return self._bytes
+
+    def get(self, key, build):
+        """key의 그림을 돌려준다. 없으면 build()로 만들어 넣는다"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                count("figures", True)
+                return entry
+            self.misses += 1
+        count("figures", False)
+
+        entry = CachedFigure(build())
+        with self._lock:
+            if key not in self._entries:
+                self._entries[key] = entry
+                self._bytes += entry.size
+            while self._bytes > self.max_bytes and len(self._entries) > 1:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted.size
+        return entry
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def figure_cache():
+    """프로세스에 하나만 두는 FigureCache"""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = FigureCache()
+    return _cache
+
+
+def _key(kind, regions, level, *codes):
+    return (kind, regions.digest, level, *codes)
+
+
+def region_figures(regions, row, level):
+    """선택 지역의 (피라미드, 연령 분포) CachedFigure"""
+    cache = figure_cache()
+    code = str(regions.codes[row])
+    return (
+        cache.get(_key("pyramid", regions, level, code), lambda: pyramid_figure(regions, row)),
+        cache.get(_key("distribution", regions, level, code), lambda: distribution_figure(regions, row)),
+    )
+
+
+def compare_figures(regions, row, other_row, level):
+    """선택 지역과 유사 지역 비교 CachedFigure"""
+    key = _key("compare", regions, level, str(regions.codes[row]), str(regions.codes[other_row]))
+    return figure_cache().get(key, lambda: compare_figure(regions, row, other_row, level))
+
+
+def projection_figures(regions, row, level, projection, year):
+    """전망 (피라미드, 연령대 비중 추이) CachedFigure — 가정·연도마다 따로 캐시"""
+    cache = figure_cache()
+    code = str(regions.codes[row])
+    return (
+        cache.get(
+            _key("projection_pyramid", regions, level, code, projection.key, year),
+            lambda: projection_pyramid_figure(regions, row, projection, year),
+        ),
+        cache.get(
+            _key("projection_bands", regions, level, code, projection.key),
+            lambda: projection_band_figure(regions, row, projection),
+        ),
+    )
+
+
+def cluster_figures(regions, level, clusters, cluster):
+    """인구 유형 하나의 (소속 지역 인구 합) 피라미드 CachedFigure"""
+    types = clusters.as_population(regions)
+    key = _key("cluster_pyramid", types, level, str(types.codes[cluster]))
+    return figure_cache().get(key, lambda: pyramid_figure(types, cluster))
+
+
+class ViewCounter:
+    """단위별 지역 조회 수. 미리 그릴 지역을 고르려고 데이터 옆 캐시 폴더에 쌓아 둔다.
+
+    path가 None이면 프로세스 안에서만 센다.
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        self._lock = threading.Lock()
+        self._pending = 0
+        self.counts = {}
+        if path and os.path.exists(path):
+            try:
+                with open(path, encoding="utf-8") as f:
+                    self.counts = {level: Counter(counts) for level, counts in json.load(f).items()}
+            except (OSError, ValueError):
+                self.counts = {}
+
+    def record(self, level, code):
+        with self._lock:
+            self.counts.setdefault(level, Counter())[code] += 1
+            self._pending += 1
+            if self.path is None or self._pending < _SAVE_VIEWS_EVERY:
+                return
+            self._pending = 0
+            snapshot = {level: dict(counts) for level, counts in self.counts.items()}
+        save_json_atomic(self.path, snapshot)
+
+    def most_viewed(self, level, limit):
+        with self._lock:
+            return [code for code, _ in self.counts.get(level, Counter()).most_common(limit)]
+
+
+_views = {}
+
+
+def view_counter(data):
+    """데이터 파일별로 하나만 두는 ViewCounter"""
+    path = os.path.join(cache_dir(data.source), _VIEWS_FILE) if data.source else None
+    with _cache_lock:
+        if path not in _views:
+            _views[path] = ViewCounter(path)
+        return _views[path]
+
+
+_warmed = set()
+
+
+def warm_figures(regions, level, neighbors=None, limit=DEFAULT_WARM_LIMIT):
+    """많이 본 지역 limit개의 그림(유사 지역 비교 포함)을 미리 그려 둔다.
+
+    데이터·단위마다 프로세스에서 한 번만 그리며, 새로 그린 지역 수를 돌려준다.
+    """
+    with _cache_lock:
+        if (regions.digest, level) in _warmed:
+            return 0
+        _warmed.add((regions.digest, level))
+    warmed = 0
+    for code in view_counter(regions).most_viewed(level, limit):
+        row = regions.code_index.get(code)
+        if row is None:
+            continue
+        region_figures(regions, row, level)
+        if neighbors is not None:
+            best_row, _ = neighbors.most_similar(row)
+            if best_row is not None:
+                compare_figures(regions, row, best_row, level)
+        warmed += 1
+    return warmed
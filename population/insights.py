@@ -0,0 +1,100 @@
+import numpy as np
+
+from population.bands import BAND_LABELS, BANDS, INSIGHT_THRESHOLDS, RATIO_DIGITS
+
+# 두 지역의 연령대 비중(소수 첫째 자리) 차이가 이 이내면 공통점으로 본다
+TRAIT_TOLERANCE = 3
+
+# 종합 분석: 비중이 기준(INSIGHT_THRESHOLDS) 이상인 연령대마다 한 항목
+INSIGHT_TEXTS = {
+    "under20": (
+        "👶 **어린이·청소년 비중이 높은 지역입니다.**  \n"
+        "- 학군, 놀이시설, 방과후 돌봄센터, 청소년 문화공간이 필요합니다.  \n"
+        "- 학원가, 문구점, 키즈카페 중심의 상권이 형성될 수 있습니다."
+    ),
+    "youth": (
+        "👩‍🎓 **청년층이 많은 지역입니다.**  \n"
+        "- 청년 주거, 창업 공간, 문화 예술 공간 수요가 큽니다.  \n"
+        "- 공유오피스, 감성 카페, 푸드트럭 거리 등이 어울립니다."
+    ),
+    "middle": (
+        "👨‍💼 **중장년층 비중이 높은 지역입니다.**  \n"
+        "- 평생교육센터, 건강검진센터, 재취업 지원시설이 요구됩니다.  \n"
+        "- 약국, 대형마트 중심의 실속형 상권이 효과적입니다."
+    ),
+    "elderly": (
+        "🧓 **고령 인구가 많은 지역입니다.**  \n"
+        "- 복지센터, 실버문화센터, 무장애 인프라 구축이 중요합니다.  \n"
+        "- 전통시장이나 의료 접근성이 뛰어난 상권이 적합합니다."
+    ),
+}
+BALANCED_INSIGHT = (
+    "🏙️ **세대가 균형 있게 분포한 지역입니다.**  \n"
+    "- 가족 단위 복합문화시설, 도서관, 커뮤니티센터가 적합합니다.  \n"
+    "- 세대 연계를 고려한 복합형 상권이 유리합니다."
+)
+
+# 인구 분석 요약: {ratio}에 그 연령대 비중이 들어간다
+SUMMARY_TEXTS = {
+    "under20": (
+        "🧒 이 지역은 교복 입은 학생들과 아이들 웃음소리가 끊이지 않는 동네입니다. "
+        "{ratio}%에 달하는 학령 인구는 미래를 위한 교육 인프라가 필요함을 시사합니다."
+    ),
+    "youth": (
+        "🧑‍🎓 청년이 많은 이곳은 활력과 가능성의 중심지입니다. "
+        "전체 인구의 {ratio}%를 차지하는 청년층은 일자리, 주거, 문화 공간을 갈망합니다."
+    ),
+    "middle": (
+        "👨‍👩‍👧‍👦 중장년층이 주를 이루는 안정된 지역입니다. "
+        "{ratio}%에 이르는 이들의 삶의 질을 높이려면 건강관리, 평생교육, 커뮤니티 공간이 뒷받침되어야 합니다."
+    ),
+    "elderly": (
+        "🧓 인생의 후반전을 살아가는 어르신들이 눈에 띄는 지역입니다. "
+        "{ratio}%에 달하는 고령층은 복지시설과 접근성 좋은 환경을 요구합니다."
+    ),
+}
+BALANCED_SUMMARY = (
+    "🏙️ 이 지역은 어린이부터 어르신까지 다양한 세대가 어울려 사는 균형 잡힌 동네입니다. "
+    "세대 간 조화를 위한 다세대 복합 공간이 잘 어울릴 것입니다."
+)
+
+
+def region_ratios(bands_row, digits=RATIO_DIGITS):
+    """band_table 한 줄에서 연령대별 비중을 반올림해 꺼낸다 (유형 판단과 같은 np.round)"""
+    return {band: float(np.round(float(bands_row[band]), digits)) for band in BANDS}
+
+
+def _high_bands(ratios):
+    return [band for band in BANDS if ratios[band] >= INSIGHT_THRESHOLDS[band]]
+
+
+def region_insights(ratios):
+    """종합 분석 항목 목록 (기준을 넘는 연령대가 없으면 균형형 한 항목)"""
+    return [INSIGHT_TEXTS[band] for band in _high_bands(ratios)] or [BALANCED_INSIGHT]
+
+
+def summary_lines(ratios):
+    """인구 분석 요약 문단들. 둘째 문단부터는 "더불어"로 잇는다"""
+    lines = [SUMMARY_TEXTS[band].format(ratio=ratios[band]) for band in _high_bands(ratios)]
+    if not lines:
+        return [BALANCED_SUMMARY]
+    return lines[:1] + [f"더불어 {line}" for line in lines[1:]]
+
+
+def similar_traits(ratios, other_ratios):
+    """두 지역에서 비중 차이가 TRAIT_TOLERANCE 이내인 연령대들"""
+    return [band for band in BANDS if abs(ratios[band] - other_ratios[band]) <= TRAIT_TOLERANCE]
+
+
+def similar_summary(name, other_name, traits):
+    """유사 지역 분석 요약 문단"""
+    if traits:
+        trait_text = " · ".join(BAND_LABELS[band] for band in traits)
+        return (
+            f"{name}과(와) {other_name}은(는) 모두 **{trait_text}** 비중이 유사한 지역입니다.\n\n"
+            f"두 지역은 {trait_text}을 중심으로 한 정책, 생활 인프라, 상권 구성이 비슷하게 전개될 가능성이 높습니다.\n\n"
+        )
+    return (
+        f"{name}과(와) {other_name}은(는) 전체 인구 구조가 유사하지만, 뚜렷한 세대별 비율 공통점은 상대적으로 적습니다.\n\n"
+        "생활 환경이 비슷하더라도, 각 세대별 정책 우선순위는 별도로 고려할 필요가 있습니다."
+    )
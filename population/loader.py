@@ -0,0 +1,198 @@
+import os
+import re
+import shutil
+import threading
+from dataclasses import dataclass
+from functools import cached_property
+
+import numpy as np
+import pandas as pd
+
+from utils.cache import cache_dir, file_digest, file_signature, load_arrays, save_arrays_atomic
+from utils.trace import count
+
+# 캐시 파일 형식이 바뀌면 올려서 이전 캐시를 무효화한다
+CACHE_VERSION = 2
+
+# "서울특별시 종로구 청운효자동(1111051500)" → 이름, 10자리 행정코드
+_REGION_RE = r"^(?P<name>.*?)\s*\((?P<code>\d{10})\)\s*$"
+# "2025년04월_남_0세" → 월, 성별, 연령 라벨
+_COLUMN_RE = re.compile(r"^(?P<month>\d{4}년\d{2}월)_(?P<sex>계|남|여)_(?P<label>.+)$")
+
+
+def age_years(labels):
+    """연령 라벨의 나이 배열 — "100세 이상"은 100"""
+    return np.array([int(re.match(r"\d+", label).group()) for label in labels])
+
+
+@dataclass(frozen=True, eq=False)
+class PopulationData:
+    """행정구역 × 연령 × 성별 인구 행렬 (int32)과 지역 인덱스"""
+
+    codes: np.ndarray   # (R,) 10자리 행정코드
+    names: np.ndarray   # (R,) 괄호 앞 지역명
+    ages: tuple         # 연령 라벨 ("0세", ..., "100세 이상")
+    sexes: tuple        # ("남", "여") 또는 합계 파일이면 ("계",)
+    counts: np.ndarray  # (R, A, S) int32
+    month: str          # "2025년04월"
+    digest: str         # 원본 CSV 해시
+    source: str = ""    # 원본 CSV 경로 (파생 캐시 위치 결정용)
+
+    def __len__(self):
+        return len(self.codes)
+
+    @cached_property
+    def code_index(self):
+        return {code: row for row, code in enumerate(self.codes.tolist())}
+
+    @cached_property
+    def age_years(self):
+        return age_years(self.ages)
+
+    @cached_property
+    def total(self):
+        """남녀 합계 (R, A)"""
+        return self.counts.sum(axis=2, dtype=np.int64)
+
+    def sex(self, label):
+        return self.counts[:, :, self.sexes.index(label)]
+
+    @property
+    def male(self):
+        return self.sex("남")
+
+    @property
+    def female(self):
+        return self.sex("여")
+
+    def take(self, rows):
+        rows = np.asarray(rows)
+        return PopulationData(
+            codes=self.codes[rows],
+            names=self.names[rows],
+            ages=self.ages,
+            sexes=self.sexes,
+            counts=self.counts[rows],
+            month=self.month,
+            digest=self.digest,
+            source=self.source,
+        )
+
+    @cached_property
+    def dongs(self):
+        """이름이 '동'으로 끝나는 지역만 (페이지의 동 단위 필터와 동일)"""
+        return self.take(np.flatnonzero(np.char.endswith(self.names, "동")))
+
+
+def _parse_csv(path, digest):
+    df = pd.read_csv(path, encoding="cp949", thousands=",")
+
+    # 행정구역 이름 정제: 코드가 있는 행만, 괄호 앞 지역명과 코드 분리
+    region = df["행정구역"].str.extract(_REGION_RE)
+    valid = region["code"].notna().to_numpy()
+    df = df[valid]
+    region = region[valid]
+
+    # 성별별 연령 컬럼 모으기
+    month = None
+    columns = {}
+    for col in df.columns:
+        match = _COLUMN_RE.match(col)
+        if match is None or "세" not in match["label"]:
+            continue
+        month = month or match["month"]
+        columns.setdefault(match["sex"], []).append(col)
+
+    sexes = ("남", "여") if "남" in columns and "여" in columns else ("계",)
+    ages = tuple(col.split("_")[-1] for col in columns[sexes[0]])
+    for sex in sexes:
+        if tuple(col.split("_")[-1] for col in columns[sex]) != ages:
+            raise ValueError(f"{path}: '{sex}' 연령 컬럼이 다른 성별과 일치하지 않습니다")
+
+    counts = np.stack(
+        [
+            df[columns[sex]].apply(pd.to_numeric, errors="coerce").fillna(0).to_numpy(np.int32)
+            for sex in sexes
+        ],
+        axis=2,
+    )
+    return PopulationData(
+        codes=region["code"].to_numpy(dtype="U10"),
+        names=region["name"].str.strip().to_numpy(dtype=str),
+        ages=ages,
+        sexes=sexes,
+        counts=np.ascontiguousarray(counts),
+        month=month,
+        digest=digest,
+        source=os.path.abspath(path),
+    )
+
+
+def _cache_path(path, digest):
+    return os.path.join(cache_dir(path), f"population-{digest[:16]}-v{CACHE_VERSION}")
+
+
+def _read_cache(cache_path, path, digest):
+    arrays, meta = load_arrays(cache_path, ("codes", "names", "counts"))
+    return PopulationData(
+        codes=arrays["codes"],
+        names=arrays["names"],
+        ages=tuple(meta["ages"]),
+        sexes=tuple(meta["sexes"]),
+        counts=arrays["counts"],
+        month=meta["month"],
+        digest=digest,
+        source=os.path.abspath(path),
+    )
+
+
+def _write_cache(cache_path, data):
+    save_arrays_atomic(
+        cache_path,
+        meta={"ages": list(data.ages), "sexes": list(data.sexes), "month": data.month},
+        codes=data.codes,
+        names=data.names,
+        counts=data.counts,
+    )
+
+
+def _load_uncached(path):
+    digest = file_digest(path)
+    cache_path = _cache_path(path, digest)
+    if os.path.isdir(cache_path):
+        try:
+            return _read_cache(cache_path, path, digest)
+        except (OSError, ValueError, KeyError):
+            shutil.rmtree(cache_path, ignore_errors=True)  # 깨진 캐시는 다시 만든다
+
+    # 파싱 결과도 캐시를 거쳐 memmap으로 연다 (프로세스 간 공유)
+    _write_cache(cache_path, _parse_csv(path, digest))
+    return _read_cache(cache_path, path, digest)
+
+
+_lock = threading.Lock()
+_loaded = {}
+
+
+def load_population(path):
+    """인구 CSV를 한 번만 파싱해서 호스트 전체에서 공유한다.
+
+    파일 내용 해시를 키로 한 .npy 캐시가 있으면 CSV를 읽지 않고 읽기 전용
+    memmap으로 열기 때문에, 모든 서버 프로세스가 같은 물리 메모리를 쓴다.
+    같은 프로세스 안의 세션들은 파일이 바뀌지 않는 한 같은 객체를 받는다.
+    """
+    signature = file_signature(path)
+    data = _loaded.get(signature)
+    count("population", data is not None)
+    if data is not None:
+        return data
+
+    with _lock:
+        data = _loaded.get(signature)
+        if data is None:
+            data = _load_uncached(path)
+            # 같은 경로의 이전 버전은 버린다
+            for stale in [key for key in _loaded if key[0] == signature[0]]:
+                del _loaded[stale]
+            _loaded[signature] = data
+    return data
@@ -0,0 +1,169 @@
+import hashlib
+import os
+import shutil
+import threading
+import weakref
+
+import numpy as np
+
+from population.similarity import SimilarityEngine, similarity_engine
+from utils.cache import cache_dir, load_arrays, save_arrays_atomic
+from utils.trace import count
+
+# 인덱스 형식이 바뀌면 올려서 디스크의 이전 인덱스를 무효화한다
+INDEX_VERSION = 2
+# 지역마다 저장하는 이웃 수 (같은 이름 제외 등 후처리 여유분 포함)
+DEFAULT_K = 16
+# BLAS로 근사 점수를 낸 뒤 정확히 다시 계산할 여유 후보 수
+_RERANK_SLACK = 8
+
+
+def _profile_matrix(data, profile):
+    """'계'는 남녀 합계, '남'/'여'는 성별 연령 벡터"""
+    if profile == "계":
+        return data.total
+    return data.sex(profile)
+
+
+def _block_top_k(engine, rows, k):
+    """rows 블록의 전체 지역 대비 hybrid_distance 상위 k개 (행 번호, 점수)"""
+    shares = engine.shares
+    sq_norms = np.einsum("ij,ij->i", shares, shares)
+    query_shares = shares[rows]
+    query_sums = engine.sums[rows]
+
+    # ||a - b||² = ||a||² + ||b||² - 2a·b 로 블록 전체를 행렬곱 한 번에 근사
+    sq_dist = sq_norms[rows, None] + sq_norms[None, :] - 2.0 * (query_shares @ shares.T)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        approx = np.sqrt(np.maximum(sq_dist, 0.0))
+        approx += np.abs(query_sums[:, None] - engine.sums[None, :]) / query_sums[:, None]
+    approx[:, ~engine.valid] = np.inf
+    approx[np.arange(len(rows)), rows] = np.inf
+
+    n_candidates = min(k + _RERANK_SLACK, len(engine) - 1)
+    if n_candidates <= 0:
+        shape = (len(rows), k)
+        return np.full(shape, -1, dtype=np.int32), np.full(shape, np.inf)
+    candidates = np.argpartition(approx, n_candidates - 1, axis=1)[:, :n_candidates]
+
+    # 후보만 similarity 엔진과 같은 식으로 정확히 다시 계산
+    diff = query_shares[:, None, :] - shares[candidates]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        exact = np.sqrt(np.einsum("ijk,ijk->ij", diff, diff))
+        exact += np.abs(query_sums[:, None] - engine.sums[candidates]) / query_sums[:, None]
+    exact[~np.isfinite(np.take_along_axis(approx, candidates, axis=1))] = np.inf
+    exact[~engine.valid[rows]] = np.inf
+
+    order = np.lexsort((candidates, exact), axis=1)[:, :k]
+    top_rows = np.take_along_axis(candidates, order, axis=1).astype(np.int32)
+    top_scores = np.take_along_axis(exact, order, axis=1)
+    top_rows[~np.isfinite(top_scores)] = -1
+
+    if top_rows.shape[1] < k:
+        pad = k - top_rows.shape[1]
+        top_rows = np.pad(top_rows, ((0, 0), (0, pad)), constant_values=-1)
+        top_scores = np.pad(top_scores, ((0, 0), (0, pad)), constant_values=np.inf)
+    return top_rows, top_scores
+
+
+class NeighborIndex:
+    """모든 지역의 hybrid_distance 상위 k개 이웃을 미리 계산해 둔 표.
+
+    hybrid_distance는 규모 항이 기준 지역 인구로 나뉘는 비대칭 거리라서
+    KD-tree 대신 블록 단위 전수 비교로 만든다. 조회는 표 한 줄을 읽는 것뿐이다.
+    """
+
+    def __init__(self, profiles, rows, scores, data=None):
+        self.profiles = tuple(profiles)
+        self.rows = rows        # (P, R, K) int32, 빈 자리는 -1
+        self.scores = scores    # (P, R, K) float64, 빈 자리는 inf
+        # 표보다 많이 물을 때 다시 계산할 원본 (캐시 값이 키인 데이터를 붙잡지 않도록 약한 참조)
+        self._data = weakref.ref(data) if data is not None else None
+
+    @property
+    def k(self):
+        return self.rows.shape[2]
+
+    def lookup(self, row, k=10, profile="계", exclude=None):
+        """row와 가장 유사한 지역 k개의 (행 번호, 점수).
+
+        저장된 이웃(self.k개)으로 모자라면(k가 더 크거나 exclude로 빠져서) 원본 데이터로 다시 계산한다.
+        """
+        p = self.profiles.index(profile)
+        rows = self.rows[p, row]
+        scores = self.scores[p, row]
+        keep = rows >= 0
+        if exclude is not None:
+            keep &= ~np.isin(rows, exclude)
+        # 빈 자리(-1)가 있으면 표에 모든 후보가 들어 있으므로 다시 계산할 필요가 없다
+        if keep.sum() < k and rows[-1] >= 0:
+            data = self._data() if self._data is not None else None
+            if data is not None:
+                engine = similarity_engine(data) if profile == "계" else SimilarityEngine(_profile_matrix(data, profile))
+                return engine.top_k(row, k=k, exclude=exclude)
+        return rows[keep][:k].astype(np.intp), scores[keep][:k]
+
+    def most_similar(self, row, profile="계"):
+        rows, scores = self.lookup(row, k=1, profile=profile)
+        if len(rows) == 0:
+            return None, np.inf
+        return int(rows[0]), float(scores[0])
+
+
+def build_neighbor_index(data, k=DEFAULT_K, block_size=512):
+    """남녀 합계와 성별 벡터 각각에 대해 전체 지역 이웃 표를 만든다"""
+    profiles = ("계",) + tuple(sex for sex in data.sexes if sex != "계")
+    n = len(data)
+    rows = np.full((len(profiles), n, k), -1, dtype=np.int32)
+    scores = np.full((len(profiles), n, k), np.inf)
+    for p, profile in enumerate(profiles):
+        engine = SimilarityEngine(_profile_matrix(data, profile))
+        for start in range(0, n, block_size):
+            block = np.arange(start, min(start + block_size, n))
+            rows[p, block], scores[p, block] = _block_top_k(engine, block, k)
+    return NeighborIndex(profiles, rows, scores, data)
+
+
+def _index_path(data, k):
+    # 같은 CSV라도 지역 부분집합(동만 등)이 다르면 별도 인덱스
+    subset = hashlib.sha1(data.codes.tobytes()).hexdigest()[:12]
+    name = f"neighbors-{data.digest[:16]}-{subset}-k{k}-v{INDEX_VERSION}"
+    return os.path.join(cache_dir(data.source), name)
+
+
+def _read_index(path, data):
+    # 읽기 전용 memmap — 여러 서버 프로세스가 같은 표를 공유한다
+    arrays, meta = load_arrays(path, ("rows", "scores"))
+    return NeighborIndex(meta["profiles"], arrays["rows"], arrays["scores"], data)
+
+
+_lock = threading.Lock()
+_indexes = weakref.WeakKeyDictionary()
+
+
+def neighbor_index(data, k=DEFAULT_K):
+    """데이터 옆 캐시에 저장된 이웃 인덱스를 읽고, 없거나 CSV가 바뀌었으면 새로 만든다"""
+    index = _indexes.get(data)
+    count("neighbor_index", index is not None)
+    if index is not None:
+        return index
+
+    with _lock:
+        index = _indexes.get(data)
+        if index is not None:
+            return index
+
+        path = _index_path(data, k) if data.source else None
+        if path and os.path.isdir(path):
+            try:
+                index = _read_index(path, data)
+            except (OSError, ValueError, KeyError):
+                shutil.rmtree(path, ignore_errors=True)  # 깨진 인덱스는 다시 만든다
+
+        if index is None:
+            index = build_neighbor_index(data, k=k)
+            if path:
+                save_arrays_atomic(path, meta={"profiles": list(index.profiles)}, rows=index.rows, scores=index.scores)
+                index = _read_index(path, data)
+        _indexes[data] = index
+    return index
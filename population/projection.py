@@ -0,0 +1,185 @@
+import hashlib
+import threading
+import weakref
+from dataclasses import dataclass
+from functools import cached_property
+
+import numpy as np
+
+from population.bands import band_ratios
+from population.loader import age_years
+from utils.trace import count
+
+# 기본 전망 기간 (년)
+DEFAULT_YEARS = 20
+# 합계출산율 (여성 1명이 평생 낳는 아이 수, 2024년 수준)
+DEFAULT_TFR = 0.75
+# 출생 성비 (여아 100명당 남아)
+DEFAULT_SEX_RATIO = 105.0
+# 연령별 출산율 분포: 가임 연령 구간과 평균·표준편차 (30대 초반에 몰림)
+FERTILE_AGES = (15, 50)
+_FERTILITY_PEAK = 33.0
+_FERTILITY_SPREAD = 4.5
+# 연간 사망 위험 μ(x) = a + b·e^(c·x) (곰퍼츠-메이컴) — 기대수명 남 80세·여 86세 안팎
+_MORTALITY_BASE = 0.0003
+_MORTALITY_GROWTH = 0.1
+_MORTALITY_LEVEL = {"남": 1.65e-5, "여": 0.85e-5, "계": 1.2e-5}
+_INFANT_MORTALITY = 0.002
+# 지역 수 × 설정마다 전망 행렬을 들고 있으므로 데이터별로 최근 몇 개만 둔다
+_MAX_CACHED = 4
+
+
+@dataclass(frozen=True, eq=False)
+class ProjectionRates:
+    """코호트 요인법 가정: 연령·성별 1년 생존율과 연령별 출산율"""
+
+    survival: np.ndarray   # (A, S) x세 인구가 1년 뒤 x+1세로 살아남을 비율 (마지막 행은 최고 연령 구간에 머무는 비율)
+    fertility: np.ndarray  # (A,) x세 여성 1명이 1년에 낳는 아이 수
+    sex_ratio: float = DEFAULT_SEX_RATIO
+
+    @cached_property
+    def key(self):
+        """전망 캐시 키 — 가정 값이 같으면 같은 키"""
+        digest = hashlib.sha1()
+        for array in (self.survival, self.fertility):
+            digest.update(np.ascontiguousarray(array, dtype=np.float64).tobytes())
+        digest.update(repr(float(self.sex_ratio)).encode())
+        return digest.hexdigest()[:16]
+
+    @property
+    def tfr(self):
+        return float(self.fertility.sum())
+
+
+def projection_rates(age_years, sexes=("남", "여"), tfr=DEFAULT_TFR, mortality_scale=1.0,
+                     sex_ratio=DEFAULT_SEX_RATIO):
+    """기본 가정으로 만든 ProjectionRates.
+
+    tfr은 합계출산율, mortality_scale은 연령별 사망 위험에 곱할 배수(1보다 작으면 수명이 늘어난다)다.
+    """
+    ages = np.asarray(age_years, dtype=np.float64)
+    hazards = [
+        _MORTALITY_BASE + _MORTALITY_LEVEL[sex] * np.exp(_MORTALITY_GROWTH * ages)
+        for sex in sexes
+    ]
+    hazard = np.stack(hazards, axis=1)
+    hazard[ages == 0] += _INFANT_MORTALITY
+    survival = np.exp(-hazard * mortality_scale)
+
+    start, end = FERTILE_AGES
+    shape = np.exp(-0.5 * ((ages - _FERTILITY_PEAK) / _FERTILITY_SPREAD) ** 2)
+    shape[(ages < start) | (ages >= end)] = 0.0
+    fertility = shape / shape.sum() * tfr if shape.sum() else shape
+    return ProjectionRates(survival=survival, fertility=fertility, sex_ratio=float(sex_ratio))
+
+
+@dataclass(frozen=True, eq=False)
+class Projection:
+    """모든 지역의 연도별 연령 × 성별 전망 인구 (이동 없는 닫힌 인구 가정)"""
+
+    codes: np.ndarray   # (R,) 행정코드
+    ages: tuple
+    sexes: tuple
+    years: np.ndarray   # (Y+1,) 연도 (0번째가 기준 시점)
+    counts: np.ndarray  # (Y+1, R, A, S) float32
+    rates: ProjectionRates
+
+    def __len__(self):
+        return len(self.years)
+
+    @cached_property
+    def key(self):
+        return f"{self.rates.key}-{len(self.years) - 1}"
+
+    @cached_property
+    def totals(self):
+        """남녀 합계 (Y+1, R, A)"""
+        totals = self.counts[..., 0].copy()
+        for s in range(1, len(self.sexes)):
+            totals += self.counts[..., s]  # 길이 2인 마지막 축 sum보다 훨씬 빠르다
+        return totals
+
+    @cached_property
+    def band_ratios(self):
+        """연도 × 지역 × 연령대 비중(%) (Y+1, R, B) — 행렬곱 한 번"""
+        n_years, n_regions, n_ages = self.totals.shape
+        ratios = band_ratios(self.totals.reshape(-1, n_ages), age_years(self.ages))
+        return ratios.reshape(n_years, n_regions, -1)
+
+    def year_index(self, year):
+        return int(np.searchsorted(self.years, year))
+
+    def region(self, row):
+        """지역 하나의 연도별 (Y+1, A, S) 인구"""
+        return self.counts[:, row]
+
+
+def _female_exposure(counts, sexes):
+    """출산을 계산할 여성 인구 — 합계 파일이면 절반을 여성으로 본다"""
+    if "여" in sexes:
+        return counts[..., sexes.index("여")]
+    return counts.sum(axis=-1) * 0.5
+
+
+def project(data, years=DEFAULT_YEARS, rates=None):
+    """지역 × 연령 × 성별 인구 행렬 전체를 years년 뒤까지 한 해씩 굴린다.
+
+    해마다 모든 지역을 한꺼번에 한 살씩 올려 생존율을 곱하고(최고 연령 구간은 남은 사람이 쌓인다),
+    연초·연말 가임 여성 평균에 출산율을 곱한 출생아를 출생 성비로 나눠 0세에 넣는다.
+    지역 간 이동은 넣지 않는다.
+    """
+    rates = rates or projection_rates(age_years(data.ages), data.sexes)
+    survival = rates.survival.astype(np.float32)
+    fertility = rates.fertility.astype(np.float32)
+    if "남" in data.sexes and "여" in data.sexes:
+        birth_shares = np.zeros(len(data.sexes), dtype=np.float32)
+        birth_shares[data.sexes.index("남")] = rates.sex_ratio / (rates.sex_ratio + 100)
+        birth_shares[data.sexes.index("여")] = 100 / (rates.sex_ratio + 100)
+    else:
+        birth_shares = np.ones(len(data.sexes), dtype=np.float32)
+
+    n_regions, n_ages, n_sexes = data.counts.shape
+    counts = np.empty((years + 1, n_regions, n_ages, n_sexes), dtype=np.float32)
+    counts[0] = data.counts
+    for year in range(years):
+        current, following = counts[year], counts[year + 1]
+        following[:, 1:] = current[:, :-1] * survival[:-1]
+        following[:, -1] += current[:, -1] * survival[-1]
+        exposure = 0.5 * (_female_exposure(current, data.sexes) + _female_exposure(following, data.sexes))
+        births = exposure[:, 1:] @ fertility[1:]  # 0세 칸은 아직 비어 있다 (0세 출산율은 0)
+        following[:, 0] = births[:, None] * birth_shares * survival[0]
+
+    start = int(data.month[:4]) if data.month else 0
+    return Projection(
+        codes=data.codes,
+        ages=data.ages,
+        sexes=data.sexes,
+        years=np.arange(start, start + years + 1),
+        counts=counts,
+        rates=rates,
+    )
+
+
+_lock = threading.Lock()
+_projections = weakref.WeakKeyDictionary()
+
+
+def population_projection(data, years=DEFAULT_YEARS, tfr=DEFAULT_TFR, mortality_scale=1.0, sex_ratio=DEFAULT_SEX_RATIO):
+    """데이터·가정별로 한 번만 계산하는 전망 (가정마다 최근 몇 개만 메모리에 둔다)"""
+    rates = projection_rates(age_years(data.ages), data.sexes, tfr, mortality_scale, sex_ratio)
+    key = (rates.key, years)
+    cached = _projections.get(data)
+    result = cached.get(key) if cached is not None else None
+    count("projection", result is not None)
+    if result is not None:
+        return result
+
+    with _lock:
+        cached = _projections.setdefault(data, {})
+        result = cached.get(key)
+        if result is None:
+            result = project(data, years, rates)
+            cached[key] = result
+            while len(cached) > _MAX_CACHED:
+                del cached[next(iter(cached))]
+    return result
@@ -0,0 +1,131 @@
+import threading
+import weakref
+
+import numpy as np
+
+# 10자리 행정코드: 시도(2) + 시군구(3) + 읍면동(3) + 리(2)
+LEVELS = ("시도", "시군구", "읍면동")
+_PREFIX_LENGTHS = {"시도": 2, "시군구": 5, "읍면동": 8}
+
+
+def region_level(code):
+    if code[2:] == "00000000":
+        return "시도"
+    if code[5:] == "00000":
+        return "시군구"
+    return "읍면동"
+
+
+def parent_code(code):
+    """한 단계 위 행정코드 (시도는 None)"""
+    level = region_level(code)
+    if level == "시도":
+        return None
+    if level == "시군구":
+        return code[:2] + "00000000"
+    return code[:5] + "00000"
+
+
+class RegionRegistry:
+    """행정코드로 지역을 찾는 레지스트리.
+
+    코드 → 행 번호는 dict, 단계별 하위 지역 목록은 미리 만들어 두고,
+    임의 길이의 코드 접두사 조회는 정렬된 코드 배열의 이진 탐색으로 처리한다.
+    어느 조회도 전체 표를 훑지 않는다.
+    """
+
+    def __init__(self, codes, names):
+        self.codes = np.asarray(codes)
+        self.names = np.asarray(names)
+        self.row_of = {code: row for row, code in enumerate(self.codes.tolist())}
+        self.levels = np.array([region_level(code) for code in self.codes.tolist()])
+
+        # 일반구를 둔 시(수원시 41110 → 장안구 41111 ...)는 하위 지역이 4자리 접두사를 공유한다.
+        # 영동군(43740)/증평군(43745)처럼 코드만 겹치는 경우는 이름으로 걸러낸다.
+        sigungu = [code for code, level in zip(self.codes.tolist(), self.levels) if level == "시군구"]
+        self._prefixes = {}
+        for code in sigungu:
+            if code[4] != "0":
+                continue
+            city_name = self.name(code) + " "
+            if any(
+                other[:4] == code[:4] and other != code and self.name(other).startswith(city_name)
+                for other in sigungu
+            ):
+                self._prefixes[code] = code[:4]
+
+        # 접두사 조회용 정렬 인덱스
+        self._order = np.argsort(self.codes, kind="stable")
+        self._sorted_codes = self.codes[self._order]
+
+        # 상위 코드 → 하위 코드 목록 (시도 목록은 None 키)
+        self._children = {}
+        for code in self.codes.tolist():
+            parent = parent_code(code)
+            if parent is not None and parent not in self.row_of:
+                parent = code[:2] + "00000000" if code[:2] + "00000000" in self.row_of else None
+            self._children.setdefault(parent, []).append(code)
+
+    def __len__(self):
+        return len(self.codes)
+
+    def __contains__(self, code):
+        return code in self.row_of
+
+    def row(self, code):
+        return self.row_of[code]
+
+    def name(self, code):
+        return str(self.names[self.row_of[code]])
+
+    def level(self, code):
+        return str(self.levels[self.row_of[code]])
+
+    def prefix(self, code):
+        """code 아래 지역들이 공유하는 코드 접두사"""
+        return self._prefixes.get(code) or code[:_PREFIX_LENGTHS[region_level(code)]]
+
+    def short_name(self, code):
+        """상위 지역 이름을 뗀 표시용 이름 ("서울특별시 종로구 사직동" → "사직동")"""
+        name = self.name(code)
+        parent = parent_code(code)
+        if parent in self.row_of:
+            parent_name = self.name(parent)
+            if name.startswith(parent_name + " "):
+                return name[len(parent_name) + 1:]
+        return name
+
+    def children(self, code=None):
+        """바로 아래 단계 지역 코드 목록 (code가 None이면 시도 목록)"""
+        return self._children.get(code, [])
+
+    def with_prefix(self, prefix):
+        """코드가 prefix로 시작하는 모든 지역의 행 번호 (코드 순)"""
+        lo = np.searchsorted(self._sorted_codes, prefix, side="left")
+        upper = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+        hi = np.searchsorted(self._sorted_codes, upper, side="left")
+        return self._order[lo:hi]
+
+    def descendants(self, code, level=None):
+        """code 아래 모든 지역의 행 번호 (level을 주면 그 단계만)"""
+        rows = self.with_prefix(self.prefix(code))
+        rows = rows[self.codes[rows] != code]
+        if level is not None:
+            rows = rows[self.levels[rows] == level]
+        return rows
+
+
+_lock = threading.Lock()
+_registries = weakref.WeakKeyDictionary()
+
+
+def region_registry(data):
+    """PopulationData별로 한 번만 만드는 RegionRegistry"""
+    registry = _registries.get(data)
+    if registry is None:
+        with _lock:
+            registry = _registries.get(data)
+            if registry is None:
+                registry = RegionRegistry(data.codes, data.names)
+                _registries[data] = registry
+    return registry
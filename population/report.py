@@ -0,0 +1,214 @@
+import argparse
+import multiprocessing
+import os
+import threading
+import time
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from population.bands import BANDS, band_table
+from population.insights import region_insights, region_ratios, similar_summary, similar_traits, summary_lines
+from population.loader import load_population
+from population.neighbors import neighbor_index
+from population.rollup import rollups
+from utils.cache import cache_dir, file_signature, save_json_atomic
+from utils.trace import count
+
+# 보고서 형식이 바뀌면 올려서 이전 보고서를 무효화한다
+REPORT_VERSION = 2
+# 분석 페이지들의 단위 ("동"은 이름이 '동'으로 끝나는 읍면동)
+REPORT_LEVELS = ("동", "읍면동", "시군구", "시도")
+# 지역마다 담아 두는 유사 지역 수
+DEFAULT_TOP_K = 10
+FORMATS = ("json", "parquet")
+# 작업 프로세스 하나가 한 번에 맡는 지역 수
+_CHUNK_SIZE = 256
+
+
+def level_regions(population, level):
+    """분석 단위별 지역 표 (페이지와 같은 기준)"""
+    return population.dongs if level == "동" else rollups(population)[level]
+
+
+def _build_shared(regions, k):
+    bands = band_table(regions)
+    neighbors = neighbor_index(regions)
+    return {
+        "codes": regions.codes.tolist(),
+        "names": regions.names.tolist(),
+        "totals": bands["총인구"].to_numpy(),
+        "categories": bands["유형"].tolist(),
+        "ratios": bands[list(BANDS)].to_numpy(),
+        "rows": np.asarray(neighbors.rows[0, :, :k]),  # "계" 프로필
+        "scores": np.asarray(neighbors.scores[0, :, :k]),
+    }
+
+
+_shared_lock = threading.Lock()
+_shared_cache = weakref.WeakKeyDictionary()
+
+
+def _shared_arrays(regions, k):
+    """모든 작업 프로세스가 읽기만 하는 배열들 (fork로 복사 없이 물려받는다)"""
+    with _shared_lock:
+        shared = _shared_cache.setdefault(regions, {}).get(k)
+        if shared is None:
+            shared = _shared_cache[regions][k] = _build_shared(regions, k)
+    return shared
+
+
+_shared = None
+
+
+def _init_worker(shared):
+    global _shared
+    _shared = shared
+
+
+def _record(shared, row):
+    """지역 하나의 보고서 (분석 페이지의 각 항목과 같은 계산)"""
+    ratios = dict(zip(BANDS, shared["ratios"][row].tolist()))
+    rounded = region_ratios(ratios)
+    keep = shared["rows"][row] >= 0
+    similar = shared["rows"][row][keep].tolist()
+    scores = shared["scores"][row][keep].tolist()
+
+    record = {
+        "코드": shared["codes"][row],
+        "지역명": shared["names"][row],
+        "총인구": int(shared["totals"][row]),
+        **rounded,
+        "유형": shared["categories"][row],
+        "insights": region_insights(rounded),
+        "summary": "\n\n".join(summary_lines(rounded)),
+        "similar_codes": [shared["codes"][other] for other in similar],
+        "similar_scores": [round(score, 6) for score in scores],
+        "best_code": None,
+        "best_name": None,
+        "best_score": None,
+        "similar_traits": [],
+        "similar_summary": None,
+    }
+    if similar:
+        best = similar[0]
+        best_ratios = region_ratios(dict(zip(BANDS, shared["ratios"][best].tolist())), digits=1)
+        traits = similar_traits(region_ratios(ratios, digits=1), best_ratios)
+        record.update(
+            best_code=shared["codes"][best],
+            best_name=shared["names"][best],
+            best_score=round(scores[0], 6),
+            similar_traits=traits,
+            similar_summary=similar_summary(shared["names"][row], shared["names"][best], traits),
+        )
+    return record
+
+
+def _records(rows):
+    return [_record(_shared, row) for row in range(*rows)]
+
+
+def build_reports(regions, k=DEFAULT_TOP_K, workers=None):
+    """regions의 모든 지역 보고서 목록.
+
+    비율표와 이웃 표는 부모 프로세스에서 한 번 준비하고, 문장 생성만 지역 묶음으로
+    나눠 작업 프로세스들에 맡긴다. workers=1이면 현재 프로세스에서 바로 만든다.
+    """
+    shared = _shared_arrays(regions, k)
+    n = len(regions)
+    chunks = [(start, min(start + _CHUNK_SIZE, n)) for start in range(0, n, _CHUNK_SIZE)]
+    workers = min(workers or os.cpu_count() or 1, len(chunks))
+    if workers <= 1:
+        return [_record(shared, row) for row in range(n)]
+
+    # fork면 공유 배열을 피클하지 않고 그대로 물려받는다
+    methods = multiprocessing.get_all_start_methods()
+    context = multiprocessing.get_context("fork" if "fork" in methods else None)
+    with ProcessPoolExecutor(workers, mp_context=context, initializer=_init_worker, initargs=(shared,)) as pool:
+        return [record for records in pool.map(_records, chunks) for record in records]
+
+
+def report_path(population, level, fmt="json"):
+    """인구 CSV 옆 캐시 폴더의 단위별 보고서 파일 경로"""
+    name = f"report-{population.digest[:16]}-v{REPORT_VERSION}-{level}.{fmt}"
+    return os.path.join(cache_dir(population.source), name)
+
+
+def write_reports(records, path):
+    """보고서를 확장자에 맞는 형식(.json / .parquet)으로 원자적으로 쓴다"""
+    if path.endswith(".parquet"):
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            pd.DataFrame.from_records(records).to_parquet(tmp_path, index=False)
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+    else:
+        save_json_atomic(path, records, compact=True)
+
+
+_lock = threading.Lock()
+_loaded = {}
+
+
+def load_reports(path):
+    """미리 만든 보고서를 행정코드 인덱스 DataFrame으로 읽는다 (없으면 None, 파일이 바뀌면 다시 읽음)"""
+    if not os.path.exists(path):
+        return None
+    signature = file_signature(path)
+    with _lock:
+        table = _loaded.get(signature)
+        if table is None:
+            if path.endswith(".parquet"):
+                table = pd.read_parquet(path)
+            else:
+                table = pd.read_json(path, orient="records", dtype={"코드": str, "best_code": str}, precise_float=True)
+            table = table.set_index("코드")
+            for key in [key for key in _loaded if key[0] == signature[0]]:
+                del _loaded[key]
+            _loaded[signature] = table
+    return table
+
+
+def region_report(regions, level, code, k=DEFAULT_TOP_K):
+    """지역 하나의 보고서. 미리 만든 보고서가 있으면 그 줄을, 없으면 바로 계산한다"""
+    if regions.source:
+        for fmt in FORMATS:
+            table = load_reports(report_path(regions, level, fmt))
+            if table is not None and code in table.index:
+                count("report", True)
+                return {"코드": code, **table.loc[code].to_dict()}
+    count("report", False)
+    return _record(_shared_arrays(regions, k), regions.code_index[code])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="모든 지역의 인구 구조 분석 보고서를 미리 만들어 둡니다.")
+    parser.add_argument("csv", help="연령별인구현황 CSV (남녀구분)")
+    parser.add_argument("--levels", nargs="+", choices=REPORT_LEVELS, default=list(REPORT_LEVELS), help="만들 분석 단위")
+    parser.add_argument("--format", choices=FORMATS, default="json", help="저장 형식 (parquet은 pyarrow 필요)")
+    parser.add_argument("--out", help="저장 폴더 (기본: CSV 옆 캐시 폴더 — 페이지가 바로 읽는 위치)")
+    parser.add_argument("--top-k", type=int, default=DEFAULT_TOP_K, help="지역마다 담을 유사 지역 수")
+    parser.add_argument("--workers", type=int, help="작업 프로세스 수 (기본: CPU 개수)")
+    args = parser.parse_args(argv)
+
+    population = load_population(args.csv)
+    for level in args.levels:
+        start = time.perf_counter()
+        records = build_reports(level_regions(population, level), k=args.top_k, workers=args.workers)
+        path = report_path(population, level, args.format)
+        if args.out:
+            os.makedirs(args.out, exist_ok=True)
+            path = os.path.join(args.out, os.path.basename(path))
+        try:
+            write_reports(records, path)
+        except ImportError as e:
+            parser.error(f"{args.format} 형식으로 저장할 수 없습니다: {e}")
+        print(f"{level}: {len(records):,}곳 → {path} ({time.perf_counter() - start:.2f}초)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+import os
+import shutil
+import threading
+import weakref
+
+import numpy as np
+
+from population.loader import PopulationData
+from population.regions import LEVELS, region_registry
+from utils.cache import cache_dir, load_arrays, save_arrays_atomic
+from utils.trace import count
+
+# 집계 형식이 바뀌면 올려서 디스크의 이전 집계를 무효화한다
+ROLLUP_VERSION = 2
+
+
+def _group_sum(counts, keys):
+    """같은 키끼리 행을 더한다 (정렬 후 reduceat 한 번)"""
+    order = np.argsort(keys, kind="stable")
+    unique_keys, starts = np.unique(keys[order], return_index=True)
+    return unique_keys, np.add.reduceat(counts[order], starts, axis=0)
+
+
+def build_rollups(data):
+    """읍면동 행을 코드 접두사로 묶어 단계별 연령 × 성별 표를 만든다.
+
+    시군구 단계에는 CSV와 같이 일반구(장안구 등)와 그 상위 시(수원시)가 모두 들어간다.
+    """
+    registry = region_registry(data)
+    leaf_rows = np.flatnonzero(registry.levels == "읍면동")
+    leaf_codes = data.codes[leaf_rows]
+    leaf_counts = data.counts[leaf_rows].astype(np.int64)
+
+    city_prefixes = np.array(sorted({
+        registry.prefix(code)
+        for code in data.codes[registry.levels == "시군구"].tolist()
+        if len(registry.prefix(code)) == 4
+    }), dtype="U4")
+
+    groupings = {
+        "시도": [(2, leaf_codes.astype("U2"))],
+        "시군구": [(5, leaf_codes.astype("U5"))],
+    }
+    in_city = np.isin(leaf_codes.astype("U4"), city_prefixes)
+    if in_city.any():
+        groupings["시군구"].append((4, np.where(in_city, leaf_codes.astype("U4"), "")))
+
+    tables = {"읍면동": data.take(leaf_rows)}
+    for level, keyings in groupings.items():
+        codes, counts = [], []
+        for width, keys in keyings:
+            prefixes, sums = _group_sum(leaf_counts, keys)
+            keep = prefixes != ""
+            codes.append(np.char.ljust(prefixes[keep], 10, "0"))
+            counts.append(sums[keep])
+        codes = np.concatenate(codes)
+        counts = np.concatenate(counts)
+        order = np.argsort(codes, kind="stable")
+        codes = codes[order].astype("U10")
+        tables[level] = PopulationData(
+            codes=codes,
+            names=np.array([
+                registry.name(code) if code in registry else code for code in codes.tolist()
+            ]),
+            ages=data.ages,
+            sexes=data.sexes,
+            counts=counts[order].astype(np.int32),
+            month=data.month,
+            digest=data.digest,
+            source=data.source,
+        )
+    return {level: tables[level] for level in LEVELS}
+
+
+def _rollup_path(data):
+    name = f"rollups-{data.digest[:16]}-v{ROLLUP_VERSION}"
+    return os.path.join(cache_dir(data.source), name)
+
+
+def _read_rollups(path, data):
+    # 단계 이름 대신 순번으로 파일 이름을 짓는다 (level0_codes.npy ...)
+    names = [f"level{i}_{field}" for i in range(len(LEVELS)) for field in ("codes", "names", "counts")]
+    arrays, _ = load_arrays(path, names)
+    tables = {}
+    for i, level in enumerate(LEVELS):
+        tables[level] = PopulationData(
+            codes=arrays[f"level{i}_codes"],
+            names=arrays[f"level{i}_names"],
+            ages=data.ages,
+            sexes=data.sexes,
+            counts=arrays[f"level{i}_counts"],
+            month=data.month,
+            digest=data.digest,
+            source=data.source,
+        )
+    return tables
+
+
+def _write_rollups(path, tables):
+    arrays = {}
+    for i, level in enumerate(LEVELS):
+        arrays[f"level{i}_codes"] = tables[level].codes
+        arrays[f"level{i}_names"] = tables[level].names
+        arrays[f"level{i}_counts"] = tables[level].counts
+    save_arrays_atomic(path, meta={"levels": list(LEVELS)}, **arrays)
+
+
+_lock = threading.Lock()
+_rollups = weakref.WeakKeyDictionary()
+
+
+def rollups(data):
+    """단계별 집계 표 {"시도": ..., "시군구": ..., "읍면동": ...}.
+
+    인구 캐시 옆에 저장해 두고 CSV가 바뀔 때만 다시 만든다. 읽을 때는 memmap이라
+    여러 서버 프로세스가 같은 표를 공유한다.
+    """
+    tables = _rollups.get(data)
+    count("rollups", tables is not None)
+    if tables is not None:
+        return tables
+
+    with _lock:
+        tables = _rollups.get(data)
+        if tables is not None:
+            return tables
+
+        path = _rollup_path(data) if data.source else None
+        if path and os.path.isdir(path):
+            try:
+                tables = _read_rollups(path, data)
+            except (OSError, ValueError, KeyError):
+                shutil.rmtree(path, ignore_errors=True)  # 깨진 집계는 다시 만든다
+
+        if tables is None:
+            tables = build_rollups(data)
+            if path:
+                _write_rollups(path, tables)
+                tables = _read_rollups(path, data)
+        _rollups[data] = tables
+    return tables
@@ -0,0 +1,254 @@
+import threading
+import weakref
+
+import numpy as np
+
+from population.bands import BANDS, band_mask
+from utils.trace import count
+
+
+def hybrid_distance(vec1, vec2):
+    """혼합 거리: 연령 비율 벡터의 L2 거리 + 총인구 규모 차이 (vec1 기준)"""
+    vec1 = np.array(vec1)
+    vec2 = np.array(vec2)
+    ratio_dist = np.linalg.norm((vec1 / vec1.sum()) - (vec2 / vec2.sum()))
+    scale_dist = abs(vec1.sum() - vec2.sum()) / vec1.sum()
+    return ratio_dist + scale_dist
+
+
+class SimilarityEngine:
+    """전체 지역에 대한 hybrid_distance를 한 번의 브로드캐스팅으로 계산한다.
+
+    연령별 비율 행렬과 총인구를 미리 만들어 두고, 질의마다
+    (R, A) 차이 행렬 하나만 계산한다. 인구가 0인 지역은 후보에서 빠진다.
+    """
+
+    def __init__(self, totals):
+        self.totals = np.asarray(totals)
+        self.sums = self.totals.sum(axis=1).astype(np.float64)
+        self.valid = self.sums > 0
+        safe_sums = np.where(self.valid, self.sums, 1.0)
+        self.shares = self.totals / safe_sums[:, None]
+
+    def __len__(self):
+        return len(self.totals)
+
+    def _query_vector(self, query):
+        if np.isscalar(query):
+            return self.totals[int(query)]
+        return np.asarray(query)
+
+    def scores(self, query):
+        """질의(행 번호 또는 연령별 인구 벡터)와 모든 지역 사이의 hybrid_distance (R,)"""
+        vector = self._query_vector(query)
+        total = vector.sum()
+        diff = self.shares - vector / total
+        ratio_dist = np.sqrt(np.einsum("ij,ij->i", diff, diff))
+        scale_dist = np.abs(total - self.sums) / total
+        scores = ratio_dist + scale_dist
+        scores[~self.valid] = np.inf
+        return scores
+
+    def top_k(self, query, k=10, exclude=None):
+        """가장 가까운 k개 지역의 (행 번호, 점수). 점수가 같으면 앞쪽 행이 먼저 온다.
+
+        질의가 행 번호이면 자기 자신은 자동으로 제외되고,
+        exclude로 추가로 뺄 행(예: 같은 이름의 지역)을 넘길 수 있다.
+        """
+        scores = self.scores(query)
+        if np.isscalar(query):
+            scores[int(query)] = np.inf
+        if exclude is not None:
+            scores[np.asarray(exclude, dtype=np.intp)] = np.inf
+
+        candidates = np.flatnonzero(np.isfinite(scores))
+        k = min(k, len(candidates))
+        if k == 0:
+            return np.empty(0, dtype=np.intp), np.empty(0)
+        if k < len(candidates):
+            kth = np.partition(scores[candidates], k - 1)[k - 1]
+            candidates = candidates[scores[candidates] <= kth]
+        order = np.lexsort((candidates, scores[candidates]))[:k]
+        rows = candidates[order]
+        return rows, scores[rows]
+
+
+_lock = threading.Lock()
+_engines = weakref.WeakKeyDictionary()
+
+
+def similarity_engine(data):
+    """PopulationData별로 한 번만 만드는 남녀 합계 기준 SimilarityEngine"""
+    engine = _engines.get(data)
+    count("similarity_engine", engine is not None)
+    if engine is None:
+        with _lock:
+            engine = _engines.get(data)
+            if engine is None:
+                engine = SimilarityEngine(data.total)
+                _engines[data] = engine
+    return engine
+
+
+# 유사도 척도 — 모두 "작을수록 비슷한" 거리다
+METRICS = ("hybrid", "cosine", "jensen_shannon", "emd")
+METRIC_LABELS = {
+    "hybrid": "혼합 (연령 비율 + 인구 규모)",
+    "cosine": "코사인 (연령 분포 모양)",
+    "jensen_shannon": "젠슨-섀넌 (분포 정보량 차이)",
+    "emd": "연령 이동 거리 (EMD, 나이 축 기준)",
+}
+# 성별 가중치 프리셋 — "계"는 남녀 합계 벡터
+SEX_WEIGHTS = {
+    "남녀 합계": {"계": 1.0},
+    "남녀 따로": {"남": 0.5, "여": 0.5},
+}
+# 여러 질의를 한 번에 계산할 때 (질의 × 지역 × 연령) 임시 배열 크기 상한
+_BLOCK_ELEMENTS = 4_000_000
+
+
+class _Profile:
+    """한 성별 프로필(연령 구간을 고른 뒤)의 비율·누적 분포·엔트로피를 미리 계산해 둔다"""
+
+    def __init__(self, counts, age_years):
+        counts = np.asarray(counts, dtype=np.float64)
+        self.sums = counts.sum(axis=1)
+        self.valid = self.sums > 0
+        self.shares = counts / np.where(self.valid, self.sums, 1.0)[:, None]
+        self.sq_norms = np.einsum("ij,ij->i", self.shares, self.shares)
+        self.unit = self.shares / np.sqrt(np.where(self.valid, self.sq_norms, 1.0))[:, None]
+        self.cdf = np.cumsum(self.shares, axis=1)
+        # 나이 칸 사이 간격 (연령대를 건너뛰어 골라도 EMD가 실제 나이 차로 계산되도록)
+        self.widths = np.diff(np.asarray(age_years, dtype=np.float64), append=age_years[-1] + 1)
+        self.entropy = -_xlog2(self.shares).sum(axis=1)
+
+
+def _xlog2(p):
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(p > 0, p * np.log2(np.where(p > 0, p, 1.0)), 0.0)
+
+
+def _hybrid(profile, rows):
+    # ||a - b||² = ||a||² + ||b||² - 2a·b 를 행렬곱 한 번으로
+    query = profile.shares[rows]
+    sq = profile.sq_norms[rows, None] + profile.sq_norms[None, :] - 2.0 * (query @ profile.shares.T)
+    sums = profile.sums[rows, None]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.sqrt(np.maximum(sq, 0.0)) + np.abs(sums - profile.sums[None, :]) / sums
+
+
+def _cosine(profile, rows):
+    return np.maximum(1.0 - profile.unit[rows] @ profile.unit.T, 0.0)
+
+
+def _jensen_shannon(profile, rows):
+    # JS = H((P+Q)/2) - (H(P) + H(Q))/2, 밑 2라서 0~1. 제곱근을 씌워 거리로 쓴다.
+    mixed = 0.5 * (profile.shares[rows][:, None, :] + profile.shares[None, :, :])
+    divergence = -_xlog2(mixed).sum(axis=2) - 0.5 * (profile.entropy[rows, None] + profile.entropy[None, :])
+    return np.sqrt(np.maximum(divergence, 0.0))
+
+
+def _emd(profile, rows):
+    # 1차원 분포의 EMD = 누적 분포 차이의 절댓값 × 나이 간격의 합 (단위: 세)
+    diff = np.abs(profile.cdf[rows][:, None, :] - profile.cdf[None, :, :])
+    return diff @ profile.widths
+
+
+_METRIC_FUNCS = {"hybrid": _hybrid, "cosine": _cosine, "jensen_shannon": _jensen_shannon, "emd": _emd}
+# 질의마다 (지역 × 연령) 임시 배열을 만드는 척도 — 질의를 작은 묶음으로 나눠 계산한다
+_ELEMENTWISE = {"jensen_shannon", "emd"}
+
+
+class MetricEngine:
+    """척도·성별 가중치·연령대를 골라 전체 지역 거리를 한 번에 계산하는 유사도 엔진.
+
+    성별 프로필마다 거리를 구해 가중 평균한다. 연령대를 고르면 그 나이 칸만으로
+    비율을 다시 내서 비교한다. 인구가 0인 지역은 후보에서 빠진다.
+    """
+
+    def __init__(self, data, metric="hybrid", sex_weights=None, bands=None):
+        if metric not in _METRIC_FUNCS:
+            raise ValueError(f"알 수 없는 유사도 척도: {metric} ({', '.join(METRICS)} 중 하나)")
+        sex_weights = {sex: float(w) for sex, w in (sex_weights or {"계": 1.0}).items() if w > 0}
+        unknown = [sex for sex in sex_weights if sex != "계" and sex not in data.sexes]
+        if unknown or not sex_weights:
+            raise ValueError(f"성별 가중치를 쓸 수 없습니다: {sex_weights} (데이터 성별 {data.sexes})")
+        self.metric = metric
+        total_weight = sum(sex_weights.values())
+        self.sex_weights = {sex: w / total_weight for sex, w in sex_weights.items()}
+        self.bands = tuple(bands) if bands else BANDS
+
+        age_years = data.age_years
+        ages = band_mask(age_years)[:, [BANDS.index(band) for band in self.bands]].any(axis=1)
+        self.profiles = {
+            sex: _Profile((data.total if sex == "계" else data.sex(sex))[:, ages], age_years[ages])
+            for sex in self.sex_weights
+        }
+        self.valid = np.logical_and.reduce([profile.valid for profile in self.profiles.values()])
+
+    def __len__(self):
+        return len(self.valid)
+
+    def distances(self, rows):
+        """질의 행들과 모든 지역 사이 거리 (Q, R) — 인구가 없는 쪽은 inf"""
+        rows = np.atleast_1d(np.asarray(rows, dtype=np.intp))
+        func = _METRIC_FUNCS[self.metric]
+        n_ages = next(iter(self.profiles.values())).shares.shape[1]
+        step = len(rows)
+        if self.metric in _ELEMENTWISE:
+            step = max(1, _BLOCK_ELEMENTS // max(len(self) * n_ages, 1))
+        result = np.empty((len(rows), len(self)))
+        for start in range(0, len(rows), step):
+            block = rows[start:start + step]
+            result[start:start + step] = sum(
+                weight * func(self.profiles[sex], block) for sex, weight in self.sex_weights.items()
+            )
+        result[:, ~self.valid] = np.inf
+        result[~self.valid[rows]] = np.inf
+        return result
+
+    def top_k(self, row, k=10, exclude=None):
+        """row와 가장 가까운 k개 지역의 (행 번호, 거리). 거리가 같으면 앞쪽 행이 먼저 온다"""
+        rows, scores = self.top_k_many([row], k, exclude)
+        keep = rows[0] >= 0
+        return rows[0][keep].astype(np.intp), scores[0][keep]
+
+    def top_k_many(self, rows, k=10, exclude=None):
+        """여러 질의의 상위 k개 (Q, k) 행 번호·거리 — 빈 자리는 -1, inf. 자기 자신은 빠진다"""
+        rows = np.atleast_1d(np.asarray(rows, dtype=np.intp))
+        scores = self.distances(rows)
+        scores[np.arange(len(rows)), rows] = np.inf
+        if exclude is not None:
+            scores[:, np.asarray(exclude, dtype=np.intp)] = np.inf
+        k = min(k, len(self) - 1) if len(self) > 1 else 0
+        if k <= 0:
+            return np.empty((len(rows), 0), dtype=np.int32), np.empty((len(rows), 0))
+        candidates = np.argpartition(scores, k - 1, axis=1)[:, :k]
+        candidate_scores = np.take_along_axis(scores, candidates, axis=1)
+        order = np.lexsort((candidates, candidate_scores), axis=1)
+        top_rows = np.take_along_axis(candidates, order, axis=1).astype(np.int32)
+        top_scores = np.take_along_axis(candidate_scores, order, axis=1)
+        top_rows[~np.isfinite(top_scores)] = -1
+        return top_rows, top_scores
+
+
+_metric_engines = weakref.WeakKeyDictionary()
+# 데이터마다 남겨 둘 척도·설정 조합 수
+_MAX_METRIC_ENGINES = 8
+
+
+def metric_engine(data, metric="hybrid", sex_weights=None, bands=None):
+    """데이터·척도·설정별로 한 번만 만드는 MetricEngine (최근 조합 몇 개만 둔다)"""
+    key = (metric, tuple(sorted((sex_weights or {"계": 1.0}).items())), tuple(bands) if bands else BANDS)
+    engines = _metric_engines.get(data)
+    engine = engines.get(key) if engines is not None else None
+    count("metric_engine", engine is not None)
+    if engine is None:
+        with _lock:
+            engines = _metric_engines.setdefault(data, {})
+            engine = engines.get(key)
+            if engine is None:
+                engine = engines[key] = MetricEngine(data, metric, sex_weights, bands)
+                while len(engines) > _MAX_METRIC_ENGINES:
+                    del engines[next(iter(engines))]
+    return engine
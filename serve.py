@@ -0,0 +1,128 @@
+import argparse
+import importlib
+import os
+import sys
+import threading
+import time
+
+# 페이지들이 쓰는 기본 데이터 (페이지 코드의 파일 이름·종목과 같다)
+POPULATION_FILE = "202504_202504_연령별인구현황_월간_남녀구분.csv"
+TICKERS = ("AAPL", "MSFT", "2222.SR", "GOOGL", "AMZN", "NVDA", "BRK-B", "META", "TSM", "TSLA")
+# 페이지에서 고를 수 있는 분석 단위
+WARM_LEVELS = ("동", "읍면동", "시군구", "시도")
+APP_SCRIPT = "main.py"
+# 페이지가 필요할 때 불러오는 무거운 모듈 — 서버 프로세스에 미리 올려 둔다
+WARM_MODULES = ("pandas", "plotly.graph_objects", "plotly.io", "folium", "streamlit_folium")
+
+
+def _import_modules():
+    # 페이지가 처음 열릴 때 드는 import 시간을 미리 치른다
+    modules = {name: importlib.import_module(name) for name in WARM_MODULES}
+    go, pio = modules["plotly.graph_objects"], modules["plotly.io"]
+    pio.to_json(go.Figure(go.Bar(x=[0], y=[0])))  # 기본 템플릿과 검증기도 한 번 불러 둔다
+    return f"모듈 {len(modules)}개"
+
+
+def _warm_population(path):
+    from population import (
+        band_table,
+        demographic_clusters,
+        load_population,
+        neighbor_index,
+        population_projection,
+        rollups,
+        warm_figures,
+    )
+    from population.report import load_reports, report_path
+
+    if not os.path.exists(path):
+        return f"{path} 없음"
+    population = load_population(path)
+    tables = rollups(population)
+    for level in WARM_LEVELS:
+        regions = population.dongs if level == "동" else tables[level]
+        band_table(regions)
+        if level == "읍면동":
+            continue  # 유사 지역은 동·시군구·시도 화면에서만 쓴다
+        population_projection(regions)
+        demographic_clusters(regions)
+        neighbors = neighbor_index(regions)
+        warm_figures(regions, level, neighbors)
+        load_reports(report_path(regions, level))
+    return f"읍면동 {len(population.dongs):,}곳"
+
+
+def _warm_prices(symbols):
+    # 받아 둔 가격만 읽는다 (새로 받기는 페이지의 뒤 갱신이 맡는다)
+    from market import price_analytics, price_store, recent_range
+
+    store = price_store()
+    analytics = price_analytics(store, symbols, *recent_range(days=365))
+    return f"종목 {len(symbols)}개, {len(analytics.close):,}거래일"
+
+
+def _warm_boundaries():
+    from population import boundary_tiles
+
+    tiles = boundary_tiles()
+    return "경계 파일 없음" if tiles is None else "단계별 타일 준비"
+
+
+def _warm_bookmarks():
+    from bookmarks import bookmark_store
+
+    bookmark_store()
+    return "저장소 열림"
+
+
+def warm_up(population_file=POPULATION_FILE, symbols=TICKERS, log=print):
+    """첫 사용자가 오기 전에 무거운 모듈과 데이터 캐시를 이 프로세스에 올려 둔다.
+
+    단계마다 걸린 시간을 log로 남기고, 실패한 단계는 건너뛴다 (페이지가 열릴 때 다시 시도한다).
+    """
+    steps = [
+        ("modules", _import_modules),
+        ("population", lambda: _warm_population(population_file)),
+        ("prices", lambda: _warm_prices(symbols)),
+        ("boundaries", _warm_boundaries),
+        ("bookmarks", _warm_bookmarks),
+    ]
+    total = time.perf_counter()
+    for name, step in steps:
+        start = time.perf_counter()
+        try:
+            detail = step()
+        except Exception as e:  # 준비 단계 실패로 서버가 뜨지 않으면 안 된다
+            detail = f"실패: {type(e).__name__}: {e}"
+        if log:
+            log(f"[warm-up] {name:<11} {time.perf_counter() - start:7.2f}s  {detail or ''}")
+    if log:
+        log(f"[warm-up] 완료 {time.perf_counter() - total:.2f}s")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="캐시를 미리 데운 뒤 Streamlit 앱을 띄웁니다. 나머지 인자는 streamlit run에 그대로 넘깁니다.",
+    )
+    parser.add_argument("--warm-only", action="store_true", help="디스크 캐시만 만들고 끝낸다 (배포 단계용)")
+    parser.add_argument("--no-warm", action="store_true", help="미리 데우지 않고 바로 띄운다")
+    parser.add_argument("--population-file", default=POPULATION_FILE, help="미리 읽을 인구 CSV")
+    args, streamlit_args = parser.parse_known_args(argv)
+
+    if args.warm_only:
+        warm_up(args.population_file)
+        return
+
+    if not args.no_warm:
+        # 같은 프로세스에서 데워야 페이지가 그 캐시를 쓴다. 서버는 기다리지 않고 바로 뜬다.
+        threading.Thread(target=warm_up, args=(args.population_file,), name="warm-up", daemon=True).start()
+
+    from streamlit.web import cli as stcli
+
+    script = os.path.join(os.path.dirname(os.path.abspath(__file__)), APP_SCRIPT)
+    sys.argv = ["streamlit", "run", script, *streamlit_args]
+    sys.exit(stcli.main())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from population.loader import PopulationData
+from population.regions import RegionRegistry
+
+AGES = tuple(f"{age}세" for age in range(100)) + ("100세 이상",)
+
+
+# 시도 > 시군구(일반구를 둔 시 포함) > 읍면동 — CSV처럼 이름은 상위 지역 이름을 앞에 붙인다
+DISTRICTS = (
+    ("1100000000", "서울특별시"),
+    ("1111000000", "서울특별시 종로구"),
+    ("1111051500", "서울특별시 종로구 청운효자동"),
+    ("1111053000", "서울특별시 종로구 사직동"),
+    ("1114000000", "서울특별시 중구"),
+    ("1114052000", "서울특별시 중구 소공동"),
+    ("1114054000", "서울특별시 중구 회현동"),
+    ("4100000000", "경기도"),
+    ("4111000000", "경기도 수원시"),
+    ("4111100000", "경기도 수원시 장안구"),
+    ("4111112900", "경기도 수원시 장안구 파장동"),
+    ("4111113100", "경기도 수원시 장안구 율천동"),
+    ("4111300000", "경기도 수원시 팔달구"),
+    ("4111358000", "경기도 수원시 팔달구 행궁동"),
+    ("4182000000", "경기도 가평군"),
+    ("4182025000", "경기도 가평군 가평읍"),
+    ("4182031000", "경기도 가평군 설악면"),
+)
+
+
+def make_population(counts, sexes=("남", "여"), names=None, digest="0" * 40, source="", codes=None):
+    """(R, A, S) 인구 배열로 작은 PopulationData를 만든다 (codes가 없으면 행정코드는 1100000001부터)"""
+    counts = np.ascontiguousarray(counts, dtype=np.int32)
+    if codes is None:
+        codes = [f"{1100000001 + i:010d}" for i in range(len(counts))]
+    codes = np.array(codes, dtype="U10")
+    if names is None:
+        names = [f"{i + 1}동" for i in range(len(counts))]
+    return PopulationData(
+        codes=codes,
+        names=np.array(names),
+        ages=AGES[: counts.shape[1]],
+        sexes=tuple(sexes),
+        counts=counts,
+        month="2025년04월",
+        digest=digest,
+        source=source,
+    )
+
+
+@pytest.fixture
+def population():
+    """무작위 지역 40곳 — 2번 행은 0번 행과 같고(동점), 5번 행은 인구가 없다"""
+    rng = np.random.default_rng(7)
+    counts = rng.integers(0, 200, size=(40, len(AGES), 2))
+    counts[2] = counts[0]
+    counts[5] = 0
+    return make_population(counts)
+
+
+def make_districts(seed=11, sexes=("남", "여"), digest="1" * 40, source=""):
+    """DISTRICTS 지역 표 — 읍면동은 무작위 인구, 상위 지역은 CSV처럼 하위 읍면동의 합"""
+    codes, names = zip(*DISTRICTS)
+    registry = RegionRegistry(np.array(codes), np.array(names))
+    counts = np.random.default_rng(seed).integers(0, 100, size=(len(codes), len(AGES), len(sexes)))
+    for row, code in enumerate(codes):
+        if registry.levels[row] != "읍면동":
+            counts[row] = counts[registry.descendants(code, "읍면동")].sum(axis=0)
+    return make_population(counts, sexes=sexes, names=names, digest=digest, source=source, codes=codes)
+
+
+def write_population_csv(path, data):
+    """행정안전부 연령별 인구 CSV 형식(cp949, 천 단위 쉼표)으로 저장한다"""
+    columns = {"행정구역": [f"{name}({code})" for code, name in zip(data.codes.tolist(), data.names.tolist())]}
+    for s, sex in enumerate(data.sexes):
+        columns[f"{data.month}_{sex}_총인구수"] = [f"{v:,}" for v in data.counts[:, :, s].sum(axis=1).tolist()]
+        for a, age in enumerate(data.ages):
+            columns[f"{data.month}_{sex}_{age}"] = [f"{v:,}" for v in data.counts[:, a, s].tolist()]
+    pd.DataFrame(columns).to_csv(path, index=False, encoding="cp949")
+    return str(path)
+
+
+@pytest.fixture
+def districts():
+    return make_districts()
@@ -0,0 +1,93 @@
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from market.analytics import TRADING_DAYS, build_analytics, price_analytics
+from market.fetch import frame_fetcher
+from market.store import PriceStore
+from tests.test_price_store import daily_frame
+
+
+@pytest.fixture
+def matrix():
+    """서로 다른 휴장일, 늦게 상장한 종목, 먼저 끝난 종목이 섞인 종가 표"""
+    rng = np.random.default_rng(4)
+    index = pd.bdate_range("2024-01-01", periods=120, name="Date")
+    values = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, size=(len(index), 4)), axis=0))
+    table = pd.DataFrame(values, index=index, columns=["AAA", "BBB", "CCC", "DDD"])
+    table.iloc[[10, 11, 50], 0] = np.nan  # 그 종목만 쉰 날
+    table.iloc[:30, 1] = np.nan           # 늦게 상장
+    table.iloc[100:, 2] = np.nan          # 거래 정지
+    table.iloc[:, 3] = np.nan             # 하루만 거래한 종목
+    table.iloc[5, 3] = 50.0
+    return table
+
+
+def reference(series, window):
+    """종목 하나를 pandas로 따로 계산한 기준 값"""
+    close = series.ffill()
+    returns = close / close.shift(1) - 1
+    return {
+        "close": close,
+        "normalized": close / close.loc[close.first_valid_index()] * 100,
+        "returns": returns,
+        "volatility": returns.rolling(window, min_periods=window).std() * np.sqrt(TRADING_DAYS),
+        "drawdown": close / close.cummax() - 1,
+    }
+
+
+def reference_correlation(matrix):
+    returns = matrix.ffill().pct_change(fill_method=None)
+    return returns.corr()
+
+
+@pytest.mark.parametrize("window", [5, 20])
+def test_tables_match_per_symbol_reference(matrix, window):
+    analytics = build_analytics(matrix, window=window)
+    assert analytics.symbols == list(matrix.columns)
+    for symbol in matrix.columns:
+        expected = reference(matrix[symbol], window)
+        for name, values in expected.items():
+            pd.testing.assert_series_equal(
+                getattr(analytics, name)[symbol], values, check_names=False, rtol=1e-12, atol=1e-12,
+            )
+        assert analytics.last_dates[symbol] == matrix[symbol].last_valid_index()
+
+    pd.testing.assert_frame_equal(analytics.correlation, reference_correlation(matrix), rtol=1e-12, atol=1e-12)
+    # 쉰 날은 앞 값으로 채워 수익률 0, 상장 전은 NaN
+    assert analytics.returns["AAA"].iloc[10] == 0.0
+    assert analytics.normalized["BBB"].iloc[:30].isna().all()
+    assert analytics.normalized["BBB"].iloc[30] == pytest.approx(100.0)
+
+
+def test_summary(matrix):
+    analytics = build_analytics(matrix)
+    summary = analytics.summary(["AAA", "CCC"])
+    assert summary.index.tolist() == ["AAA", "CCC"]
+    close = matrix["AAA"].ffill()
+    assert summary.loc["AAA", "기간 수익률"] == pytest.approx(close.iloc[-1] / close.iloc[0] - 1)
+    assert summary.loc["CCC", "최대 낙폭"] == pytest.approx((matrix["CCC"] / matrix["CCC"].cummax() - 1).min())
+    assert summary.loc["AAA", "최근 변동성"] == analytics.volatility["AAA"].iloc[-1]
+
+
+def test_empty_matrix():
+    analytics = build_analytics(pd.DataFrame(columns=["AAA"], dtype=float))
+    assert analytics.symbols == ["AAA"] and analytics.close.empty
+
+
+def test_cached_until_store_changes(tmp_path):
+    frames = {"A": daily_frame(date(2024, 1, 1), date(2024, 4, 1)), "B": daily_frame(date(2024, 1, 1), date(2024, 4, 1))}
+    store = PriceStore(str(tmp_path / "prices.sqlite"), fetch=frame_fetcher(frames))
+    store.update(["A", "B"], date(2024, 1, 1), date(2024, 2, 1))
+
+    first = price_analytics(store, ["A", "B"], date(2024, 1, 1), date(2024, 4, 1))
+    assert price_analytics(store, ["A", "B"], date(2024, 1, 1), date(2024, 4, 1)) is first
+    assert price_analytics(store, ["A", "B"], date(2024, 1, 1), date(2024, 4, 1), window=5) is not first
+    assert first.close.index[-1] == pd.Timestamp("2024-01-31")
+
+    store.update(["A", "B"], date(2024, 1, 1), date(2024, 4, 1))
+    updated = price_analytics(store, ["A", "B"], date(2024, 1, 1), date(2024, 4, 1))
+    assert updated is not first
+    assert updated.close.index[-1] == pd.Timestamp("2024-03-29")
@@ -0,0 +1,200 @@
+import os
+from datetime import date
+from email.utils import formatdate
+
+import pytest
+
+pytest.importorskip("httpx")  # starlette TestClient가 쓴다
+
+from starlette.testclient import TestClient  # noqa: E402
+
+from api.app import create_app  # noqa: E402
+from api.query import QueryService  # noqa: E402
+from market.fetch import frame_fetcher  # noqa: E402
+from market.store import PriceStore  # noqa: E402
+from tests.conftest import make_districts, write_population_csv  # noqa: E402
+from tests.test_price_store import daily_frame  # noqa: E402
+
+
+class StubPopulation:
+    """인구 질의 두 개만 흉내 내고 본문을 만든 횟수를 센다"""
+
+    def __init__(self):
+        self.version = ("v1", 1_700_000_000.0)
+        self.builds = 0
+
+    def population_version(self):
+        return self.version
+
+    def region(self, code, level=None):
+        self.builds += 1
+        return {"code": code, "level": level}
+
+
+@pytest.fixture
+def stub():
+    return StubPopulation()
+
+
+@pytest.fixture
+def client(stub):
+    return TestClient(create_app(stub))
+
+
+def test_etag_round_trip_returns_304_without_building(client, stub):
+    response = client.get("/regions/1100000001")
+    assert response.status_code == 200
+    assert response.json() == {"code": "1100000001", "level": None}
+    etag = response.headers["etag"]
+    assert response.headers["last-modified"] == formatdate(stub.version[1], usegmt=True)
+
+    again = client.get("/regions/1100000001", headers={"If-None-Match": etag})
+    assert again.status_code == 304
+    assert again.content == b""
+    assert again.headers["etag"] == etag
+    assert client.get("/regions/1100000001", headers={"If-None-Match": f'"other", {etag}'}).status_code == 304
+    assert stub.builds == 1
+
+    # 같은 질의라도 다른 쿼리 문자열이면 다른 ETag
+    other = client.get("/regions/1100000001?level=시도")
+    assert other.headers["etag"] != etag and stub.builds == 2
+
+
+def test_unconditional_repeat_is_served_from_response_cache(client, stub):
+    first = client.get("/regions/1100000001")
+    second = client.get("/regions/1100000001")
+    assert second.status_code == 200 and second.content == first.content
+    assert stub.builds == 1
+
+
+def test_data_change_invalidates_etag(client, stub):
+    etag = client.get("/regions/1100000001").headers["etag"]
+    stub.version = ("v2", 1_700_000_100.0)
+    response = client.get("/regions/1100000001", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+    assert stub.builds == 2
+
+
+def test_if_modified_since(client, stub):
+    modified = formatdate(stub.version[1], usegmt=True)
+    assert client.get("/regions/1100000001", headers={"If-Modified-Since": modified}).status_code == 304
+    earlier = formatdate(stub.version[1] - 60, usegmt=True)
+    assert client.get("/regions/1100000001", headers={"If-Modified-Since": earlier}).status_code == 200
+    assert client.get("/regions/1100000001", headers={"If-Modified-Since": "not a date"}).status_code == 200
+    # If-None-Match가 있으면 If-Modified-Since는 보지 않는다
+    headers = {"If-None-Match": '"stale"', "If-Modified-Since": modified}
+    assert client.get("/regions/1100000001", headers=headers).status_code == 200
+
+
+def test_prices_etag_follows_store_updates(tmp_path):
+    path = str(tmp_path / "prices.sqlite")
+    frames = {"A": daily_frame(date(2024, 1, 1), date(2024, 3, 1))}
+    writer = PriceStore(path, fetch=frame_fetcher(frames))
+    writer.update(["A"], date(2024, 1, 1), date(2024, 2, 1))
+    client = TestClient(create_app(QueryService(price_path=path)))
+
+    url = "/prices/A?start=2024-01-01&end=2024-03-01"
+    response = client.get(url)
+    assert response.status_code == 200
+    assert response.json()["dates"][-1] == "2024-01-31"
+    etag = response.headers["etag"]
+    assert client.get(url, headers={"If-None-Match": etag}).status_code == 304
+
+    writer.update(["A"], date(2024, 1, 1), date(2024, 3, 1))
+    response = client.get(url, headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json()["dates"][-1] == "2024-02-29"
+
+
+def test_read_only_store_creates_nothing(tmp_path):
+    path = str(tmp_path / "missing" / "prices.sqlite")
+    client = TestClient(create_app(QueryService(price_path=path)))
+    response = client.get("/prices?symbols=A&start=2024-01-01&end=2024-02-01")
+    assert response.status_code == 503
+    assert not os.path.exists(os.path.dirname(path))
+
+    store = PriceStore(path, fetch=None)
+    assert store.read_only and not os.path.exists(os.path.dirname(path))
+    with pytest.raises(RuntimeError):
+        store.update(["A"], date(2024, 1, 1), date(2024, 2, 1))
+
+
+def population_client(tmp_path, **kwargs):
+    """make_districts를 CSV로 저장하고 실제 QueryService로 읽는 앱"""
+    path = write_population_csv(tmp_path / "population.csv", make_districts(**kwargs))
+    return TestClient(create_app(QueryService(population_file=path, price_path=str(tmp_path / "prices.sqlite"))))
+
+
+def test_region_and_bands_from_population_file(tmp_path):
+    client = population_client(tmp_path)
+    districts = make_districts()
+
+    body = client.get("/regions/1111051500").json()
+    assert (body["code"], body["name"], body["level"]) == ("1111051500", "서울특별시 종로구 청운효자동", "읍면동")
+    assert body["month"] == "2025년04월" and len(body["ages"]) == len(districts.ages)
+    row = districts.code_index["1111051500"]
+    assert body["counts"]["계"] == districts.total[row].tolist()
+    assert body["counts"]["여"] == districts.female[row].tolist()
+    assert body["total"] == int(districts.total[row].sum())
+
+    # 상위 단위는 읍면동을 묶은 집계 — 일반구를 둔 시는 일반구 읍면동을 모두 더한다
+    bands = client.get("/regions/4111000000/bands").json()
+    assert bands["level"] == "시군구"
+    assert bands["total"] == int(districts.total[[10, 11, 13]].sum())
+    assert set(bands["ratios"]) == {"under20", "youth", "middle", "elderly"}
+    assert client.get("/regions/4100000000/bands").json()["level"] == "시도"
+    assert client.get("/regions/1111053000/bands?level=동").json()["level"] == "동"
+
+
+def test_similar_from_population_file(tmp_path):
+    client = population_client(tmp_path)
+    body = client.get("/regions/1111051500/similar?k=3").json()
+    assert (body["metric"], body["sex"], body["bands"]) == ("hybrid", "total", ["under20", "youth", "middle", "elderly"])
+    codes = [result["code"] for result in body["results"]]
+    assert len(codes) == 3 and "1111051500" not in codes
+    scores = [result["score"] for result in body["results"]]
+    assert scores == sorted(scores)
+
+    custom = client.get("/regions/1111051500/similar?k=20&metric=cosine&sex=split&bands=under20,youth").json()
+    assert custom["bands"] == ["under20", "youth"]
+    assert len(custom["results"]) == 8  # 다른 읍면동 전부
+    # 같은 단위 안에서만 찾는다
+    upper = client.get("/regions/4182000000/similar?k=10").json()["results"]
+    assert {result["code"] for result in upper} == {"1111000000", "1114000000", "4111000000", "4111100000", "4111300000"}
+
+
+@pytest.mark.parametrize("url, status", [
+    ("/regions/1111051500/similar?k=0", 400),
+    ("/regions/1111051500/similar?k=101", 400),
+    ("/regions/1111051500/similar?k=many", 400),
+    ("/regions/1111051500/similar?metric=manhattan", 400),
+    ("/regions/1111051500/similar?sex=other", 400),
+    ("/regions/1111051500/similar?bands=under20,toddler", 400),
+    ("/regions/1111051500?level=구", 400),
+    ("/regions/1111051500/bands?level=시도", 404),
+    ("/regions/9999999999/pyramid", 404),
+])
+def test_population_query_errors(tmp_path, url, status):
+    response = population_client(tmp_path).get(url)
+    assert response.status_code == status
+    assert "error" in response.json()
+
+
+def test_pyramid_needs_split_sexes(tmp_path):
+    response = population_client(tmp_path).get("/regions/1114054000/pyramid")
+    assert response.status_code == 200
+    assert response.json()["data"]
+
+    (tmp_path / "combined").mkdir()
+    combined = population_client(tmp_path / "combined", sexes=("계",))
+    response = combined.get("/regions/1114054000/pyramid")
+    assert response.status_code == 409
+    assert "error" in response.json()
+    # 피라미드가 아닌 질의는 합계 파일로도 된다
+    assert combined.get("/regions/1114054000").json()["counts"].keys() == {"계"}
+
+
+def test_missing_population_file_is_503(tmp_path):
+    client = TestClient(create_app(QueryService(population_file=str(tmp_path / "missing.csv"))))
+    assert client.get("/regions/1111051500").status_code == 503
@@ -0,0 +1,41 @@
+import numpy as np
+
+from population.bands import BANDS, CATEGORY_RULES, DEFAULT_CATEGORY, band_categories, build_band_table
+from population.insights import region_insights, region_ratios
+from tests.conftest import make_population
+
+
+def test_category_uses_displayed_rounding():
+    # 24.996%는 화면에 25.0%로 보이므로 고령형 — 반올림 전 값으로 나누면 어긋난다
+    ratios = np.array([[20.0, 25.0, 30.004, 24.996], [20.0, 25.0, 30.01, 24.99]])
+    assert band_categories(ratios).tolist() == ["고령형", DEFAULT_CATEGORY]
+
+
+def test_rules_apply_in_order():
+    for band, threshold, label in CATEGORY_RULES:
+        ratios = np.zeros(len(BANDS))
+        ratios[BANDS.index(band)] = threshold
+        assert band_categories(ratios[None, :]).tolist() == [label]
+    assert band_categories(np.array([[26.0, 31.0, 0.0, 25.0]])).tolist() == ["고령형"]
+
+
+def test_table_and_insights_agree(population):
+    table = build_band_table(population)
+    for code, line in table.iterrows():
+        if line["총인구"] == 0:
+            continue
+        ratios = region_ratios(line)
+        assert band_categories(np.array([[ratios[band] for band in BANDS]])).tolist() == [line["유형"]]
+        high = [band for band in BANDS if line[f"{band}_high"]]
+        assert len(region_insights(ratios)) == max(len(high), 1)
+
+
+def test_borderline_region_in_table():
+    # 고령(65세 이상) 비중이 24.996%인 지역
+    counts = np.zeros((1, 101, 2), dtype=np.int32)
+    counts[0, 30, 0] = 75004
+    counts[0, 70, 0] = 24996
+    table = build_band_table(make_population(counts))
+    assert table["유형"].iloc[0] == "고령형"
+    assert bool(table["elderly_high"].iloc[0])
+    assert region_ratios(table.iloc[0])["elderly"] == 25.0
@@ -0,0 +1,119 @@
+import io
+import json
+
+import numpy as np
+import pytest
+
+import bookmarks.importer as importer
+from bookmarks.importer import import_points, iter_geojson_chunks
+from bookmarks.store import BookmarkStore, _first_of_near
+
+
+@pytest.fixture
+def store(tmp_path):
+    return BookmarkStore(str(tmp_path / "bookmarks.sqlite"))
+
+
+def feature(name, lat, lon):
+    return {"type": "Feature", "properties": {"name": name}, "geometry": {"type": "Point", "coordinates": [lon, lat]}}
+
+
+def points(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return rng.uniform(33, 38, n), rng.uniform(125, 129, n)
+
+
+def brute_force_keep(lats, lons, tolerance):
+    return np.array([
+        not any(abs(lats[i] - lats[j]) <= tolerance and abs(lons[i] - lons[j]) <= tolerance for j in range(i))
+        for i in range(len(lats))
+    ])
+
+
+def test_first_of_near_matches_brute_force():
+    lats, lons = points(400)
+    # 일부러 가까운 점·같은 점·칸 경계 근처 점을 섞는다
+    lats[100:150], lons[100:150] = lats[:50] + 4e-6, lons[:50] - 9e-6
+    lats[150:160], lons[150:160] = lats[10], lons[10]
+    lats[160:170] = np.floor(lats[160:170] / 1e-5) * 1e-5 + 1e-9
+    lats[170:180], lons[170:180] = lats[160:170] - 2e-9, lons[160:170]
+    keep = _first_of_near(lats, lons, 1e-5)
+    np.testing.assert_array_equal(keep, brute_force_keep(lats, lons, 1e-5))
+    assert 0 < keep.sum() < len(lats)
+
+
+def test_rs_delimited_geojsonseq_across_reads(monkeypatch, store):
+    monkeypatch.setattr(importer, "_READ_SIZE", 64)  # 레코드 여러 개가 읽기 경계에 걸리도록
+    lats, lons = points(300)
+    text = "".join(f"\x1e{json.dumps(feature(f'p{i}', lat, lon))}\n" for i, (lat, lon) in enumerate(zip(lats, lons)))
+    chunks = list(iter_geojson_chunks(io.BytesIO(text.encode("utf-8")), chunk_size=100))
+    assert [len(names) for names, _, _ in chunks] == [100, 100, 100]
+    np.testing.assert_allclose(np.concatenate([chunk[1] for chunk in chunks]), lats)
+
+    report = import_points(store, io.BytesIO(text.encode("utf-8")), kind="geojson", chunk_size=64)
+    assert (report.read, report.inserted) == (300, 300)
+
+
+def test_parse_error_keeps_finished_chunks_and_reports(monkeypatch, store):
+    monkeypatch.setattr(importer, "_READ_SIZE", 256)
+    store.add("기존", 37.0, 127.0)
+    lats, lons = points(200)
+    lines = [json.dumps(feature(f"p{i}", lat, lon)) for i, (lat, lon) in enumerate(zip(lats, lons))]
+    lines.insert(150, '{"type": "Feature", "geometry": {"type": "Point", "coordinates": [127.0, }')
+    source = io.BytesIO("\n".join(lines).encode("utf-8"))
+
+    with pytest.raises(ValueError, match="151번째 Feature") as error:
+        import_points(store, source, kind="geojson", chunk_size=50)
+    assert "150개 중 150개는 저장" in str(error.value)
+    assert store.count() == 151  # 끝난 묶음 세 개는 남는다
+
+
+@pytest.mark.parametrize("bad, message", [
+    ("[1, 2]", "객체가 아닙니다"),
+    ('{"type": "Feature", "geometry": [127.0, 37.0]}', "geometry와 properties"),
+    ('{"type": "Feature", "geometry": {"type": "Point", "coordinates": 127.0}}', "coordinates"),
+])
+def test_malformed_feature_names_its_number(store, bad, message):
+    good = [json.dumps(feature("p", 37.0 + i * 0.01, 127.0)) for i in range(3)]
+    text = '{"type": "FeatureCollection", "features": [' + ", ".join(good[:2] + [bad] + good[2:]) + "]}"
+    with pytest.raises(ValueError, match=f"3번째 Feature: .*{message}"):
+        import_points(store, io.BytesIO(text.encode("utf-8")), kind="geojson")
+
+
+def test_other_sessions_write_between_chunks(store):
+    lats, lons = points(300)
+    lines = [json.dumps(feature(f"p{i}", lat, lon)) for i, (lat, lon) in enumerate(zip(lats, lons))]
+    other = BookmarkStore(store.path)
+
+    def add_elsewhere(report):
+        # 가져오는 중에도 다른 세션의 저장은 묶음 하나만큼만 기다린다
+        if report.read == 100:
+            other.add("다른 세션", float(lats[250]), float(lons[250]))
+
+    report = import_points(store, io.BytesIO("\n".join(lines).encode("utf-8")), kind="geojson", chunk_size=100,
+                           progress=add_elsewhere)
+    assert report.inserted == 299  # 그사이 저장된 점과 같은 자리는 건너뛴다
+    assert store.count() == 300
+
+
+def test_csv_import_dedups_within_and_across_chunks(tmp_path, store):
+    lats, lons = points(500, seed=3)
+    lats[300:320], lons[300:320] = lats[:20] + 5e-6, lons[:20]  # 앞 묶음의 점과 1m 안
+    lats[10], lons[10] = lats[5], lons[5]                          # 같은 묶음 안 중복
+    lats[20] = 95.0                                                # 잘못된 좌표
+    path = tmp_path / "points.csv"
+    rows = [f"이름{i},{lat!r},{lon!r}" for i, (lat, lon) in enumerate(zip(lats.tolist(), lons.tolist()))]
+    path.write_text("장소 이름,위도,경도\n" + "\n".join(rows), encoding="utf-8")
+    store.add("기존", float(lats[400]), float(lons[400]))
+
+    report = import_points(store, str(path), chunk_size=128)
+    valid = np.abs(lats) <= 90
+    expected = brute_force_keep(np.r_[lats[400], lats[valid]], np.r_[lons[400], lons[valid]], 1e-5)[1:]
+    assert report.read == 500
+    assert report.invalid == 1
+    assert report.inserted == expected.sum()
+    assert report.duplicates == 499 - expected.sum()
+    assert store.count() == expected.sum() + 1
+
+    again = import_points(store, str(path), chunk_size=128)
+    assert again.inserted == 0
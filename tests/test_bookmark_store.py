@@ -0,0 +1,127 @@
+import math
+
+import numpy as np
+import pytest
+
+from bookmarks.store import GRID_DEG, BookmarkStore, check_coordinates
+
+
+@pytest.fixture
+def filled(tmp_path):
+    """무작위 점에 격자 칸 경계 위의 점과 남·서반구 점을 섞은 저장소와 (id, 위도, 경도) 목록"""
+    rng = np.random.default_rng(5)
+    lats = rng.uniform(37.40, 37.70, 3_000)
+    lons = rng.uniform(126.80, 127.20, 3_000)
+    lats[:100] = np.round(lats[:100] / GRID_DEG) * GRID_DEG
+    lons[100:200] = np.round(lons[100:200] / GRID_DEG) * GRID_DEG
+    lats[200:300], lons[200:300] = rng.uniform(-0.05, 0.05, 100), rng.uniform(-0.05, 0.05, 100)
+    store = BookmarkStore(str(tmp_path / "bookmarks.sqlite"))
+    store.add_many((f"장소 {i}", lat, lon) for i, (lat, lon) in enumerate(zip(lats.tolist(), lons.tolist())))
+    ids = [row[0] for row in store.in_bounds((-90, -180, 90, 180))]
+    assert len(ids) == len(lats)
+    return store, sorted(ids), lats, lons
+
+
+def brute_force(ids, lats, lons, bounds):
+    south, west, north, east = bounds
+    inside = (lats >= south) & (lats <= north) & (lons >= west) & (lons <= east)
+    return [ids[i] for i in np.flatnonzero(inside)]
+
+
+def random_bounds(rng):
+    if rng.random() < 0.2:
+        south, west = rng.uniform(-0.06, 0.03), rng.uniform(-0.06, 0.03)
+    else:
+        south, west = rng.uniform(37.35, 37.70), rng.uniform(126.75, 127.20)
+    height, width = rng.uniform(0.001, 0.2, size=2)
+    return south, west, south + height, west + width
+
+
+def test_viewport_queries_match_brute_force(filled):
+    store, ids, lats, lons = filled
+    rng = np.random.default_rng(0)
+    for _ in range(100):
+        bounds = random_bounds(rng)
+        expected = brute_force(ids, lats, lons, bounds)
+        rows = store.in_bounds(bounds)
+        assert [row[0] for row in rows] == sorted(expected, reverse=True)  # 최근 저장한 순
+        assert store.count(bounds) == len(expected)
+        assert [row[0] for row in store.in_bounds(bounds, limit=5)] == sorted(expected, reverse=True)[:5]
+
+    # 칸 경계에 딱 놓인 화면 가장자리도 포함한다
+    edge = (37.5, 127.0, 37.5 + GRID_DEG, 127.0 + GRID_DEG)
+    assert store.count(edge) == len(brute_force(ids, lats, lons, edge))
+
+
+@pytest.mark.parametrize("cell_deg", [0.01, 0.04, 0.25])
+def test_clusters_group_viewport_points_by_cell(filled, cell_deg):
+    store, ids, lats, lons = filled
+    for bounds in ((37.45, 126.85, 37.65, 127.15), (-0.04, -0.04, 0.04, 0.04)):
+        inside = np.isin(ids, brute_force(ids, lats, lons, bounds))
+        factor = max(1, round(cell_deg / GRID_DEG))
+        keys = np.floor(lats[inside] / GRID_DEG) // factor, np.floor(lons[inside] / GRID_DEG) // factor
+        expected = {}
+        for key, lat, lon in zip(zip(*keys), lats[inside], lons[inside]):
+            expected.setdefault(key, []).append((lat, lon))
+        clusters = store.clusters(bounds, cell_deg)
+        assert sum(count for _, _, count in clusters) == inside.sum()
+        found = sorted((round(lat, 9), round(lon, 9), count) for lat, lon, count in clusters)
+        assert found == sorted(
+            (round(float(np.mean([p[0] for p in group])), 9), round(float(np.mean([p[1] for p in group])), 9), len(group))
+            for group in expected.values()
+        )
+
+
+def test_delete_and_coordinate_checks(tmp_path):
+    store = BookmarkStore(str(tmp_path / "bookmarks.sqlite"))
+    first = store.add("시청", 37.5663, 126.9779)
+    store.add("남산", 37.5512, 126.9882)
+    store.delete(first)
+    assert [row[1] for row in store.in_bounds((37.5, 126.9, 37.6, 127.0))] == ["남산"]
+    for lat, lon in ((91, 0), (0, -181), (math.nan, 0)):
+        with pytest.raises(ValueError):
+            check_coordinates(lat, lon)
+
+
+def test_layer_switches_from_markers_to_cell_circles(filled, monkeypatch):
+    layer_module = pytest.importorskip("bookmarks.layer")
+    store, ids, lats, lons = filled
+    bounds = (37.40, 126.80, 37.70, 127.20)
+    in_view = store.count(bounds)
+
+    def children(layer):
+        return [type(child).__name__ for child in layer._children.values()]
+
+    monkeypatch.setattr(layer_module, "MAX_MARKERS", in_view)
+    layer, drawn, total = layer_module.bookmark_layer(store, bounds, layer_module.CLUSTER_ZOOM)
+    assert (drawn, total) == (in_view, in_view)
+    assert children(layer).count("Marker") == in_view
+    # 멀리서 볼 때는 개별 마커를 MarkerCluster에 넣는다
+    layer, _, _ = layer_module.bookmark_layer(store, bounds, layer_module.CLUSTER_ZOOM - 1)
+    assert children(layer) == ["MarkerCluster"]
+
+    monkeypatch.setattr(layer_module, "MAX_MARKERS", in_view - 1)
+    layer, drawn, total = layer_module.bookmark_layer(store, bounds, 11)
+    assert (drawn, total) == (0, in_view)
+    cell_deg = layer_module.CLUSTER_PIXELS * 360 / (256 * 2 ** 11)
+    assert children(layer).count("CircleMarker") == len(store.clusters(bounds, cell_deg))
+
+
+def test_parse_and_estimate_view_bounds():
+    from bookmarks.layer import parse_bounds, view_bounds
+
+    assert parse_bounds(None) is None
+    assert parse_bounds({"_southWest": {"lat": 37.4, "lng": None}, "_northEast": {"lat": 37.7, "lng": 127.2}}) is None
+    assert parse_bounds({"_southWest": {"lat": 37.4, "lng": 126.8}, "_northEast": {"lat": 37.7, "lng": 127.2}}) == (
+        37.4, 126.8, 37.7, 127.2,
+    )
+    # 한 바퀴 넘게 보이면 전체 경도
+    assert parse_bounds({"_southWest": {"lat": -95, "lng": -400}, "_northEast": {"lat": 95, "lng": 200}}) == (
+        -90.0, -180.0, 90.0, 180.0,
+    )
+
+    south, west, north, east = view_bounds((37.5665, 126.978), 12, 800, 600)
+    assert south < 37.5665 < north and west < 126.978 < east
+    assert east - west == pytest.approx(800 * 360 / (256 * 2 ** 12))
+    wider = view_bounds((37.5665, 126.978), 11, 800, 600)
+    assert wider[2] - wider[0] > north - south
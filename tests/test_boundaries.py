@@ -0,0 +1,158 @@
+import json
+
+import numpy as np
+import pytest
+
+import population.boundaries as boundaries_module
+from population.bands import band_table
+from population.boundaries import (
+    SIMPLIFY_ZOOMS,
+    BoundaryTiles,
+    boundary_tiles,
+    build_boundary_tiles,
+    simplify_ring,
+)
+from population.choropleth import choropleth_values
+from population.rollup import rollups
+
+
+def circle(n=2_000, radius=0.01, center=(127.0, 37.5)):
+    angles = np.linspace(0, 2 * np.pi, n)
+    ring = np.column_stack([center[0] + radius * np.cos(angles), center[1] + radius * np.sin(angles)])
+    ring[-1] = ring[0]
+    return ring
+
+
+def segment_distance(points, a, b):
+    """점들에서 선분 ab까지 거리"""
+    ab = b - a
+    t = np.clip(((points - a) @ ab) / max(ab @ ab, 1e-300), 0, 1)
+    return np.hypot(*(points - (a + t[:, None] * ab)).T)
+
+
+def square(west, south, size):
+    return [[west, south], [west + size, south], [west + size, south + size], [west, south + size], [west, south]]
+
+
+def write_geojson(path, features):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"type": "FeatureCollection", "features": features}, f)
+    return str(path)
+
+
+def grid_features(rows=12, cols=12, size=0.15, origin=(126.0, 35.5)):
+    """origin에서 시작하는 정사각형 행정동 격자와, 격자 여러 칸에 걸친 큰 다각형 하나(구멍 포함)"""
+    features = []
+    for r in range(rows):
+        for c in range(cols):
+            features.append({
+                "type": "Feature",
+                "properties": {"adm_cd2": f"11{r:02d}{c:02d}0000", "adm_nm": f"격자 {r}-{c}동"},
+                "geometry": {"type": "Polygon", "coordinates": [square(origin[0] + c * size, origin[1] + r * size, size)]},
+            })
+    features.append({
+        "type": "Feature",
+        "properties": {"adm_cd": "41820250", "adm_nm": "큰 읍"},
+        "geometry": {"type": "MultiPolygon", "coordinates": [
+            [circle(radius=0.6, center=(127.0, 36.4)).tolist(), square(126.9, 36.3, 0.2)],
+            [square(129.0, 35.0, 0.05)],
+        ]},
+    })
+    features.append({"type": "Feature", "properties": {"adm_nm": "코드 없음"}, "geometry": features[0]["geometry"]})
+    return features
+
+
+def test_simplify_ring_stays_closed_within_tolerance():
+    ring = circle()
+    tolerance = 1e-4
+    simplified = simplify_ring(ring, tolerance)
+    assert 4 <= len(simplified) < len(ring) / 10
+    np.testing.assert_array_equal(simplified[0], simplified[-1])
+    # 남은 점은 원래 점이고, 빠진 점은 단순화한 선에서 tolerance 안에 있다
+    assert all((ring == point).all(axis=1).any() for point in simplified)
+    nearest = np.min([segment_distance(ring, a, b) for a, b in zip(simplified[:-1], simplified[1:])], axis=0)
+    assert nearest.max() <= tolerance
+
+
+def test_simplify_ring_drops_collinear_points():
+    west, south = 127.0, 37.0
+    edge = np.linspace(0, 1, 11)
+    ring = np.concatenate([
+        np.column_stack([west + edge, np.full(11, south)]),
+        np.column_stack([np.full(10, west + 1), south + edge[1:]]),
+        np.column_stack([west + 1 - edge[1:], np.full(10, south + 1)]),
+        np.column_stack([np.full(10, west), south + 1 - edge[1:]]),
+    ])
+    assert simplify_ring(ring, 1e-9).tolist() == square(west, south, 1)
+    triangle = np.array([[west, south], [west + 1, south], [west, south + 1], [west, south]])
+    assert simplify_ring(triangle, 10.0) is triangle  # 네 점 이하는 그대로
+    # 허용 오차보다 작은 고리는 닫힌 양 끝만 남는다 (호출하는 쪽이 외곽 사각형으로 바꾼다)
+    assert simplify_ring(np.array(square(west, south, 1e-6)), 1.0).tolist() == [[west, south]] * 2
+
+
+@pytest.fixture
+def tiles(tmp_path):
+    return BoundaryTiles(build_boundary_tiles(write_geojson(tmp_path / "boundaries.geojson", grid_features())))
+
+
+def test_features_are_parsed_and_simplified_per_zoom(tiles):
+    assert tiles.zooms == SIMPLIFY_ZOOMS
+    assert len(tiles) == 12 * 12 + 1  # 코드 없는 경계는 뺀다
+    coarse, fine = (tiles.levels[zoom]["features"][-1] for zoom in (SIMPLIFY_ZOOMS[0], SIMPLIFY_ZOOMS[-1]))
+    assert coarse["code"] == "4182025000" and coarse["name"] == "큰 읍"
+    assert len(coarse["coordinates"][0][0]) < len(fine["coordinates"][0][0])
+    for ring in (ring for polygon in coarse["coordinates"] for ring in polygon):
+        assert ring[0] == ring[-1]
+    assert (tiles.zoom_for(3), tiles.zoom_for(9), tiles.zoom_for(18)) == (6, 8, 12)
+
+
+@pytest.mark.parametrize("zoom", [5, 7, 9, 11, 14])
+def test_tile_lookup_matches_bbox_filter(tiles, zoom):
+    rng = np.random.default_rng(zoom)
+    level = tiles.levels[tiles.zoom_for(zoom)]
+    for _ in range(50):
+        south, west = rng.uniform(35.0, 38.0), rng.uniform(125.5, 129.5)
+        height, width = rng.uniform(0.01, 1.5, size=2)
+        bounds = (south, west, south + height, west + width)
+        expected = [
+            feature["code"] for feature in level["features"]
+            if feature["bbox"][2] >= bounds[0] and feature["bbox"][0] <= bounds[2]
+            and feature["bbox"][3] >= bounds[1] and feature["bbox"][1] <= bounds[3]
+        ]
+        assert [feature["code"] for feature in tiles.features(bounds, zoom)] == expected
+
+
+def test_boundary_tiles_cache_round_trip(tmp_path, monkeypatch):
+    path = write_geojson(tmp_path / "boundaries.geojson", grid_features(rows=3, cols=3))
+    assert boundary_tiles(str(tmp_path / "missing.geojson")) is None
+    built = boundary_tiles(path)
+    assert boundary_tiles(path) is built
+
+    # 다른 프로세스처럼 메모리 캐시 없이 열면 저장된 단계별 JSON만 읽는다
+    monkeypatch.setattr(boundaries_module, "_loaded", {})
+    monkeypatch.setattr(boundaries_module, "build_boundary_tiles", None)
+    loaded = boundary_tiles(path)
+    assert loaded is not built
+    bounds = (35.0, 125.0, 38.0, 130.0)
+    assert loaded.features(bounds, 10) == built.features(bounds, 10)
+
+
+def test_choropleth_values_pass_down_to_dongs(districts):
+    tables = rollups(districts)
+    leaves = band_table(tables["읍면동"])
+
+    dong = choropleth_values(districts, "읍면동", "elderly")
+    assert dong.index.tolist() == leaves.index.tolist()
+    assert dong["value"].tolist() == leaves["elderly"].tolist()
+
+    for level, parent in (("시군구", {"4111112900": "4111100000", "4182031000": "4182000000"}),
+                          ("시도", {"4111112900": "4100000000", "1111053000": "1100000000"})):
+        values = choropleth_values(districts, level, "youth")
+        upper = band_table(tables[level])
+        assert values.index.tolist() == leaves.index.tolist()
+        for code, parent_code in parent.items():
+            assert values.loc[code, "value"] == upper.loc[parent_code, "youth"]
+            assert values.loc[code, "지역명"] == upper.loc[parent_code, "지역명"]
+        # 같은 상위 지역의 읍면동은 모두 같은 값
+        prefix = leaves.index.str[: 5 if level == "시군구" else 2]
+        assert values.groupby(prefix)["value"].nunique().eq(1).all()
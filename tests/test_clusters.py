@@ -0,0 +1,130 @@
+import numpy as np
+import pytest
+
+import population.clusters as clusters_module
+from population.clusters import (
+    DemographicClusters,
+    assign,
+    build_clusters,
+    demographic_clusters,
+    minibatch_kmeans,
+    silhouette,
+)
+from tests.conftest import AGES, make_population
+
+# 유형별로 인구가 몰린 나이 구간 — 어린 순서
+PEAKS = ((0, 15), (25, 35), (70, 85))
+
+
+def typed_population(per_type=10, source=""):
+    """PEAKS마다 per_type곳씩, 그 나이대에 인구가 몰린 지역 — 마지막 행은 인구가 없다"""
+    rng = np.random.default_rng(3)
+    counts = rng.integers(0, 5, size=(len(PEAKS) * per_type + 1, len(AGES), 2))
+    for kind, (start, end) in enumerate(PEAKS):
+        rows = slice(kind * per_type, (kind + 1) * per_type)
+        counts[rows, start:end] += rng.integers(150, 250, size=(per_type, end - start, 2))
+    counts[-1] = 0
+    return make_population(counts, source=source)
+
+
+def blobs(centers, per_blob=200, scale=0.05, seed=0):
+    rng = np.random.default_rng(seed)
+    x = np.concatenate([center + scale * rng.standard_normal((per_blob, len(center))) for center in centers])
+    return x, np.repeat(np.arange(len(centers)), per_blob)
+
+
+def brute_force_silhouette(x, labels):
+    """점마다 자기 유형 평균 거리 a, 가장 가까운 다른 유형 평균 거리 b로 (b - a) / max(a, b)"""
+    scores = []
+    for i in range(len(x)):
+        dist = np.linalg.norm(x - x[i], axis=1)
+        own = (labels == labels[i]) & (np.arange(len(x)) != i)
+        if not own.any():
+            scores.append(0.0)
+            continue
+        a = dist[own].mean()
+        b = min(dist[labels == other].mean() for other in np.unique(labels) if other != labels[i])
+        scores.append((b - a) / max(a, b))
+    return np.mean(scores)
+
+
+def test_minibatch_kmeans_separates_blobs():
+    centers = np.array([[0.0, 0.0], [1.0, 0.0], [0.0, 1.0], [1.0, 1.0]])
+    x, truth = blobs(centers)
+    found = minibatch_kmeans(x, 4, batch_size=64, iterations=50)
+    labels, _ = assign(x, found)
+    # 유형 번호는 달라도 같은 덩어리는 같은 유형, 다른 덩어리는 다른 유형
+    mapping = {blob: np.unique(labels[truth == blob]) for blob in range(len(centers))}
+    assert all(len(found_labels) == 1 for found_labels in mapping.values())
+    assert len({int(found_labels[0]) for found_labels in mapping.values()}) == len(centers)
+    np.testing.assert_allclose(np.sort(found, axis=0), np.sort(centers, axis=0), atol=0.02)
+
+
+def test_silhouette_matches_brute_force():
+    x, _ = blobs(np.array([[0.0, 0.0], [0.3, 0.0], [0.0, 0.3]]), per_blob=30, scale=0.2, seed=1)
+    labels = np.random.default_rng(2).integers(0, 3, size=len(x))
+    labels[0] = 3  # 지역이 하나뿐인 유형은 점수 0
+    assert silhouette(x, labels, sample=len(x)) == pytest.approx(brute_force_silhouette(x, labels), abs=1e-9)
+
+    # 표본을 뽑으면 그 표본만으로 계산한다
+    rows = np.random.default_rng(0).choice(len(x), 40, replace=False)
+    assert silhouette(x, labels, sample=40, seed=0) == pytest.approx(
+        brute_force_silhouette(x[rows], labels[rows]), abs=1e-9
+    )
+
+
+def test_build_clusters_finds_age_types():
+    data = typed_population()
+    clusters = build_clusters(data, k_range=(2, 6))
+    assert clusters.k == len(PEAKS)
+    assert max(clusters.silhouettes, key=clusters.silhouettes.get) == len(PEAKS)
+    # 평균 나이가 어린 유형부터 번호를 매기고, 인구 없는 지역은 -1
+    expected = np.r_[np.repeat(np.arange(len(PEAKS)), 10), -1]
+    assert clusters.labels.tolist() == expected.tolist()
+    assert clusters.names(data) == ["유형 1 · 아동·청소년형", "유형 2 · 청년형", "유형 3 · 고령형"]
+    np.testing.assert_array_equal(clusters.counts[1], data.counts[10:20].sum(axis=0))
+
+    members = clusters.members(2)
+    assert sorted(members.tolist()) == list(range(20, 30))
+    assert (np.diff(clusters.distances[members]) >= 0).all()
+    assert clusters.same_type(len(data) - 1).tolist() == []
+    assert 12 not in clusters.same_type(12).tolist() and len(clusters.same_type(12, limit=3)) == 3
+
+    as_population = clusters.as_population(data)
+    assert as_population.names.tolist() == clusters.names(data)
+    np.testing.assert_array_equal(as_population.counts, clusters.counts)
+    stats = clusters.stats(data)
+    assert stats["지역 수"].tolist() == [10, 10, 10]
+    assert stats["총인구"].tolist() == clusters.counts.sum(axis=(1, 2)).tolist()
+
+
+def test_too_few_regions_raise():
+    with pytest.raises(ValueError):
+        build_clusters(make_population(np.ones((2, len(AGES), 2))))
+
+
+def test_disk_cache_round_trip(tmp_path, monkeypatch):
+    source = str(tmp_path / "population.csv")
+    built = demographic_clusters(typed_population(source=source))
+    assert isinstance(built, DemographicClusters)
+    saved = list((tmp_path / ".cache").iterdir())
+    assert len(saved) == 1 and saved[0].name.startswith("clusters-")
+
+    # 같은 CSV를 새로 읽은 데이터는 다시 묶지 않고 저장된 결과를 연다
+    def fail(*args, **kwargs):
+        raise AssertionError("캐시를 두고 다시 묶었습니다")
+
+    monkeypatch.setattr(clusters_module, "build_clusters", fail)
+    loaded = demographic_clusters(typed_population(source=source))
+    assert loaded is not built
+    for name in ("labels", "distances", "centers", "counts"):
+        np.testing.assert_array_equal(getattr(loaded, name), getattr(built, name))
+    assert loaded.silhouettes == built.silhouettes
+
+    # 깨진 결과는 지우고 다시 만든다 (열려 있는 memmap은 그대로 두고 새 파일로 바꾼다)
+    monkeypatch.undo()
+    expected = built.labels.tolist()
+    (saved[0] / "labels.npy").unlink()
+    (saved[0] / "labels.npy").write_bytes(b"broken")
+    rebuilt = demographic_clusters(typed_population(source=source))
+    assert rebuilt.labels.tolist() == expected
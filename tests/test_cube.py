@@ -0,0 +1,79 @@
+import dataclasses
+import os
+
+import numpy as np
+import pytest
+
+from population.cube import append_month, open_cube
+from tests.conftest import make_districts, make_population, write_population_csv
+
+
+def month_csv(directory, data, month):
+    os.makedirs(directory, exist_ok=True)
+    return write_population_csv(os.path.join(directory, f"{month}.csv"), dataclasses.replace(data, month=month))
+
+
+def test_append_and_reload_round_trip(tmp_path):
+    cube_dir = str(tmp_path / "cube")
+    april = make_districts(seed=1)
+    # 5월: 사직동(1111053000)이 없어지고 새 동이 생겼다
+    may_rows = [row for row, code in enumerate(april.codes.tolist()) if code != "1111053000"]
+    may_counts = make_districts(seed=2).counts[may_rows]
+    may = make_population(
+        np.concatenate([may_counts, make_districts(seed=3).counts[:1]]),
+        names=april.names[may_rows].tolist() + ["서울특별시 종로구 새동"],
+        codes=april.codes[may_rows].tolist() + ["1111099000"],
+    )
+    assert open_cube(cube_dir) is None
+
+    # 달 순서와 관계없이 추가할 수 있다
+    assert append_month(cube_dir, month_csv(tmp_path / "csv", may, "2025년05월"))
+    assert append_month(cube_dir, month_csv(tmp_path / "csv", april, "2025년04월"))
+
+    cube = open_cube(cube_dir)
+    assert cube.months == ["2025년04월", "2025년05월"] and len(cube) == 2
+    assert cube.sexes == ("남", "여") and cube.ages == april.ages
+    assert cube.codes[-1] == "1111053000"  # 나중에 들어온 달의 새 코드는 뒤에 붙는다
+    assert cube.names[cube.row_of["1111099000"]] == "서울특별시 종로구 새동"
+
+    series = cube.series("1111051500")
+    np.testing.assert_array_equal(series[0], april.counts[april.code_index["1111051500"]])
+    np.testing.assert_array_equal(series[1], may.counts[may.code_index["1111051500"]])
+    np.testing.assert_array_equal(cube.series("1111053000")[1], 0)  # 그 달에 없던 지역은 0
+    np.testing.assert_array_equal(cube.series("1111099000")[0], 0)
+    np.testing.assert_array_equal(cube.deltas("1111051500")[0], series[1].astype(np.int64) - series[0])
+
+    totals = series.sum(axis=2)
+    elderly = april.age_years >= 65
+    np.testing.assert_allclose(
+        cube.share_series("1111051500", 65), totals[:, elderly].sum(axis=1) / totals.sum(axis=1) * 100
+    )
+    assert isinstance(cube.month_slice("2025년04월"), np.memmap)
+    assert open_cube(cube_dir) is cube
+
+
+def test_same_month_is_skipped_or_replaced(tmp_path):
+    cube_dir = str(tmp_path / "cube")
+    first = month_csv(tmp_path / "a", make_districts(seed=1), "2025년04월")
+    second = month_csv(tmp_path / "b", make_districts(seed=2), "2025년04월")
+    assert append_month(cube_dir, first)
+    cube = open_cube(cube_dir)
+    assert not append_month(cube_dir, first)  # 같은 파일은 다시 넣지 않는다
+
+    with pytest.raises(ValueError):
+        append_month(cube_dir, second)
+    assert append_month(cube_dir, second, replace=True)
+    reopened = open_cube(cube_dir)
+    assert reopened is not cube and reopened.months == ["2025년04월"]
+    replaced = make_districts(seed=2)
+    np.testing.assert_array_equal(reopened.series("1111051500")[0], replaced.counts[replaced.code_index["1111051500"]])
+    assert sorted(name for name in os.listdir(cube_dir) if name.endswith(".npy")) == [reopened._months["2025년04월"]["file"]]
+
+
+def test_column_layout_must_match(tmp_path):
+    cube_dir = str(tmp_path / "cube")
+    append_month(cube_dir, month_csv(tmp_path / "split", make_districts(), "2025년04월"))
+    combined = month_csv(tmp_path / "combined", make_districts(sexes=("계",)), "2025년05월")
+    with pytest.raises(ValueError):
+        append_month(cube_dir, combined)
+    assert open_cube(cube_dir).months == ["2025년04월"]
@@ -0,0 +1,95 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from market.downsample import downsample, lttb_indices, minmax_indices
+
+
+def random_walk(n, seed=0):
+    return np.cumsum(np.random.default_rng(seed).standard_normal(n)) + 100.0
+
+
+def buckets(n, n_buckets):
+    """첫 점·끝 점을 뺀 가운데 점들을 고르게 나눈 구간 [(시작, 끝), ...]"""
+    edges = [int(edge) for edge in np.linspace(1, n - 1, n_buckets + 1)]
+    return list(zip(edges[:-1], edges[1:]))
+
+
+def reference_lttb(x, y, n_out):
+    """구간마다 직전 점·다음 구간 평균점과 만드는 삼각형이 가장 큰 점을 고르는 기준 구현"""
+    spans = buckets(len(y), n_out - 2)
+    picked = [0]
+    for b, (lo, hi) in enumerate(spans):
+        next_lo, next_hi = spans[b + 1] if b + 1 < len(spans) else (len(y) - 1, len(y))
+        mean_x, mean_y = np.mean(x[next_lo:next_hi]), np.mean(y[next_lo:next_hi])
+        prev = picked[-1]
+        areas = [
+            abs((x[prev] - mean_x) * (y[i] - y[prev]) - (x[prev] - x[i]) * (mean_y - y[prev]))
+            for i in range(lo, hi)
+        ]
+        picked.append(lo + int(np.argmax(areas)))
+    return picked + [len(y) - 1]
+
+
+@pytest.mark.parametrize("n, n_out", [(1000, 100), (1000, 3), (257, 50), (10, 9)])
+def test_lttb_matches_reference(n, n_out):
+    x = np.arange(n, dtype=float)
+    y = random_walk(n)
+    picked = lttb_indices(x, y, n_out)
+    assert picked.tolist() == reference_lttb(x, y, n_out)
+    assert len(picked) == n_out
+    assert picked[0] == 0 and picked[-1] == n - 1
+    assert (np.diff(picked) > 0).all()
+
+
+def test_lttb_keeps_a_lone_spike():
+    y = np.zeros(10_000)
+    y[6_543] = 50.0
+    assert 6_543 in lttb_indices(np.arange(len(y)), y, 200).tolist()
+
+
+@pytest.mark.parametrize("n, n_out", [(1000, 100), (1001, 37), (12, 10)])
+def test_minmax_keeps_each_buckets_extremes(n, n_out):
+    y = random_walk(n, seed=1)
+    picked = minmax_indices(y, n_out)
+    assert len(picked) <= n_out
+    assert picked[0] == 0 and picked[-1] == n - 1
+    assert (np.diff(picked) > 0).all()
+    kept = set(picked.tolist())
+    for lo, hi in buckets(n, (n_out - 2) // 2):
+        assert lo + int(np.argmin(y[lo:hi])) in kept
+        assert lo + int(np.argmax(y[lo:hi])) in kept
+    assert int(np.argmin(y)) in kept and int(np.argmax(y)) in kept
+
+
+@pytest.mark.parametrize("method", ["lttb", "minmax"])
+def test_short_series_are_returned_whole(method):
+    x = np.arange(50)
+    y = random_walk(50)
+    for n_out in (50, 51, 1_000):
+        out_x, out_y = downsample(x, y, n_out, method)
+        np.testing.assert_array_equal(out_x, x)
+        np.testing.assert_array_equal(out_y, y)
+
+
+@pytest.mark.parametrize("method", ["lttb", "minmax"])
+def test_nan_gaps_are_dropped_before_picking(method):
+    dates = pd.date_range("2020-01-01", periods=2_000, freq="D").to_numpy()
+    y = random_walk(len(dates), seed=2)
+    y[:5] = np.nan      # 상장 전
+    y[700:900] = np.nan  # 거래 정지
+    y[-3:] = np.nan     # 아직 받지 않은 날
+    out_x, out_y = downsample(dates, y, 100, method)
+
+    assert not np.isnan(out_y).any()
+    assert len(out_x) <= 100
+    assert out_x[0] == dates[5] and out_x[-1] == dates[-4]
+    assert not np.isin(out_x, dates[700:900]).any()
+    # 고른 점은 원래 (날짜, 값) 쌍 그대로다
+    lookup = dict(zip(dates.tolist(), y.tolist()))
+    assert [lookup[day] for day in out_x.tolist()] == out_y.tolist()
+
+
+def test_unknown_method():
+    with pytest.raises(ValueError):
+        downsample(np.arange(10), np.arange(10), 5, "average")
@@ -0,0 +1,28 @@
+import plotly.io as pio
+
+from population.figures import FigureCache, compare_figure, pyramid_figure
+
+
+def test_spec_is_built_only_on_request(population):
+    cache = FigureCache()
+    entry = cache.get(("pyramid", 0), lambda: pyramid_figure(population, 0))
+    assert entry._spec is None
+    assert entry.spec == pio.to_json(entry.figure, validate=False)
+    assert cache.get(("pyramid", 0), lambda: None) is entry
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_size_estimate_tracks_json_size(population):
+    for figure in (pyramid_figure(population, 1), compare_figure(population, 1, 3, "동")):
+        cache = FigureCache()
+        entry = cache.get("figure", lambda: figure)
+        assert 0.5 < entry.size / len(entry.spec) < 2
+        assert cache.nbytes == entry.size
+
+
+def test_evicts_by_estimated_size(population):
+    cache = FigureCache(max_bytes=1)
+    first = cache.get(0, lambda: pyramid_figure(population, 0))
+    cache.get(1, lambda: pyramid_figure(population, 1))
+    assert 0 not in cache and 1 in cache
+    assert first.spec  # 쫓겨난 항목도 계속 쓸 수 있다
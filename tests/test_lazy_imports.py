@@ -0,0 +1,24 @@
+import subprocess
+import sys
+
+
+def run(code):
+    return subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout.split()
+
+
+def test_packages_import_without_heavy_modules():
+    loaded = run(
+        "import sys, population, bookmarks;"
+        "print(*[name for name in ('pandas', 'numpy', 'plotly', 'folium') if name in sys.modules])"
+    )
+    assert loaded == []
+
+
+def test_lazy_names_resolve_to_submodule_objects():
+    names = run(
+        "import population.projection as module, population, bookmarks;"
+        "from population import population_projection, band_table;"
+        "print(module.__name__, population_projection.__module__, band_table.__module__,"
+        " bookmarks.BookmarkStore.__module__)"
+    )
+    assert names == ["population.projection", "population.projection", "population.bands", "bookmarks.store"]
@@ -0,0 +1,110 @@
+import numpy as np
+import pytest
+
+from population.bands import BAND_RANGES
+from population.similarity import SEX_WEIGHTS, MetricEngine
+from tests.conftest import make_population
+
+
+def shares(counts):
+    counts = np.asarray(counts, dtype=np.float64)
+    return counts / counts.sum()
+
+
+def cosine(a, b):
+    return 1.0 - a @ b / (np.linalg.norm(a) * np.linalg.norm(b))
+
+
+def jensen_shannon(a, b):
+    """밑 2 젠슨-섀넌 발산의 제곱근 (scipy.spatial.distance.jensenshannon(a, b, base=2)과 같은 정의)"""
+    p, q = shares(a), shares(b)
+    m = 0.5 * (p + q)
+
+    def kl(x):
+        nonzero = x > 0
+        return np.sum(x[nonzero] * np.log2(x[nonzero] / m[nonzero]))
+
+    return np.sqrt(max(0.5 * kl(p) + 0.5 * kl(q), 0.0))
+
+
+def emd(a, b, ages):
+    """나이 축 위 1차원 EMD — 누적 분포 차이를 이웃 나이 사이 간격으로 적분 (scipy wasserstein_distance와 같은 정의)"""
+    cdf_gap = np.abs(np.cumsum(shares(a)) - np.cumsum(shares(b)))
+    return np.sum(cdf_gap[:-1] * np.diff(ages))
+
+
+REFERENCES = {
+    "cosine": lambda a, b, ages: cosine(a, b),
+    "jensen_shannon": lambda a, b, ages: jensen_shannon(a, b),
+    "emd": emd,
+}
+
+
+def expected_distances(data, metric, query, sex_weights=None, bands=None):
+    """질의 행과 모든 지역 사이 거리를 지역 쌍마다 따로 계산한다 (인구가 없는 쪽은 inf)"""
+    ages = data.age_years
+    keep = np.zeros(len(ages), dtype=bool)
+    for band in bands or BAND_RANGES:
+        start, end = BAND_RANGES[band]
+        keep |= (ages >= start) & (ages < (np.inf if end is None else end))
+    weights = sex_weights or {"계": 1.0}
+    profiles = {sex: (data.total if sex == "계" else data.sex(sex))[:, keep] for sex in weights}
+    total_weight = sum(weights.values())
+
+    result = np.full(len(data), np.inf)
+    for row in range(len(data)):
+        if any(counts[row].sum() == 0 or counts[query].sum() == 0 for counts in profiles.values()):
+            continue
+        result[row] = sum(
+            w / total_weight * REFERENCES[metric](profiles[sex][query], profiles[sex][row], ages[keep])
+            for sex, w in weights.items()
+        )
+    return result
+
+
+@pytest.mark.parametrize("metric", sorted(REFERENCES))
+def test_distances_match_pairwise_reference(population, metric):
+    engine = MetricEngine(population, metric)
+    queries = [0, 1, 7, 39]
+    distances = engine.distances(queries)
+    for query, row in zip(queries, distances):
+        np.testing.assert_allclose(row, expected_distances(population, metric, query), rtol=1e-9, atol=1e-12)
+
+
+@pytest.mark.parametrize("metric", sorted(REFERENCES))
+def test_split_sex_weights_average_each_sex(population, metric):
+    sex_weights = SEX_WEIGHTS["남녀 따로"]
+    engine = MetricEngine(population, metric, sex_weights)
+    np.testing.assert_allclose(
+        engine.distances([3])[0], expected_distances(population, metric, 3, sex_weights), rtol=1e-9, atol=1e-12,
+    )
+    # 가중치는 합이 1이 되도록 맞춘다
+    skewed = MetricEngine(population, metric, {"남": 3, "여": 1})
+    np.testing.assert_allclose(
+        skewed.distances([3])[0],
+        expected_distances(population, metric, 3, {"남": 0.75, "여": 0.25}),
+        rtol=1e-9,
+        atol=1e-12,
+    )
+
+
+@pytest.mark.parametrize("metric", sorted(REFERENCES))
+def test_band_subset_compares_only_those_ages(population, metric):
+    bands = ("under20", "elderly")  # 사이가 빈 연령대 — EMD는 실제 나이 간격으로 잰다
+    engine = MetricEngine(population, metric, bands=bands)
+    np.testing.assert_allclose(
+        engine.distances([4])[0], expected_distances(population, metric, 4, bands=bands), rtol=1e-9, atol=1e-12,
+    )
+
+
+def test_band_subset_drops_regions_without_those_ages(population):
+    counts = population.counts.copy()
+    counts[9, population.age_years < 65] = 0  # 65세 이상만 사는 지역
+    data = make_population(counts)
+
+    engine = MetricEngine(data, "cosine", bands=("under20", "youth"))
+    assert not engine.valid[9]
+    rows, scores = engine.top_k(0, k=len(data))
+    assert 9 not in rows.tolist() and 5 not in rows.tolist()
+    assert np.isfinite(scores).all()
+    assert MetricEngine(data, "cosine").valid[9]
@@ -0,0 +1,93 @@
+import os
+
+import numpy as np
+import pytest
+
+import population.neighbors as neighbors
+from population.neighbors import DEFAULT_K, build_neighbor_index, neighbor_index
+from population.similarity import SimilarityEngine
+from tests.conftest import make_population
+
+
+@pytest.fixture
+def counts():
+    rng = np.random.default_rng(11)
+    counts = rng.integers(0, 300, size=(60, 30, 2))
+    counts[7] = 0
+    return counts
+
+
+def _cached(tmp_path):
+    return sorted(name for name in os.listdir(tmp_path / ".cache") if name.startswith("neighbors-"))
+
+
+def test_persisted_table_matches_fresh_build(tmp_path, counts, monkeypatch):
+    source = str(tmp_path / "population.csv")
+    first = neighbor_index(make_population(counts, digest="a" * 40, source=source))
+    assert len(_cached(tmp_path)) == 1
+
+    # 같은 CSV 해시의 새 데이터는 디스크 표를 그대로 읽는다
+    def fail(*args, **kwargs):
+        raise AssertionError("디스크 캐시가 있는데 다시 계산했습니다")
+
+    monkeypatch.setattr(neighbors, "build_neighbor_index", fail)
+    data = make_population(counts, digest="a" * 40, source=source)
+    loaded = neighbor_index(data)
+    monkeypatch.undo()
+
+    fresh = build_neighbor_index(data)
+    assert loaded.profiles == fresh.profiles == ("계", "남", "여")
+    np.testing.assert_array_equal(loaded.rows, fresh.rows)
+    np.testing.assert_array_equal(loaded.scores, fresh.scores)
+    np.testing.assert_array_equal(first.rows, fresh.rows)
+
+
+def test_table_matches_similarity_engine(counts):
+    data = make_population(counts)
+    index = build_neighbor_index(data)
+    for p, profile in enumerate(index.profiles):
+        matrix = data.total if profile == "계" else data.sex(profile)
+        engine = SimilarityEngine(matrix)
+        for row in np.flatnonzero(engine.valid):
+            rows, scores = engine.top_k(row, k=DEFAULT_K)
+            stored = index.rows[p, row]
+            assert stored[stored >= 0].tolist() == rows.tolist()
+            np.testing.assert_allclose(index.scores[p, row][: len(rows)], scores, rtol=1e-9)
+
+
+def test_cache_invalidated_when_digest_changes(tmp_path, counts):
+    source = str(tmp_path / "population.csv")
+    old = neighbor_index(make_population(counts, digest="a" * 40, source=source))
+
+    changed = counts.copy()
+    changed[:, :10] *= 3  # 젊은 층을 늘린 새 월 자료
+    data = make_population(changed, digest="b" * 40, source=source)
+    new = neighbor_index(data)
+
+    assert len(_cached(tmp_path)) == 2
+    fresh = build_neighbor_index(data)
+    np.testing.assert_array_equal(new.rows, fresh.rows)
+    assert not np.array_equal(new.scores, old.scores)
+
+
+def test_lookup_beyond_stored_width(counts):
+    data = make_population(counts)
+    index = build_neighbor_index(data, k=4)
+    engine = SimilarityEngine(data.total)
+
+    rows, scores = index.lookup(0, k=10)
+    expected_rows, expected_scores = engine.top_k(0, k=10)
+    assert rows.tolist() == expected_rows.tolist()
+    np.testing.assert_allclose(scores, expected_scores)
+
+    # exclude로 표의 이웃이 빠져도 k개를 채운다
+    stored = index.lookup(0, k=4)[0]
+    rows, _ = index.lookup(0, k=4, exclude=stored[:2])
+    assert rows.tolist() == engine.top_k(0, k=4, exclude=stored[:2])[0].tolist()
+
+    # 성별 프로필도 같은 방식
+    rows, _ = index.lookup(3, k=8, profile="여")
+    assert rows.tolist() == SimilarityEngine(data.female).top_k(3, k=8)[0].tolist()
+
+    # 인구가 없는 지역은 이웃이 없다
+    assert len(index.lookup(7, k=10)[0]) == 0
@@ -0,0 +1,67 @@
+from datetime import date
+
+import pytest
+
+from market.refresh import BackgroundRefresher
+from market.store import PriceStore
+from tests.test_price_store import RecordingFetch, daily_frame
+
+START, END = date(2024, 1, 1), date(2024, 5, 1)
+
+
+@pytest.fixture
+def fetch():
+    # B는 3월 상장 (앞 두 달은 봉 없음), X는 받을 때마다 실패
+    return RecordingFetch(
+        {"A": daily_frame(date(2023, 1, 2), END), "B": daily_frame(date(2024, 3, 4), END)},
+        failing=("X",),
+    )
+
+
+@pytest.fixture
+def refresher(tmp_path, fetch):
+    store = PriceStore(str(tmp_path / "prices.sqlite"), fetch=fetch)
+    return BackgroundRefresher(store, max_workers=2, retry_after=60, max_retry_after=200)
+
+
+def test_empty_leading_range_is_not_refetched(refresher, fetch):
+    assert sorted(refresher.refresh(["A", "B"], START, END)) == ["A", "B"]
+    assert refresher.wait(timeout=10)
+    status = refresher.status(["A", "B"])
+    assert status["B"].state == "fresh"
+    assert refresher.refresh(["A", "B"], START, END) == []
+    assert len(fetch.calls) == 2
+
+
+def test_failures_back_off(refresher, fetch):
+    assert refresher.refresh(["X"], START, END) == ["X"]
+    assert refresher.wait(timeout=10)
+    first = refresher.status(["X"])["X"]
+    assert first.state == "failed"
+    assert first.error
+
+    # 다시 시도 시각 전에는 요청하지 않는다
+    assert refresher.refresh(["X"], START, END, now=first.retry_at - 1) == []
+    assert refresher.refresh(["X"], START, END, now=first.retry_at + 1) == ["X"]
+    assert refresher.wait(timeout=10)
+    second = refresher.status(["X"])["X"]
+    assert second.retry_at - first.retry_at == pytest.approx(60, abs=5)  # 60초 → 120초
+
+    delays = [refresher._backoff(failures) for failures in range(1, 6)]
+    assert delays == [60, 120, 200, 200, 200]
+    assert len(fetch.calls) == 2
+
+
+def test_success_clears_backoff(tmp_path, fetch):
+    store = PriceStore(str(tmp_path / "prices.sqlite"), fetch=fetch)
+    refresher = BackgroundRefresher(store, retry_after=60)
+    refresher.refresh(["X"], START, END)
+    refresher.wait(timeout=10)
+    assert refresher.status(["X"])["X"].state == "failed"
+
+    fetch._fetch = RecordingFetch({"X": daily_frame(START, END)})._fetch  # 다음 시도는 성공
+    retry_at = refresher.status(["X"])["X"].retry_at
+    assert refresher.refresh(["X"], START, END, now=retry_at) == ["X"]
+    refresher.wait(timeout=10)
+    status = refresher.status(["X"])["X"]
+    assert (status.state, status.error, status.retry_at) == ("fresh", "", 0.0)
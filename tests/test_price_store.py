@@ -0,0 +1,176 @@
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from market.fetch import frame_fetcher, yfinance_fetch
+from market.store import PriceStore
+
+
+def daily_frame(start, end):
+    """[start, end) 평일마다 봉이 있는 일봉 표"""
+    index = pd.bdate_range(start, end - timedelta(days=1), name="Date")
+    close = np.arange(len(index), dtype=float) + 100
+    return pd.DataFrame(
+        {"Open": close, "High": close + 1, "Low": close - 1, "Close": close, "Volume": close * 10},
+        index=index,
+    )
+
+
+class RecordingFetch:
+    """frame_fetcher를 감싸 fetch 호출 (종목, 시작, 끝)을 기록한다"""
+
+    def __init__(self, frames, failing=()):
+        self.calls = []
+        self._fetch = frame_fetcher(frames, failing)
+
+    def __call__(self, symbols, start, end, timeout=None):
+        self.calls.append((tuple(symbols), start, end))
+        return self._fetch(symbols, start, end)
+
+
+@pytest.fixture
+def frames():
+    # B는 3월에 상장해서 그 전 구간은 봉이 없다
+    return {
+        "A": daily_frame(date(2023, 1, 2), date(2024, 7, 1)),
+        "B": daily_frame(date(2024, 3, 4), date(2024, 7, 1)),
+    }
+
+
+def make_store(tmp_path, fetch):
+    return PriceStore(str(tmp_path / "prices.sqlite"), fetch=fetch)
+
+
+def test_fetches_only_missing_ranges(tmp_path, frames):
+    fetch = RecordingFetch(frames)
+    store = make_store(tmp_path, fetch)
+
+    result = store.get_prices(["A"], date(2024, 4, 1), date(2024, 5, 1))
+    assert fetch.calls == [(("A",), date(2024, 4, 1), date(2024, 5, 1))]
+    expected = frames["A"].loc["2024-04-01":"2024-04-30"]
+    np.testing.assert_array_equal(result["A"]["Close"].to_numpy(), expected["Close"].to_numpy())
+
+    # 앞뒤로 넓히면 빠진 두 구간만 받는다
+    store.get_prices(["A"], date(2024, 3, 1), date(2024, 6, 1))
+    assert fetch.calls[1:] == [
+        (("A",), date(2024, 3, 1), date(2024, 4, 1)),
+        (("A",), date(2024, 5, 1), date(2024, 6, 1)),
+    ]
+    assert store.coverage(["A"])["A"][:2] == (date(2024, 3, 1), date(2024, 6, 1))
+    assert len(store.read(["A"], date(2024, 3, 1), date(2024, 6, 1))["A"]) == len(frames["A"].loc["2024-03":"2024-05"])
+
+    # 다 받아 둔 구간은 다시 받지 않는다
+    store.get_prices(["A"], date(2024, 3, 15), date(2024, 5, 15))
+    assert len(fetch.calls) == 3
+
+
+def test_missing_ranges_grouped_by_range(tmp_path, frames):
+    store = make_store(tmp_path, RecordingFetch(frames))
+    store.update(["A", "B"], date(2024, 4, 1), date(2024, 5, 1))
+    store.update(["C"], date(2024, 4, 15), date(2024, 5, 1))
+
+    missing = store.missing_ranges(["A", "B", "C", "D"], date(2024, 3, 1), date(2024, 5, 1))
+    assert missing == {
+        (date(2024, 3, 1), date(2024, 4, 1)): ["A", "B"],
+        (date(2024, 3, 1), date(2024, 4, 15)): ["C"],
+        (date(2024, 3, 1), date(2024, 5, 1)): ["D"],
+    }
+
+
+def test_update_batches_symbols_per_range(tmp_path, frames):
+    fetch = RecordingFetch(frames)
+    store = make_store(tmp_path, fetch)
+    assert store.update(["A", "B"], date(2024, 4, 1), date(2024, 5, 1)) == 2
+    assert fetch.calls == [(("A", "B"), date(2024, 4, 1), date(2024, 5, 1))]
+
+    # 같은 빠진 구간을 가진 종목끼리 한 번씩
+    assert store.update(["A", "B", "C"], date(2024, 3, 1), date(2024, 5, 1)) == 3
+    assert sorted(fetch.calls[1:]) == [
+        (("A", "B"), date(2024, 3, 1), date(2024, 4, 1)),
+        (("C",), date(2024, 3, 1), date(2024, 5, 1)),
+    ]
+    assert store.update(["A", "B", "C"], date(2024, 3, 1), date(2024, 5, 1)) == 0
+
+
+def test_empty_head_range_is_recorded(tmp_path, frames):
+    fetch = RecordingFetch(frames)
+    store = make_store(tmp_path, fetch)
+    store.update(["B"], date(2024, 4, 1), date(2024, 5, 1))
+
+    # 상장 전 두 달은 봉이 하나도 없지만 받기는 성공했으므로 받은 구간으로 기록한다
+    store.update(["B"], date(2024, 1, 1), date(2024, 5, 1))
+    assert fetch.calls[-1] == (("B",), date(2024, 1, 1), date(2024, 4, 1))
+    assert store.coverage(["B"])["B"][:2] == (date(2024, 1, 1), date(2024, 5, 1))
+    assert store.missing_ranges(["B"], date(2024, 1, 1), date(2024, 5, 1)) == {}
+
+    # 봉이 전혀 없는 종목도 마찬가지
+    store.update(["C"], date(2024, 1, 1), date(2024, 5, 1))
+    assert store.missing_ranges(["C"], date(2024, 1, 1), date(2024, 5, 1)) == {}
+    assert store.read(["C"], date(2024, 1, 1), date(2024, 5, 1))["C"].empty
+
+
+def test_failed_fetch_is_not_recorded(tmp_path, frames):
+    fetch = RecordingFetch(frames, failing=("A",))
+    store = make_store(tmp_path, fetch)
+    store.update(["A", "B"], date(2024, 4, 1), date(2024, 5, 1))
+    assert "A" not in store.coverage(["A", "B"])
+    assert store.missing_ranges(["A", "B"], date(2024, 4, 1), date(2024, 5, 1)) == {
+        (date(2024, 4, 1), date(2024, 5, 1)): ["A"],
+    }
+
+
+def test_read_matrix_and_version(tmp_path, frames):
+    store = make_store(tmp_path, RecordingFetch(frames))
+    assert store.version(["A", "B"]) == (0.0, 0.0)
+    store.update(["A", "B"], date(2024, 2, 1), date(2024, 4, 1))
+    matrix = store.read_matrix(["B", "A"], date(2024, 2, 1), date(2024, 4, 1))
+    assert list(matrix.columns) == ["B", "A"]
+    assert matrix["B"].loc[:"2024-03-01"].isna().all()
+    assert matrix["A"].notna().all()
+    assert all(version > 0 for version in store.version(["A", "B"]))
+
+
+class FakeTicker:
+    """yfinance.Ticker 대신 — 종목 이름으로 성공·네트워크 실패·봉 없음·Yahoo 오류를 흉내 낸다"""
+
+    def __init__(self, symbol):
+        self.symbol = symbol
+
+    def history(self, start, end, raise_errors=False, **kwargs):
+        from yfinance.exceptions import YFPricesMissingError
+
+        if self.symbol == "DOWN":
+            raise ConnectionError("offline")
+        if self.symbol == "NEW":
+            raise YFPricesMissingError(self.symbol, f" (1d {start} -> {end})")
+        if self.symbol == "BUSY":
+            raise YFPricesMissingError(self.symbol, f" (1d {start} -> {end})(Yahoo status_code = 500)")
+        df = daily_frame(start, end)
+        df.index = df.index.tz_localize("America/New_York")
+        return df
+
+
+def test_yfinance_failures_are_not_recorded(tmp_path, monkeypatch):
+    yf = pytest.importorskip("yfinance")
+    monkeypatch.setattr(yf, "Ticker", FakeTicker)
+    store = make_store(tmp_path, yfinance_fetch)
+    symbols = ["UP", "DOWN", "NEW", "BUSY"]
+    start, end = date(2024, 1, 1), date(2024, 2, 1)
+
+    assert store.update(symbols, start, end) == 4
+    assert sorted(store.coverage(symbols)) == ["NEW", "UP"]
+    assert store.missing_ranges(symbols, start, end) == {(start, end): ["DOWN", "BUSY"]}
+    frames = store.read(["UP", "NEW"], start, end)
+    assert len(frames["UP"]) == 23 and frames["NEW"].empty
+
+
+def test_raising_fetch_records_nothing(tmp_path, frames):
+    def fetch(symbols, start, end, timeout=None):
+        raise ConnectionError("offline")
+
+    store = make_store(tmp_path, fetch)
+    with pytest.raises(ConnectionError):
+        store.update(["A"], date(2024, 1, 1), date(2024, 2, 1))
+    assert store.coverage(["A"]) == {}
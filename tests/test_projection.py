@@ -0,0 +1,87 @@
+import numpy as np
+
+from population.projection import (
+    DEFAULT_TFR,
+    FERTILE_AGES,
+    ProjectionRates,
+    population_projection,
+    project,
+    projection_rates,
+)
+from tests.conftest import make_population
+
+
+def identity_rates(n_ages, n_sexes=2, fertility=None, sex_ratio=105.0):
+    """아무도 죽지 않고(생존율 1) 출산도 없는 가정 — fertility를 주면 그만큼 낳는다"""
+    return ProjectionRates(
+        survival=np.ones((n_ages, n_sexes)),
+        fertility=np.zeros(n_ages) if fertility is None else fertility,
+        sex_ratio=sex_ratio,
+    )
+
+
+def test_rates_follow_assumptions(population):
+    ages = population.age_years
+    rates = projection_rates(ages, population.sexes, tfr=1.2)
+    assert np.isclose(rates.fertility.sum(), 1.2)
+    start, end = FERTILE_AGES
+    assert (rates.fertility[(ages < start) | (ages >= end)] == 0).all()
+    # 1세 이후로는 나이가 들수록 생존율이 낮고, 여성이 남성보다 오래 산다
+    assert (np.diff(rates.survival[1:], axis=0) < 0).all()
+    assert (rates.survival[:, 1] > rates.survival[:, 0]).all()
+    # 사망률 배수 0이면 모두 살아남는다
+    assert (projection_rates(ages, population.sexes, mortality_scale=0.0).survival == 1).all()
+
+
+def test_zero_fertility_zero_mortality_just_ages_cohorts(population):
+    rates = projection_rates(population.age_years, population.sexes, tfr=0.0, mortality_scale=0.0)
+    result = project(population, years=5, rates=rates)
+    counts = population.counts.astype(np.float64)
+    assert result.counts.shape == (6,) + counts.shape
+    assert result.years.tolist() == list(range(2025, 2031))
+    for year in range(6):
+        expected = np.zeros_like(counts)
+        expected[:, year:-1] = counts[:, : counts.shape[1] - 1 - year]
+        expected[:, -1] = counts[:, counts.shape[1] - 1 - year:].sum(axis=1)  # 최고 연령 구간에 쌓인다
+        np.testing.assert_allclose(result.counts[year], expected, rtol=1e-6)
+
+
+def test_totals_conserved_under_identity_rates(population):
+    result = project(population, years=20, rates=identity_rates(len(population.ages)))
+    totals = result.counts.sum(axis=(2, 3), dtype=np.float64)
+    np.testing.assert_allclose(totals, np.broadcast_to(population.total.sum(axis=1), totals.shape), rtol=1e-6)
+    np.testing.assert_allclose(result.totals, result.counts.sum(axis=3), rtol=1e-6)
+
+
+def test_births_split_by_sex_ratio(population):
+    n_ages = len(population.ages)
+    fertility = np.zeros(n_ages)
+    fertility[30] = 0.1
+    result = project(population, years=1, rates=identity_rates(n_ages, fertility=fertility, sex_ratio=110.0))
+
+    female = population.female.astype(np.float64)
+    # 연초 30세 여성과 연말 30세 여성(연초 29세)의 평균에 출산율을 곱한다
+    births = 0.5 * (female[:, 30] + female[:, 29]) * 0.1
+    newborn = result.counts[1, :, 0]
+    np.testing.assert_allclose(newborn.sum(axis=1), births, rtol=1e-5)
+    nonzero = births > 0
+    np.testing.assert_allclose(newborn[nonzero, 0] / newborn[nonzero, 1], 1.10, rtol=1e-5)
+
+
+def test_combined_sex_file_counts_half_as_women(population):
+    combined = make_population(population.total[:, :, None], sexes=("계",))
+    n_ages = len(combined.ages)
+    fertility = np.zeros(n_ages)
+    fertility[30] = 0.1
+    result = project(combined, years=1, rates=identity_rates(n_ages, n_sexes=1, fertility=fertility))
+    total = combined.total.astype(np.float64)
+    expected = 0.5 * 0.5 * (total[:, 30] + total[:, 29]) * 0.1
+    np.testing.assert_allclose(result.counts[1, :, 0, 0], expected, rtol=1e-5)
+
+
+def test_cached_projection_reuses_results(population):
+    first = population_projection(population, years=10)
+    assert population_projection(population, years=10) is first
+    assert population_projection(population, years=10, tfr=DEFAULT_TFR + 0.5) is not first
+    assert population_projection(population, years=5) is not first
+    np.testing.assert_array_equal(first.counts, project(population, years=10).counts)
@@ -0,0 +1,15 @@
+import numpy as np
+
+from population.report import load_reports, write_reports
+
+
+def test_json_reports_round_trip_floats_exactly(tmp_path):
+    scores = np.random.default_rng(0).random(200).tolist()
+    records = [{"코드": f"{i:010d}", "best_code": "0012345678", "best_score": score} for i, score in enumerate(scores)]
+    path = str(tmp_path / "report.json")
+    write_reports(records, path)
+
+    table = load_reports(path)
+    assert table.index[0] == "0000000000"
+    assert table["best_code"].iloc[0] == "0012345678"
+    assert table["best_score"].tolist() == scores
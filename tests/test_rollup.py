@@ -0,0 +1,63 @@
+import numpy as np
+
+import population.rollup as rollup_module
+from population.regions import LEVELS, region_registry
+from population.rollup import build_rollups, rollups
+from tests.conftest import make_districts
+
+
+def test_rollup_totals_are_sums_of_their_dongs(districts):
+    tables = build_rollups(districts)
+    assert tuple(tables) == LEVELS
+    registry = region_registry(districts)
+    leaves = tables["읍면동"]
+    assert leaves.codes.tolist() == districts.codes[registry.levels == "읍면동"].tolist()
+
+    for level in ("시도", "시군구"):
+        table = tables[level]
+        assert table.codes.tolist() == sorted(districts.codes[registry.levels == level].tolist())
+        for row, code in enumerate(table.codes.tolist()):
+            members = registry.descendants(code, "읍면동")
+            np.testing.assert_array_equal(table.counts[row], districts.counts[members].sum(axis=0))
+            # CSV의 상위 지역 행과도 같다
+            np.testing.assert_array_equal(table.counts[row], districts.counts[registry.row(code)])
+            assert table.names[row] == registry.name(code)
+        assert table.counts.dtype == np.int32 and table.sexes == districts.sexes
+
+    assert tables["시도"].total.sum() == leaves.total.sum()
+
+    # 일반구를 둔 시는 그 아래 일반구의 읍면동을 모두 더한다 (시군구 단계에 시와 일반구가 함께 있다)
+    sigungu = tables["시군구"]
+    suwon = sigungu.code_index["4111000000"]
+    gu = [sigungu.code_index[code] for code in ("4111100000", "4111300000")]
+    np.testing.assert_array_equal(sigungu.counts[suwon], sigungu.counts[gu].sum(axis=0))
+
+
+def test_rollups_without_upper_rows_use_codes_as_names(districts):
+    leaves = districts.take(np.flatnonzero(region_registry(districts).levels == "읍면동"))
+    sido = build_rollups(leaves)["시도"]
+    assert sido.codes.tolist() == ["1100000000", "4100000000"]
+    assert sido.names.tolist() == sido.codes.tolist()
+    assert sido.total.sum() == leaves.total.sum()
+
+
+def test_rollups_cache_round_trip(tmp_path, monkeypatch):
+    source = str(tmp_path / "population.csv")
+    data = make_districts(source=source)
+    built = rollups(data)
+    assert rollups(data) is built
+    saved = [path.name for path in (tmp_path / ".cache").iterdir()]
+    assert len(saved) == 1 and saved[0].startswith("rollups-")
+
+    # 같은 CSV를 새로 읽은 데이터는 저장된 집계를 memmap으로 연다
+    def fail(data):
+        raise AssertionError("저장된 집계를 두고 다시 만들었습니다")
+
+    monkeypatch.setattr(rollup_module, "build_rollups", fail)
+    loaded = rollups(make_districts(source=source))
+    for level in LEVELS:
+        assert loaded[level] is not built[level]
+        np.testing.assert_array_equal(loaded[level].codes, built[level].codes)
+        np.testing.assert_array_equal(loaded[level].names, built[level].names)
+        np.testing.assert_array_equal(loaded[level].counts, built[level].counts)
+        assert not loaded[level].counts.flags.writeable
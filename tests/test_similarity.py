@@ -0,0 +1,54 @@
+import numpy as np
+
+from population.similarity import SimilarityEngine, hybrid_distance
+
+
+def brute_force_top_k(totals, query, k):
+    """hybrid_distance를 지역마다 부르는 기준 구현 — (점수, 행 번호) 순"""
+    scored = [
+        (hybrid_distance(totals[query], totals[row]), row)
+        for row in range(len(totals))
+        if row != query and totals[row].sum() > 0
+    ]
+    scored.sort()
+    return [row for _, row in scored[:k]], [score for score, _ in scored[:k]]
+
+
+def test_top_k_matches_brute_force(population):
+    totals = population.total
+    engine = SimilarityEngine(totals)
+    for query in range(len(totals)):
+        if totals[query].sum() == 0:
+            continue
+        rows, scores = engine.top_k(query, k=10)
+        expected_rows, expected_scores = brute_force_top_k(totals, query, 10)
+        assert rows.tolist() == expected_rows
+        np.testing.assert_allclose(scores, expected_scores, rtol=1e-12, atol=1e-12)
+
+
+def test_ties_keep_row_order(population):
+    engine = SimilarityEngine(population.total)
+    # 0번과 2번은 같은 지역이라 거리가 0 — 서로 맨 앞에 온다
+    rows, scores = engine.top_k(1, k=len(population))
+    tied = [row for row, score in zip(rows.tolist(), scores.tolist()) if row in (0, 2)]
+    assert tied == [0, 2]
+    assert engine.top_k(0, k=1)[0].tolist() == [2]
+    assert engine.top_k(2, k=1)[0].tolist() == [0]
+    assert engine.top_k(0, k=1)[1][0] == 0.0
+
+
+def test_zero_population_rows_are_never_returned(population):
+    engine = SimilarityEngine(population.total)
+    rows, scores = engine.top_k(0, k=len(population))
+    assert 5 not in rows.tolist()
+    assert len(rows) == len(population) - 2  # 자기 자신과 인구 0인 지역
+    assert np.isfinite(scores).all()
+
+
+def test_vector_query_and_exclude(population):
+    engine = SimilarityEngine(population.total)
+    rows, _ = engine.top_k(population.total[3], k=3)
+    assert rows[0] == 3  # 벡터 질의는 자기 자신을 빼지 않는다
+    rows, _ = engine.top_k(3, k=5, exclude=[0, 2])
+    expected, _ = brute_force_top_k(population.total, 3, 7)
+    assert rows.tolist() == [row for row in expected if row not in (0, 2)][:5]
@@ -0,0 +1,24 @@
+from utils.cache import (
+    cache_dir,
+    file_digest,
+    file_signature,
+    load_arrays,
+    save_arrays_atomic,
+    save_json_atomic,
+)
+from utils.trace import Trace, count, current_trace, span, start_trace, stop_trace
+
+__all__ = [
+    "Trace",
+    "cache_dir",
+    "count",
+    "current_trace",
+    "file_digest",
+    "file_signature",
+    "load_arrays",
+    "save_arrays_atomic",
+    "save_json_atomic",
+    "span",
+    "start_trace",
+    "stop_trace",
+]
@@ -0,0 +1,89 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+
+import numpy as np
+
+# 원본 데이터 파일 옆에 만드는 바이너리 캐시 디렉터리
+CACHE_DIRNAME = ".cache"
+_META_FILE = "meta.json"
+
+
+def cache_dir(data_path):
+    """데이터 파일과 같은 폴더의 캐시 디렉터리 경로 (없으면 생성)"""
+    path = os.path.join(os.path.dirname(os.path.abspath(data_path)), CACHE_DIRNAME)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def file_digest(path, chunk_size=1 << 20):
+    """파일 내용의 SHA-1 해시 (캐시 키로 사용)"""
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def file_signature(path):
+    """내용을 읽지 않고 파일 변경 여부를 판단하는 (경로, 수정 시각, 크기) 튜플"""
+    stat = os.stat(path)
+    return os.path.abspath(path), stat.st_mtime_ns, stat.st_size
+
+
+def save_arrays_atomic(path, meta=None, **arrays):
+    """배열마다 .npy 한 개씩 path 폴더에 저장한다.
+
+    임시 폴더에 다 쓴 뒤 이름을 바꾸므로 읽는 쪽은 완성된 폴더만 본다.
+    다른 프로세스가 같은 폴더를 먼저 만들었으면 그쪽을 그대로 쓴다.
+    """
+    tmp_path = tempfile.mkdtemp(dir=os.path.dirname(path), suffix=".tmp")
+    try:
+        for name, array in arrays.items():
+            np.save(os.path.join(tmp_path, f"{name}.npy"), np.ascontiguousarray(array))
+        with open(os.path.join(tmp_path, _META_FILE), "w", encoding="utf-8") as f:
+            json.dump(meta or {}, f, ensure_ascii=False)
+        os.chmod(tmp_path, 0o755)
+        try:
+            os.replace(tmp_path, path)
+        except OSError:
+            if not os.path.isdir(path):
+                raise
+            shutil.rmtree(tmp_path, ignore_errors=True)
+    except BaseException:
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        raise
+
+
+def load_arrays(path, names):
+    """save_arrays_atomic으로 저장한 배열을 읽기 전용 memmap으로 연다.
+
+    복사 없이 OS 페이지 캐시를 직접 가리키므로, 같은 폴더를 여는 모든
+    세션과 서버 프로세스가 호스트당 한 벌의 메모리를 함께 쓴다.
+    """
+    # np.asarray: memmap 하위 클래스의 연산 오버헤드 없이 같은 매핑을 가리키는 일반 배열
+    arrays = {
+        name: np.asarray(np.load(os.path.join(path, f"{name}.npy"), mmap_mode="r"))
+        for name in names
+    }
+    with open(os.path.join(path, _META_FILE), encoding="utf-8") as f:
+        return arrays, json.load(f)
+
+
+def save_json_atomic(path, obj, compact=False):
+    """임시 파일에 쓴 뒤 교체해서, 동시에 읽는 프로세스가 깨진 파일을 보지 않게 한다.
+
+    compact=True면 구분자 뒤 공백을 빼서 큰 좌표 목록 등의 파일 크기를 줄인다.
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(obj, f, ensure_ascii=False, separators=(",", ":") if compact else None)
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
@@ -0,0 +1,50 @@
+import pandas as pd
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+from utils.trace import start_trace, stop_trace, tracing_forced
+
+# ?debug=1로 한 번 연 세션은 다른 페이지로 옮겨도 패널을 계속 보여 준다 (?debug=0으로 끔)
+_PANEL_KEY = "_perf_debug"
+
+
+def page_trace(page):
+    """이번 실행의 구간 기록을 시작한다. 기록하지 않는 세션이면 None.
+
+    페이지 맨 위에서 부르고, 맨 끝에서 show_trace()로 마무리한다.
+    """
+    flag = st.query_params.get("debug")
+    if flag is not None:
+        st.session_state[_PANEL_KEY] = flag == "1"
+    if not (st.session_state.get(_PANEL_KEY) or tracing_forced()):
+        stop_trace()  # 앞 실행에서 남은 기록이 있으면 버린다
+        return None
+    ctx = get_script_run_ctx()
+    return start_trace(page, session=ctx.session_id if ctx else None)
+
+
+def show_trace():
+    """기록을 JSON lines로 남기고, 디버그 세션이면 사이드바에 구간 시간표를 보여 준다"""
+    trace = stop_trace()
+    if trace is None:
+        return
+    trace.write()
+    if not st.session_state.get(_PANEL_KEY):
+        return
+
+    with st.sidebar.expander("🐞 성능 디버그", expanded=True):
+        st.metric("이번 실행", f"{trace.total_ms:,.1f} ms")
+        if trace.spans:
+            spans = pd.DataFrame({
+                "구간": ["  " * span["depth"] + span["name"] for span in trace.spans],
+                "시작 (ms)": [span["start_ms"] for span in trace.spans],
+                "시간 (ms)": [span["ms"] for span in trace.spans],
+            })
+            st.dataframe(spans, hide_index=True, use_container_width=True)
+        if trace.counters:
+            caches = pd.DataFrame(
+                [(name, hit, miss) for name, (hit, miss) in sorted(trace.counters.items())],
+                columns=["캐시", "적중", "실패"],
+            )
+            st.dataframe(caches, hide_index=True, use_container_width=True)
+        st.caption("구간 기록은 JSON lines로도 저장됩니다 (APP_TRACE_FILE, 기본 .cache/trace.jsonl)")
@@ -0,0 +1,145 @@
+import json
+import os
+import threading
+import time
+from contextvars import ContextVar
+
+# 이 환경 변수가 "1"이면 모든 세션의 실행을 기록한다 (아니면 ?debug=1로 연 세션만)
+TRACE_ENV = "APP_TRACE"
+# JSON lines를 쓸 파일 (환경 변수로 바꿀 수 있다)
+TRACE_FILE_ENV = "APP_TRACE_FILE"
+DEFAULT_TRACE_FILE = os.path.join(".cache", "trace.jsonl")
+
+# 지금 스레드(세션 실행)에서 기록 중인 Trace — 없으면 span·count는 아무것도 하지 않는다
+_current = ContextVar("trace", default=None)
+_write_lock = threading.Lock()
+
+
+class _NoopSpan:
+    """기록이 꺼져 있을 때 span()이 돌려주는 빈 컨텍스트 (객체 하나를 계속 재사용)"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NOOP = _NoopSpan()
+
+
+class _Span:
+    def __init__(self, trace, name, attrs):
+        self.trace = trace
+        self.name = name
+        self.attrs = attrs
+
+    def __enter__(self):
+        trace = self.trace
+        self.depth = trace.depth
+        trace.depth += 1
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        end = time.perf_counter()
+        trace = self.trace
+        trace.depth -= 1
+        record = {
+            "name": self.name,
+            "depth": self.depth,
+            "start_ms": round((self.start - trace.start) * 1000, 3),
+            "ms": round((end - self.start) * 1000, 3),
+        }
+        if self.attrs:
+            record.update(self.attrs)
+        if exc_type is not None:
+            record["error"] = exc_type.__name__
+        trace.spans.append(record)
+        return False
+
+
+class Trace:
+    """한 번의 스크립트 실행(rerun) 동안의 구간 시간과 캐시 적중 수"""
+
+    def __init__(self, page, session=None):
+        self.page = page
+        self.session = session
+        self.started_at = time.time()
+        self.start = time.perf_counter()
+        self.depth = 0
+        self.spans = []
+        self.counters = {}  # {캐시 이름: [적중, 실패]}
+        self.total_ms = None
+
+    def span(self, name, **attrs):
+        return _Span(self, name, attrs)
+
+    def count(self, cache, hit):
+        counter = self.counters.setdefault(cache, [0, 0])
+        counter[0 if hit else 1] += 1
+
+    def finish(self):
+        """총 시간을 확정하고 spans를 시작 순서로 정렬한다 (여러 번 불러도 된다)"""
+        if self.total_ms is None:
+            self.total_ms = round((time.perf_counter() - self.start) * 1000, 3)
+            self.spans.sort(key=lambda span: (span["start_ms"], span["depth"]))
+        return self
+
+    def record(self):
+        """JSON 한 줄로 쓸 dict"""
+        self.finish()
+        return {
+            "time": round(self.started_at, 3),
+            "page": self.page,
+            "session": self.session,
+            "total_ms": self.total_ms,
+            "spans": self.spans,
+            "cache": {name: {"hit": hit, "miss": miss} for name, (hit, miss) in sorted(self.counters.items())},
+        }
+
+    def write(self, path=None):
+        """실행 기록을 JSON lines 파일에 한 줄 덧붙인다"""
+        path = path or os.environ.get(TRACE_FILE_ENV) or DEFAULT_TRACE_FILE
+        line = json.dumps(self.record(), ensure_ascii=False)
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        with _write_lock, open(path, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+
+
+def tracing_forced():
+    return os.environ.get(TRACE_ENV) == "1"
+
+
+def start_trace(page, session=None):
+    """지금 스레드의 실행 기록을 새로 시작한다"""
+    trace = Trace(page, session)
+    _current.set(trace)
+    return trace
+
+
+def stop_trace():
+    """지금 스레드의 기록을 끝내고 돌려준다 (없으면 None)"""
+    trace = _current.get()
+    _current.set(None)
+    return trace.finish() if trace is not None else None
+
+
+def current_trace():
+    return _current.get()
+
+
+def span(name, **attrs):
+    """with span("단계"): ... — 기록 중일 때만 시간을 잰다"""
+    trace = _current.get()
+    if trace is None:
+        return _NOOP
+    return _Span(trace, name, attrs)
+
+
+def count(cache, hit):
+    """캐시 적중(hit=True)·실패를 지금 실행 기록에 센다 (기록 중이 아니면 무시)"""
+    trace = _current.get()
+    if trace is not None:
+        trace.count(cache, hit)